@@ -0,0 +1,335 @@
+"""
+Rekap analitik akademik: mahasiswa/proposal per prodi x angkatan x jk x
+status proposal, dan beban bimbingan per dosen.
+
+Tabel rekap (StudentRollup, SupervisorLoad) diperbarui secara inkremental:
+signal menandai potongan yang berubah di AnalyticsDirty, lalu hanya
+potongan tersebut yang dihitung ulang, baik sebelum endpoint analitik
+membaca maupun lewat `manage.py refresh_analytics` yang dijadwalkan.
+
+Sebaran tempat lahir per provinsi/kabupaten dihitung langsung di SQL
+lewat tabel closure Wilayah dan di-cache per generasi data mahasiswa,
+dosen dan wilayah.
+"""
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .db_router import PRIMARY, primary_reads, reset_replicas, use_replicas
+from .generations import get_generation
+from .models import AnalyticsDirty, Bimbingan, Dosen, Mahasiswa, Proposal, StudentRollup, SupervisorLoad, Wilayah
+
+STUDENTS = 'mahasiswa'
+SUPERVISORS = 'dosen'
+NO_PROPOSAL = 'none'
+SLICE_CHUNK = 200
+DISTRIBUTION_LEVELS = {1: 'provinsi', 2: 'kabupaten/kota'}
+DISTRIBUTION_TTL = 60 * 60
+
+GROUP_FIELDS = {
+    'prodi': ['prodi_id', 'prodi_code', 'prodi_nama'],
+    'tahun_masuk': ['tahun_masuk'],
+    'jk': ['jk'],
+    'status': ['proposal_status'],
+}
+
+# Status proposal terakhir tiap mahasiswa.
+LATEST_STATUS = Subquery(
+    Proposal.objects.filter(mahasiswa=OuterRef('pk')).order_by('-created_at', '-pk').values('status')[:1]
+)
+
+
+def slice_key(prodi_id, tahun_masuk, jk):
+    return f"{'' if prodi_id is None else prodi_id}:{tahun_masuk}:{jk}"
+
+
+def _parse_slice(key):
+    prodi_id, tahun_masuk, jk = key.split(':', 2)
+    return (int(prodi_id) if prodi_id else None), int(tahun_masuk), jk
+
+
+def mark_dirty(kind, keys):
+    """
+    Tandai potongan rekap sebagai usang setelah transaksi penulis commit.
+
+    Penanda yang masih ada membuat insert ini no-op; karena ditulis setelah
+    commit, refresh_dirty yang nanti mengambil penanda itu pasti melihat
+    perubahan data ini.
+    """
+    keys = {str(key) for key in keys if key is not None}
+    if keys:
+        transaction.on_commit(lambda: AnalyticsDirty.objects.bulk_create(
+            [AnalyticsDirty(kind=kind, key=key) for key in keys], ignore_conflicts=True
+        ))
+
+
+def _slice_filter(slices, prefix=''):
+    condition = Q()
+    for prodi_id, tahun_masuk, jk in slices:
+        prodi = {f'{prefix}prodi__isnull': True} if prodi_id is None else {f'{prefix}prodi_id': prodi_id}
+        condition |= Q(**prodi, **{f'{prefix}tahun_masuk': tahun_masuk, f'{prefix}jk': jk})
+    return condition
+
+
+def _chunks(values, size=SLICE_CHUNK):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _student_rows(slices=None):
+    counts = {}
+    students = (
+        Mahasiswa.objects.filter(_slice_filter(slices or []))
+        .annotate(status=Coalesce(LATEST_STATUS, Value(NO_PROPOSAL)))
+        .values_list('prodi_id', 'tahun_masuk', 'jk', 'status')
+        .annotate(total=Count('pk'))
+        .order_by()
+    )
+    for prodi_id, tahun_masuk, jk, status, total in students:
+        counts.setdefault((prodi_id, tahun_masuk, jk, status), [0, 0])[0] = total
+
+    proposals = (
+        Proposal.objects.filter(_slice_filter(slices or [], prefix='mahasiswa__'))
+        .values_list('mahasiswa__prodi_id', 'mahasiswa__tahun_masuk', 'mahasiswa__jk', 'status')
+        .annotate(total=Count('pk'))
+        .order_by()
+    )
+    for prodi_id, tahun_masuk, jk, status, total in proposals:
+        counts.setdefault((prodi_id, tahun_masuk, jk, status), [0, 0])[1] = total
+
+    return [
+        StudentRollup(
+            prodi_id=prodi_id, tahun_masuk=tahun_masuk, jk=jk, proposal_status=status,
+            mahasiswa=mahasiswa, proposal=proposal,
+        )
+        for (prodi_id, tahun_masuk, jk, status), (mahasiswa, proposal) in counts.items()
+    ]
+
+
+def refresh_students(slices=None):
+    """Hitung ulang rekap mahasiswa untuk potongan `slices`, atau semuanya bila None."""
+    with transaction.atomic():
+        if slices is None:
+            StudentRollup.objects.all().delete()
+            StudentRollup.objects.bulk_create(_student_rows(), batch_size=1000)
+            return
+        for chunk in _chunks(set(slices)):
+            StudentRollup.objects.filter(_slice_filter(chunk)).delete()
+            StudentRollup.objects.bulk_create(_student_rows(chunk))
+
+
+def refresh_supervisors(nidns=None):
+    """Hitung ulang beban bimbingan untuk dosen `nidns`, atau semua dosen bila None."""
+    dosen = Dosen.objects.all() if nidns is None else Dosen.objects.filter(nidn__in=nidns)
+    loads = {nidn: SupervisorLoad(dosen_id=nidn) for nidn in dosen.values_list('nidn', flat=True)}
+
+    bimbingan = Bimbingan.objects.filter(dosen_id__in=loads).values_list('dosen_id').annotate(total=Count('pk'))
+    for nidn, total in bimbingan.order_by():
+        loads[nidn].bimbingan = total
+
+    proposals = (
+        Proposal.objects.filter(dosen_pembimbing_id__in=loads)
+        .values_list('dosen_pembimbing_id', 'status')
+        .annotate(total=Count('pk'))
+        .order_by()
+    )
+    for nidn, status, total in proposals:
+        field = f'proposal_{status}'
+        if hasattr(loads[nidn], field):
+            setattr(loads[nidn], field, total)
+
+    with transaction.atomic():
+        if nidns is None:
+            SupervisorLoad.objects.all().delete()
+        else:
+            SupervisorLoad.objects.filter(dosen_id__in=nidns).delete()
+        SupervisorLoad.objects.bulk_create(loads.values(), batch_size=1000)
+
+
+def _claim_dirty():
+    """Ambil lalu hapus penanda AnalyticsDirty; dipanggil di dalam transaksi refresh."""
+    dirty = AnalyticsDirty.objects.all()
+    if connections[PRIMARY].features.has_select_for_update_skip_locked:
+        # Worker lain yang sedang me-refresh tidak ditunggu.
+        dirty = dirty.select_for_update(skip_locked=True)
+    dirty = list(dirty.values_list('pk', 'kind', 'key'))
+    if dirty:
+        # Dihapus sebelum menghitung ulang: penanda baru untuk potongan yang
+        # sama dari transaksi lain menunggu transaksi ini selesai lalu
+        # tersimpan, alih-alih ikut terhapus setelah perhitungan.
+        AnalyticsDirty.objects.filter(pk__in=[pk for pk, _, _ in dirty]).delete()
+    return [(kind, key) for _, kind, key in dirty]
+
+
+def refresh_dirty():
+    """
+    Proses semua penanda AnalyticsDirty; mengembalikan jumlah potongan yang
+    dihitung ulang. Dipanggil juga dari endpoint GET yang boleh membaca
+    replica, jadi seluruh refresh (klaim FOR UPDATE dan agregat yang
+    ditulis ke rekap) dipaksa ke primary.
+    """
+    token = use_replicas(False)
+    try:
+        with transaction.atomic(using=PRIMARY):
+            dirty = _claim_dirty()
+            if not dirty:
+                return 0
+
+            slices = [_parse_slice(key) for kind, key in dirty if kind == STUDENTS]
+            nidns = [key for kind, key in dirty if kind == SUPERVISORS]
+            if slices:
+                refresh_students(slices)
+            if nidns:
+                refresh_supervisors(nidns)
+        return len(dirty)
+    finally:
+        reset_replicas(token)
+
+
+def refresh_all():
+    token = use_replicas(False)
+    try:
+        with transaction.atomic(using=PRIMARY):
+            AnalyticsDirty.objects.all().delete()
+            refresh_students()
+            refresh_supervisors()
+    finally:
+        reset_replicas(token)
+
+
+class AnalyticsError(ValueError):
+    pass
+
+
+def _int_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise AnalyticsError(f"{name} harus berupa angka")
+
+
+def student_summary(params):
+    """
+    Jumlah mahasiswa/proposal dari tabel rekap.
+
+    Filter drill-down: `prodi`, `tahun_masuk`, `jk`, `status`; pengelompokan
+    lewat `group_by` (kombinasi prodi,tahun_masuk,jk,status).
+    """
+    group_by = [name.strip() for name in params.get('group_by', 'prodi,tahun_masuk').split(',') if name.strip()]
+    unknown = [name for name in group_by if name not in GROUP_FIELDS]
+    if unknown:
+        raise AnalyticsError(f"group_by tidak dikenal: {', '.join(unknown)}")
+
+    filters = {}
+    prodi = _int_param(params, 'prodi')
+    if prodi is not None:
+        filters['prodi_id'] = prodi
+    tahun_masuk = _int_param(params, 'tahun_masuk')
+    if tahun_masuk is not None:
+        filters['tahun_masuk'] = tahun_masuk
+    if params.get('jk'):
+        filters['jk'] = params['jk']
+    if params.get('status'):
+        filters['proposal_status'] = params['status']
+
+    queryset = StudentRollup.objects.filter(**filters).annotate(
+        prodi_code=F('prodi__code'), prodi_nama=F('prodi__name'),
+    )
+    columns = [column for name in group_by for column in GROUP_FIELDS[name]]
+    totals = queryset.aggregate(mahasiswa=Sum('mahasiswa'), proposal=Sum('proposal'))
+    rows = []
+    if columns:
+        rows = list(
+            queryset.values(*columns)
+            .annotate(mahasiswa=Sum('mahasiswa'), proposal=Sum('proposal'))
+            .order_by(*columns)
+        )
+    return {
+        'group_by': group_by,
+        'totals': {name: value or 0 for name, value in totals.items()},
+        'rows': rows,
+    }
+
+
+def supervisor_summary(params, default_limit=50, max_limit=500):
+    """Beban bimbingan per dosen, terbesar dulu; filter `prodi`, batas `limit`."""
+    queryset = SupervisorLoad.objects.all()
+    prodi = _int_param(params, 'prodi')
+    if prodi is not None:
+        queryset = queryset.filter(dosen__prodi_id=prodi)
+    limit = _int_param(params, 'limit') or default_limit
+    rows = (
+        queryset.values(
+            'dosen_id', 'bimbingan', 'proposal_pending', 'proposal_approved', 'proposal_rejected',
+            nama_dosen=F('dosen__nama_dosen'), prodi_id=F('dosen__prodi_id'),
+        )
+        .order_by('-bimbingan', '-proposal_pending', 'dosen_id')[:max(1, min(limit, max_limit))]
+    )
+    return [{'nidn': row.pop('dosen_id'), **row} for row in rows]
+
+
+def _distribution_counts(model, level, prodi):
+    """Jumlah baris `model` per leluhur tempat lahir di `level`, beserta totalnya."""
+    queryset = model.objects.all()
+    if prodi is not None:
+        queryset = queryset.filter(prodi_id=prodi)
+    rows = (
+        queryset.filter(tempat_lahir__ancestor_links__ancestor__level=level)
+        .values(wilayah_id=F('tempat_lahir__ancestor_links__ancestor_id'))
+        .annotate(jumlah=Count('pk'))
+        .order_by()
+    )
+    return queryset.count(), {row['wilayah_id']: row['jumlah'] for row in rows}
+
+
+def _build_distribution(level, prodi):
+    counts = {
+        STUDENTS: _distribution_counts(Mahasiswa, level, prodi),
+        SUPERVISORS: _distribution_counts(Dosen, level, prodi),
+    }
+    ids = set(counts[STUDENTS][1]) | set(counts[SUPERVISORS][1])
+    rows = [
+        {
+            'code': wilayah['code'],
+            'name': wilayah['name'],
+            STUDENTS: counts[STUDENTS][1].get(wilayah['id'], 0),
+            SUPERVISORS: counts[SUPERVISORS][1].get(wilayah['id'], 0),
+        }
+        for wilayah in Wilayah.objects.filter(id__in=ids).order_by('code').values('id', 'code', 'name')
+    ]
+    return {
+        'level': level,
+        'prodi': prodi,
+        'totals': {kind: total for kind, (total, _) in counts.items()},
+        # Tempat lahir kosong atau tidak berada di bawah wilayah tingkat `level`.
+        'unassigned': {kind: total - sum(by_wilayah.values()) for kind, (total, by_wilayah) in counts.items()},
+        'rows': rows,
+    }
+
+
+def wilayah_distribution(params):
+    """
+    Sebaran tempat lahir mahasiswa dan dosen per wilayah tingkat `level`
+    (1 provinsi, 2 kabupaten/kota), opsional difilter `prodi`.
+    """
+    level = _int_param(params, 'level') or 1
+    if level not in DISTRIBUTION_LEVELS:
+        raise AnalyticsError("level harus 1 (provinsi) atau 2 (kabupaten/kota)")
+    prodi = _int_param(params, 'prodi')
+
+    key = (
+        f"wilayah-distribution:{get_generation(STUDENTS)}:{get_generation(SUPERVISORS)}:"
+        f"{get_generation('wilayah')}:{level}:{'' if prodi is None else prodi}"
+    )
+    cached = cache.get(key)
+    if cached is None:
+        # Dari primary: hasilnya disimpan di bawah generasi yang baru dinaikkan.
+        with primary_reads():
+            cached = _build_distribution(level, prodi)
+        cache.set(key, cached, timeout=DISTRIBUTION_TTL)
+    return cached
@@ -0,0 +1,243 @@
+"""
+View async untuk endpoint baca yang ringan (wilayah, dropdown, dashboard, me).
+
+Dipakai saat aplikasi dijalankan di bawah server ASGI dengan
+ASYNC_READ_VIEWS=True (lihat api/urls.py). Respons dibuat sama dengan versi
+DRF-nya: autentikasi token/session, throttle, pagination, dan format JSON.
+
+Throttle memakai kelas DRF yang sama (`throttle_classes` atau
+DEFAULT_THROTTLE_CLASSES), jadi batas dan counter di cache dibagi dengan
+jalur sync. CachedResponseMixin tidak dipakai karena versi sync endpoint ini
+juga tidak di-cache (mixin itu hanya untuk aksi list/retrieve viewset
+master data); tambahkan cache di sini bila versi sync-nya mulai di-cache.
+
+Setiap request async memakai thread (dan koneksi pool) sendiri untuk query
+ORM-nya. Jumlah request yang menyentuh database dibatasi per worker sebesar
+POOL_OPTIONS['MAX_SIZE'] (atau ASYNC_DB_CONCURRENCY); sisanya antre di event
+loop alih-alih menunggu pool lalu gagal dengan PoolTimeout.
+"""
+import asyncio
+import weakref
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import Throttled
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import User, Division, Wilayah, Religion, EducationLevel, KonsentrasiUtama, Prodi
+from . import typeahead
+from .batch import BATCH_AUTH_ATTR
+from .permission_manifest import user_manifest
+from .renderers import dumps
+from .serializers import MeSerializer
+
+
+
+class AuthenticationFailed(Exception):
+    pass
+
+
+def json_response(data, status=200):
+    # Renderer yang sama dengan DRF agar keluaran identik dengan versi sync.
+    return HttpResponse(dumps(data), status=status, content_type='application/json')
+
+
+def unauthorized(detail):
+    response = json_response({'detail': detail}, status=401)
+    response['WWW-Authenticate'] = 'Token'
+    return response
+
+
+async def authenticate(request):
+    """Padanan TokenAuthentication + SessionAuthentication DRF untuk view async."""
+    batch_auth = getattr(request, BATCH_AUTH_ATTR, None)
+    if batch_auth is not None:
+        return batch_auth[0]
+
+    auth = request.headers.get('Authorization', '').split()
+    if auth and auth[0].lower() == 'token':
+        if len(auth) != 2:
+            raise AuthenticationFailed('Invalid token header.')
+        try:
+            token = await Token.objects.select_related('user').aget(key=auth[1])
+        except Token.DoesNotExist:
+            raise AuthenticationFailed('Invalid token.')
+        if not token.user.is_active:
+            raise AuthenticationFailed('User inactive or deleted.')
+        return token.user
+
+    user = await sync_to_async(get_user)(request)
+    return user if user.is_authenticated else None
+
+
+def throttled(wait):
+    response = json_response({'detail': Throttled(wait).detail}, status=429)
+    if wait is not None:
+        response['Retry-After'] = str(int(wait))
+    return response
+
+
+def check_throttles(request, view, throttle_classes):
+    """Padanan APIView.check_throttles: (ditolak, waktu tunggu terlama atau None)."""
+    # Throttle DRF membaca request.user (UserThrottle) dan request.META (IP).
+    request.user = request.api_user or AnonymousUser()
+    durations = []
+    for throttle in (throttle_class() for throttle_class in throttle_classes):
+        if not throttle.allow_request(request, view):
+            durations.append(throttle.wait())
+    return bool(durations), max((duration for duration in durations if duration is not None), default=None)
+
+
+_db_slots = weakref.WeakKeyDictionary()
+
+
+def db_slots():
+    """
+    Semaphore yang membatasi request async yang sedang memakai koneksi DB.
+
+    Satu semaphore per event loop: di bawah ASGI hanya ada satu loop per
+    worker, sedangkan view yang dipanggil lewat async_to_sync (mis. sub-request
+    /api/batch/ di worker WSGI) mendapat loop baru per panggilan dan
+    asyncio.Semaphore tidak boleh dipakai lintas loop.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _db_slots.get(loop)
+    if slots is None:
+        options = settings.DATABASES['default'].get('POOL_OPTIONS', {})
+        slots = _db_slots[loop] = asyncio.Semaphore(
+            getattr(settings, 'ASYNC_DB_CONCURRENCY', None) or options.get('MAX_SIZE', 10)
+        )
+    return slots
+
+
+def async_api_view(require_auth=False, throttle_classes=None):
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return json_response({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+            async with db_slots():
+                try:
+                    return await handle(request, *args, **kwargs)
+                finally:
+                    # Kembalikan koneksi thread request ini ke pool sebelum slot dilepas.
+                    await sync_to_async(close_old_connections)()
+
+        async def handle(request, *args, **kwargs):
+            try:
+                request.api_user = await authenticate(request)
+            except AuthenticationFailed as e:
+                return unauthorized(str(e))
+            if require_auth and request.api_user is None:
+                return unauthorized('Authentication credentials were not provided.')
+            classes = api_settings.DEFAULT_THROTTLE_CLASSES if throttle_classes is None else throttle_classes
+            if classes:
+                rejected, wait = await sync_to_async(check_throttles)(request, view, classes)
+                if rejected:
+                    return throttled(wait)
+            return await view(request, *args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+async def paginate(request, queryset):
+    """Padanan PageNumberPagination dengan PAGE_SIZE dari REST_FRAMEWORK."""
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    count = await queryset.acount()
+    num_pages = max(1, -(-count // page_size))
+
+    page = request.GET.get('page', 1)
+    try:
+        page = num_pages if page == 'last' else int(page)
+    except (TypeError, ValueError):
+        page = 0
+    if page < 1 or page > num_pages:
+        return None
+
+    offset = (page - 1) * page_size
+    results = [row async for row in queryset[offset:offset + page_size]]
+
+    url = request.build_absolute_uri()
+    next_url = replace_query_param(url, 'page', page + 1) if page < num_pages else None
+    if page <= 1:
+        previous_url = None
+    elif page == 2:
+        previous_url = remove_query_param(url, 'page')
+    else:
+        previous_url = replace_query_param(url, 'page', page - 1)
+
+    return {'count': count, 'next': next_url, 'previous': previous_url, 'results': results}
+
+
+@async_api_view()
+async def wilayah_list(request):
+    level = request.GET.get('level')
+    parent_code = request.GET.get('parent_code')
+
+    queryset = Wilayah.objects.all().order_by('code')
+    if level:
+        try:
+            level = int(level)
+            if 1 <= level <= 4:
+                queryset = queryset.filter(level=level)
+        except (ValueError, TypeError):
+            pass
+    if parent_code:
+        queryset = queryset.filter(parent_code=parent_code)
+
+    page = await paginate(request, queryset.values('id', 'code', 'name', 'level'))
+    if page is None:
+        return json_response({'detail': 'Invalid page.'}, status=404)
+    return json_response(page)
+
+
+async def typeahead_search(request, name):
+    return await sync_to_async(typeahead.search)(name, request.GET.get('q'), request.GET.get('limit'))
+
+
+@async_api_view()
+async def prodi_dropdown(request):
+    if 'q' in request.GET or 'limit' in request.GET:
+        return json_response(await typeahead_search(request, 'prodi'))
+    return json_response([row async for row in Prodi.objects.all().values('id', 'name')])
+
+
+@async_api_view()
+async def konsentrasi_dropdown(request):
+    if 'q' in request.GET or 'limit' in request.GET:
+        return json_response(await typeahead_search(request, 'konsentrasi'))
+    return json_response([row async for row in KonsentrasiUtama.objects.all().values('id', 'name')])
+
+
+@async_api_view(require_auth=True)
+async def dashboard_stats(request):
+    users, divisions, religions, wilayah, education_levels = await asyncio.gather(
+        User.objects.acount(),
+        Division.objects.acount(),
+        Religion.objects.acount(),
+        Wilayah.objects.acount(),
+        EducationLevel.objects.acount(),
+    )
+    return json_response({
+        'users': users,
+        'divisions': divisions,
+        'religions': religions,
+        'wilayah': wilayah,
+        'education_levels': education_levels,
+    })
+
+
+@async_api_view(require_auth=True)
+async def me(request):
+    user = await User.objects.select_related('role', 'division').aget(pk=request.api_user.pk)
+    manifest = await sync_to_async(user_manifest)(user)
+    # Relasi sudah dimuat, serialisasi tidak lagi menyentuh database.
+    return json_response(MeSerializer(user, context={'request': request, 'manifest': manifest}).data)
@@ -0,0 +1,162 @@
+"""
+Eksekusi beberapa sub-request GET dalam satu request `/api/batch/`.
+
+Sub-request diresolusi langsung ke URLconf dan view-nya dipanggil di dalam
+proses, tanpa melewati middleware lagi. User hasil autentikasi request batch
+dipakai ulang lewat BatchAuthentication (tidak ada lookup token per
+sub-request) dan, pada mode berurutan, koneksi database yang sama juga dipakai
+bersama.
+
+Pada mode paralel hanya view sync yang dikirim ke thread pool; view async
+tetap dijalankan berurutan di thread pemanggil.
+"""
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.exceptions import PermissionDenied
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.http import Http404
+from django.urls import Resolver404, resolve
+from rest_framework.authentication import BaseAuthentication
+
+MAX_REQUESTS = 20
+MAX_WORKERS = 4
+
+# Atribut request Django tempat _subrequest() menitipkan (user, auth) request
+# batch. Tidak bisa diisi dari header HTTP, jadi aman dibaca tanpa verifikasi.
+BATCH_AUTH_ATTR = 'batch_auth'
+
+
+class BatchError(ValueError):
+    pass
+
+
+class BatchAuthentication(BaseAuthentication):
+    """
+    Autentikasi sub-request batch: memakai user dan token hasil autentikasi
+    request /api/batch/. Request biasa dilewati ke kelas berikutnya.
+    """
+
+    def authenticate(self, request):
+        return getattr(request._request, BATCH_AUTH_ATTR, None)
+
+    def authenticate_header(self, request):
+        # DRF mengambil header WWW-Authenticate respons 401 dari kelas pertama.
+        return 'Token'
+
+
+def parse_paths(payload, base):
+    """Daftar path absolut dari body `{"requests": [...]}` (string atau {"path": ...})."""
+    items = payload.get('requests') if isinstance(payload, dict) else payload
+    if not isinstance(items, list) or not items:
+        raise BatchError("Body harus berisi daftar 'requests'.")
+    if len(items) > MAX_REQUESTS:
+        raise BatchError(f"Maksimal {MAX_REQUESTS} sub-request per batch.")
+
+    paths = []
+    for item in items:
+        if isinstance(item, dict):
+            if item.get('method', 'GET').upper() != 'GET':
+                raise BatchError("Sub-request hanya boleh GET.")
+            item = item.get('path')
+        if not isinstance(item, str) or not item.strip():
+            raise BatchError("Setiap sub-request harus berupa path.")
+        url = urlsplit(item.strip())
+        if url.scheme or url.netloc:
+            raise BatchError(f"Path harus relatif: {item}")
+        path = url.path if url.path.startswith('/') else base + url.path
+        paths.append(path + (f'?{url.query}' if url.query else ''))
+    return paths
+
+
+def _subrequest(request, path):
+    url = urlsplit(path)
+    environ = {
+        key: value for key, value in request.META.items()
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IF_NONE_MATCH')
+    }
+    environ.update({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'CONTENT_LENGTH': '0',
+        'wsgi.input': BytesIO(),
+    })
+    sub = WSGIRequest(environ)
+    sub.user = request.user
+    if hasattr(request, 'session'):
+        sub.session = request.session
+    if request.user.is_authenticated:
+        setattr(sub, BATCH_AUTH_ATTR, (request.user, getattr(request, 'auth', None)))
+    return sub
+
+
+def _body(response):
+    if hasattr(response, 'data'):
+        return response.data
+    if response.get('Content-Type', '').startswith('application/json') and response.content:
+        return json.loads(response.content)
+    return response.content.decode(response.charset or 'utf-8', errors='replace')
+
+
+def _is_async(path):
+    try:
+        return iscoroutinefunction(resolve(urlsplit(path).path).func)
+    except Resolver404:
+        return False
+
+
+def execute(request, path):
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return {'path': path, 'status': 404, 'body': {'detail': 'Not found.'}}
+    if match.url_name == 'batch':
+        return {'path': path, 'status': 400, 'body': {'error': 'Batch tidak boleh bersarang.'}}
+
+    view = async_to_sync(match.func) if iscoroutinefunction(match.func) else match.func
+    try:
+        response = view(_subrequest(request, path), *match.args, **match.kwargs)
+    except Http404:
+        return {'path': path, 'status': 404, 'body': {'detail': 'Not found.'}}
+    except PermissionDenied:
+        return {'path': path, 'status': 403, 'body': {'detail': 'Permission denied.'}}
+    return {'path': path, 'status': response.status_code, 'body': _body(response)}
+
+
+def _execute_in_thread(context, request, path):
+    try:
+        return context.run(execute, request, path)
+    finally:
+        # Koneksi milik thread pekerja dikembalikan ke pool.
+        connections.close_all()
+
+
+def run_batch(request, paths, parallel=False):
+    if not parallel or len(paths) == 1:
+        return [execute(request, path) for path in paths]
+
+    # View async berjalan lewat async_to_sync; di thread pekerja tiap panggilan
+    # membuat event loop sendiri, jadi view itu dijalankan di thread ini saja.
+    pooled = [i for i, path in enumerate(paths) if not _is_async(path)]
+    if len(pooled) < 2:
+        return [execute(request, path) for path in paths]
+
+    results = [None] * len(paths)
+    # Konteks (mis. izin baca replica dari middleware) ikut ke tiap thread.
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(pooled))) as executor:
+        futures = {
+            i: executor.submit(_execute_in_thread, contextvars.copy_context(), request, paths[i])
+            for i in pooled
+        }
+        for i, path in enumerate(paths):
+            if i not in futures:
+                results[i] = execute(request, path)
+        for i, future in futures.items():
+            results[i] = future.result()
+    return results
@@ -0,0 +1,92 @@
+"""
+Pemuatan baris dalam jumlah besar langsung ke tabel.
+
+Di PostgreSQL baris dikirim dengan COPY ... FROM STDIN; backend lain
+memakai INSERT executemany per batch. Keduanya melewati ORM (tanpa
+signal, tanpa auto_now), jadi nilai setiap kolom harus sudah lengkap.
+"""
+from datetime import date, datetime
+from io import StringIO
+
+from django.core.management.color import no_style
+from django.db import connections
+from django.db.models import Max
+
+BATCH_SIZE = 10000
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def columns_of(model, names):
+    """Nama kolom database untuk field `names` (boleh nama field atau attname)."""
+    return [model._meta.get_field(name).column for name in names]
+
+
+def copy_into(table, columns, rows, using='default'):
+    """Muat `rows` ke `table` (nama tabel dan kolom mentah, belum di-quote)."""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    rows = list(rows)
+    if not rows:
+        return 0
+    table = quote(table)
+    names = ', '.join(quote(column) for column in columns)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            buffer = StringIO()
+            for row in rows:
+                buffer.write('\t'.join(_copy_value(value) for value in row))
+                buffer.write('\n')
+            buffer.seek(0)
+            raw = cursor.cursor
+            sql = f'COPY {table} ({names}) FROM STDIN'
+            if hasattr(raw, 'copy_expert'):
+                raw.copy_expert(sql, buffer)
+            else:
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+        else:
+            placeholders = ', '.join(['%s'] * len(columns))
+            cursor.executemany(f'INSERT INTO {table} ({names}) VALUES ({placeholders})', rows)
+    return len(rows)
+
+
+def copy_rows(model, names, rows, using='default'):
+    """Muat `rows` (tuple sesuai urutan field `names`) ke tabel model."""
+    return copy_into(model._meta.db_table, columns_of(model, names), rows, using)
+
+
+def next_pk(model, using='default'):
+    """Primary key berikutnya bila baris dimuat dengan id eksplisit."""
+    return (model._default_manager.using(using).aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+def reset_sequences(*models, using='default'):
+    """Samakan sequence id dengan isi tabel setelah baris dimuat dengan id eksplisit."""
+    connection = connections[using]
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def analyze(*models, using='default'):
+    """Perbarui statistik planner setelah pemuatan besar (hanya PostgreSQL)."""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for model in models:
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
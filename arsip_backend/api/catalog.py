@@ -0,0 +1,46 @@
+import hashlib
+
+from django.core.cache import cache
+
+from .db_router import primary_reads
+from .generations import get_generation
+from .models import Prodi
+from .renderers import dumps
+
+CATALOG_TTL = 60 * 60 * 24
+
+
+def build_catalog():
+    """Pohon prodi -> konsentrasi dari satu query LEFT JOIN."""
+    rows = Prodi.objects.order_by('code', 'konsentrasiutama__name', 'konsentrasiutama__id').values_list(
+        'id', 'code', 'name',
+        'konsentrasiutama__id', 'konsentrasiutama__code', 'konsentrasiutama__name',
+    )
+    catalog = []
+    for prodi_id, prodi_code, prodi_name, konsentrasi_id, konsentrasi_code, konsentrasi_name in rows:
+        if not catalog or catalog[-1]['id'] != prodi_id:
+            catalog.append({'id': prodi_id, 'code': prodi_code, 'name': prodi_name, 'konsentrasi': []})
+        if konsentrasi_id is not None:
+            catalog[-1]['konsentrasi'].append(
+                {'id': konsentrasi_id, 'code': konsentrasi_code, 'name': konsentrasi_name}
+            )
+    return catalog
+
+
+def get_catalog():
+    """
+    Katalog beserta ETag-nya, di-cache per generasi data prodi/konsentrasi.
+
+    Setiap penulisan Prodi/KonsentrasiUtama menaikkan generasi (lihat
+    api/signals.py), sehingga kunci lama tidak lagi dipakai. Katalog baru
+    dibangun dari primary agar tidak tersimpan dari replica yang tertinggal.
+    """
+    key = f"catalog:{get_generation('prodi')}:{get_generation('konsentrasi')}"
+    cached = cache.get(key)
+    if cached is None:
+        with primary_reads():
+            catalog = build_catalog()
+        digest = hashlib.sha256(dumps(catalog)).hexdigest()[:16]
+        cached = {'catalog': catalog, 'etag': f'"{digest}"'}
+        cache.set(key, cached, timeout=CATALOG_TTL)
+    return cached
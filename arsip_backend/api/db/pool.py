@@ -0,0 +1,205 @@
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_OPTIONS = {
+    'MAX_SIZE': 10,
+    'MAX_OVERFLOW': 10,
+    'TIMEOUT': 10,
+    'RECYCLE': 1800,
+    'HEALTH_CHECK_INTERVAL': 30,
+}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Pool koneksi DB-API yang thread-safe.
+
+    Menyimpan hingga MAX_SIZE koneksi idle; saat ramai boleh membuka
+    MAX_OVERFLOW koneksi tambahan yang ditutup lagi ketika dikembalikan.
+    Bila pool penuh, checkout menunggu hingga TIMEOUT detik. Koneksi yang
+    lebih tua dari RECYCLE detik dibuang, dan koneksi yang sudah idle lebih
+    lama dari HEALTH_CHECK_INTERVAL dicek dengan `SELECT 1` sebelum dipakai.
+    """
+
+    def __init__(self, max_size, max_overflow, timeout, recycle, health_check_interval):
+        self.max_size = max_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.health_check_interval = health_check_interval
+
+        self.condition = threading.Condition()
+        self.idle = deque()  # (connection, created_at, last_used_at)
+        self.created_at = {}
+        self.size = 0
+        self.stats = {
+            'checkouts': 0,
+            'checkins': 0,
+            'connects': 0,
+            'disconnects': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'health_check_failures': 0,
+        }
+
+    def _discard(self, connection):
+        self.size -= 1
+        self.stats['disconnects'] += 1
+        self.created_at.pop(id(connection), None)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _healthy(self, connection, last_used_at):
+        """Dipanggil tanpa memegang lock: `SELECT 1` bisa lambat saat jaringan bermasalah."""
+        if connection.closed:
+            return False
+        if time.monotonic() - last_used_at < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except Exception:
+            with self.condition:
+                self.stats['health_check_failures'] += 1
+            return False
+
+    def _checkout_idle(self, deadline):
+        """
+        Ambil koneksi idle (atau jatah koneksi baru) di bawah lock. Mengembalikan
+        (connection, created_at, last_used_at), atau None bila boleh membuka
+        koneksi baru.
+        """
+        with self.condition:
+            while True:
+                if self.idle:
+                    return self.idle.pop()
+
+                if self.size < self.max_size + self.max_overflow:
+                    self.size += 1
+                    return None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats['timeouts'] += 1
+                    raise PoolTimeout(
+                        f"Tidak ada koneksi tersedia setelah {self.timeout} detik "
+                        f"(max_size={self.max_size}, max_overflow={self.max_overflow})"
+                    )
+                self.stats['waits'] += 1
+                self.condition.wait(remaining)
+
+    def checkout(self, connect):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            idle = self._checkout_idle(deadline)
+            if idle is None:
+                break
+            connection, created_at, last_used_at = idle
+            expired = time.monotonic() - created_at > self.recycle
+            # Cek kesehatan di luar lock agar checkout/checkin thread lain tidak tertahan.
+            healthy = not expired and self._healthy(connection, last_used_at)
+            with self.condition:
+                if healthy:
+                    self.stats['checkouts'] += 1
+                    return connection
+                self._discard(connection)
+                self.condition.notify()
+
+        # Koneksi baru dibuka di luar lock agar thread lain tidak ikut menunggu.
+        try:
+            connection = connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.created_at[id(connection)] = time.monotonic()
+            self.stats['connects'] += 1
+            self.stats['checkouts'] += 1
+        return connection
+
+    def checkin(self, connection):
+        reusable = not connection.closed
+        if reusable:
+            try:
+                connection.rollback()
+            except Exception:
+                reusable = False
+
+        with self.condition:
+            if id(connection) not in self.created_at:
+                # Dipinjam dari pool yang sudah diganti (lihat get_pool).
+                connection.close()
+                return
+            self.stats['checkins'] += 1
+            created_at = self.created_at[id(connection)]
+            if reusable and len(self.idle) < self.max_size:
+                self.idle.append((connection, created_at, time.monotonic()))
+            else:
+                self._discard(connection)
+            self.condition.notify()
+
+    def close_all(self):
+        with self.condition:
+            while self.idle:
+                self._discard(self.idle.pop()[0])
+
+    def snapshot(self):
+        with self.condition:
+            return {
+                **self.stats,
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                'max_size': self.max_size,
+                'max_overflow': self.max_overflow,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_pools_pid = os.getpid()
+
+
+def get_pool(alias, options, database=None):
+    """
+    Pool per alias database per proses; dibuat ulang setelah fork (gunicorn)
+    dan bila nama database alias berubah (test runner beralih ke DB uji).
+    """
+    global _pools_pid
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            # Koneksi milik proses induk tidak boleh dipakai bersama.
+            _pools.clear()
+            _pools_pid = os.getpid()
+        current = _pools.get(alias)
+        if current is not None and current[0] != database:
+            # Koneksi idle pool lama terhubung ke database lain.
+            current[1].close_all()
+            current = None
+        if current is None:
+            options = {**DEFAULT_OPTIONS, **(options or {})}
+            current = _pools[alias] = (database, ConnectionPool(
+                max_size=options['MAX_SIZE'],
+                max_overflow=options['MAX_OVERFLOW'],
+                timeout=options['TIMEOUT'],
+                recycle=options['RECYCLE'],
+                health_check_interval=options['HEALTH_CHECK_INTERVAL'],
+            ))
+        return current[1]
+
+
+def pool_stats():
+    with _pools_lock:
+        pools = dict(_pools) if _pools_pid == os.getpid() else {}
+    return {alias: pool.snapshot() for alias, (_, pool) in pools.items()}
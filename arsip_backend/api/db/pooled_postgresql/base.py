@@ -0,0 +1,40 @@
+from django.db.backends.postgresql import base, creation
+
+from ..pool import PoolTimeout, get_pool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Koneksi idle di pool masih terhubung ke DB uji; DROP DATABASE ditolak
+        # selama ada sesi lain, jadi pool dikosongkan dulu.
+        self.connection.connection_pool.close_all()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Backend PostgreSQL yang meminjam koneksi dari pool per proses alih-alih
+    membuka koneksi baru di setiap request. Opsi pool diatur lewat kunci
+    POOL_OPTIONS pada konfigurasi database.
+
+    Dengan CONN_MAX_AGE = 0, Django "menutup" koneksi di akhir request;
+    backend ini mengembalikannya ke pool sehingga koneksi fisik tetap hidup.
+    """
+
+    creation_class = DatabaseCreation
+
+    @property
+    def connection_pool(self):
+        return get_pool(self.alias, self.settings_dict.get('POOL_OPTIONS'), self.settings_dict['NAME'])
+
+    def get_new_connection(self, conn_params):
+        try:
+            return self.connection_pool.checkout(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        except PoolTimeout as e:
+            raise self.Database.OperationalError(str(e)) from e
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.connection_pool.checkin(self.connection)
+            self.connection = None
@@ -0,0 +1,61 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+
+# Secara bawaan semua query ke primary; ReplicaPinningMiddleware yang
+# mengizinkan replica untuk request baca yang tidak sedang di-pin.
+_use_primary = ContextVar('use_primary', default=True)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != PRIMARY]
+
+
+def use_replicas(allowed):
+    """Atur apakah query baca pada konteks ini boleh ke replica. Mengembalikan token reset."""
+    return _use_primary.set(not allowed)
+
+
+def reset_replicas(token):
+    _use_primary.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """
+    Paksa query baca di dalam blok ke primary. Dipakai saat mengisi cache
+    bertag generasi: replica yang tertinggal bisa menghitung data sebelum
+    penulisan lalu menyimpannya di bawah generasi yang sudah dinaikkan.
+    """
+    token = use_replicas(False)
+    try:
+        yield
+    finally:
+        reset_replicas(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Tulis selalu ke `default`; baca ke salah satu replica bila konteks
+    request mengizinkan. Alias selain `default` di DATABASES dianggap replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if _use_primary.get() or not replicas:
+            return PRIMARY
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary dan replica berisi data yang sama.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
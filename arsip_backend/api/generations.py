@@ -0,0 +1,29 @@
+import time
+
+from django.core.cache import cache
+
+
+def _key(name):
+    return f'generation:{name}'
+
+
+def _seed():
+    # Nilai awal tidak pernah berulang: bila kunci generasi hilang (cull atau
+    # cache dikosongkan), generasi baru selalu lebih besar dari semua nilai
+    # sebelumnya, jadi entri turunan yang lama tidak bisa terpakai lagi.
+    return time.time_ns()
+
+
+def get_generation(name):
+    """Nomor generasi data bernama `name`, dibagi antar worker lewat cache."""
+    return cache.get_or_set(_key(name), _seed, timeout=None)
+
+
+def bump_generation(name):
+    """Tandai semua turunan data `name` (cache, indeks) sebagai usang."""
+    try:
+        return cache.incr(_key(name))
+    except ValueError:
+        generation = _seed()
+        cache.set(_key(name), generation, timeout=None)
+        return generation
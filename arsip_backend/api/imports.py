@@ -0,0 +1,640 @@
+import hashlib
+from io import BytesIO
+
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from . import analytics, bulk
+from .generations import bump_generation
+from .models import (
+    Division, Prodi, KonsentrasiUtama, Dosen, ImportFile, ImportRowHash, Mahasiswa, Role, User, Wilayah,
+)
+from .wilayah_resolver import resolve_tempat_lahir
+
+# pandas (beserta NumPy, dan openpyxl untuk .xlsx) diimpor di dalam fungsi
+# yang memakainya: modul ini ikut dimuat oleh api.views, sehingga impor di
+# level modul membebani start setiap worker dan management command.
+# ImportBudgetTests (api/tests.py) menjaga agar `import api.views` tetap ringan.
+
+SAMPLE_SIZE = 20
+LOOKUP_CHUNK = 5000
+STAGING_TABLE = 'import_staging'
+
+# Definisi kolom per master data: kunci natural, kolom yang dibandingkan,
+# kolom wajib, relasi (dicocokkan lewat kolom `code` tabel tujuan),
+# serta kolom bertipe tanggal/angka yang perlu dinormalisasi. Khusus impor
+# cepat (fast_import): default baris baru, kolom unik selain kunci, kolom
+# username untuk akun user yang dibuat, jenis rekap analitik terkait, dan
+# generasi cache yang dinaikkan setelah impor. `upsert` menandai master data
+# yang jalur upload biasanya juga update_or_create per kunci, sehingga
+# preview_upload berlaku untuk kedua mode; selain itu hanya untuk mode=fast.
+UPLOAD_SPECS = {
+    'prodi': {
+        'model': Prodi,
+        'key': 'code',
+        'fields': ['name'],
+        'required': ['code', 'name'],
+        'relations': {},
+        'dates': [],
+        'integers': [],
+        'generation': 'prodi',
+        'upsert': True,
+    },
+    'konsentrasi': {
+        'model': KonsentrasiUtama,
+        'key': 'code',
+        'fields': ['name'],
+        'required': ['code', 'name'],
+        'relations': {},
+        'dates': [],
+        'integers': [],
+        'generation': 'konsentrasi',
+        'upsert': True,
+    },
+    'mahasiswa': {
+        'model': Mahasiswa,
+        'key': 'nim',
+        'fields': [
+            'nama_mahasiswa', 'alamat', 'tempat_lahir', 'tgl_lahir', 'jk',
+            'tahun_masuk', 'prodi', 'konsentrasi', 'judul_skripsi',
+        ],
+        'required': ['nim', 'nama_mahasiswa', 'prodi'],
+        'relations': {'prodi': Prodi, 'konsentrasi': KonsentrasiUtama, 'tempat_lahir': Wilayah},
+        'dates': ['tgl_lahir'],
+        'integers': ['tahun_masuk'],
+        'defaults': {'jk': 'L', 'tahun_masuk': 0},
+        'user': 'nim',
+        'analytics': analytics.STUDENTS,
+        'generation': analytics.STUDENTS,
+    },
+    'dosen': {
+        'model': Dosen,
+        'key': 'nidn',
+        'fields': [
+            'kode_dosen', 'nama_dosen', 'gelar_depan', 'gelar_belakang', 'jk',
+            'tempat_lahir', 'tgl_lahir', 'prodi', 'konsentrasi',
+            'status_aktif', 'jabatan_fungsional',
+        ],
+        'required': ['nidn', 'kode_dosen', 'nama_dosen', 'prodi'],
+        'relations': {'prodi': Prodi, 'konsentrasi': KonsentrasiUtama, 'tempat_lahir': Wilayah},
+        'dates': ['tgl_lahir'],
+        'integers': [],
+        'unique': ['kode_dosen'],
+        'analytics': analytics.SUPERVISORS,
+        'generation': analytics.SUPERVISORS,
+    },
+}
+
+
+class UploadError(ValueError):
+    pass
+
+
+def read_upload(file, **kwargs):
+    """Baca file .xlsx/.csv hasil upload menjadi DataFrame."""
+    import pandas as pd
+
+    ext = file.name.split('.')[-1].lower()
+    content = file.read()
+    if ext == 'xlsx':
+        return pd.read_excel(BytesIO(content), engine='openpyxl', **kwargs)
+    if ext == 'csv':
+        try:
+            return pd.read_csv(BytesIO(content), encoding='utf-8-sig', **kwargs)
+        except UnicodeDecodeError:
+            return pd.read_csv(BytesIO(content), encoding='latin-1', **kwargs)
+    raise UploadError("Format file tidak didukung. Gunakan .xlsx atau .csv")
+
+
+def is_dry_run(request):
+    return request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes')
+
+
+def check_dry_run(spec, fast):
+    """Tolak dry_run untuk jalur tulis yang tidak dimodelkan preview_upload."""
+    if not fast and not spec.get('upsert'):
+        raise UploadError("dry_run untuk data ini hanya tersedia bersama mode=fast")
+
+
+def _clean(series):
+    """Normalisasi kolom menjadi string ter-trim, nilai kosong menjadi None."""
+    cleaned = series.astype('string').str.strip()
+    cleaned = cleaned.mask(cleaned.isin(['', 'nan', 'NaN', 'None']))
+    return cleaned.astype(object).where(cleaned.notna(), None)
+
+
+def _chunks(values, size=LOOKUP_CHUNK):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _existing_codes(model, codes):
+    found = set()
+    for chunk in _chunks(codes):
+        found.update(model.objects.filter(code__in=chunk).values_list('code', flat=True))
+    return found
+
+
+def _fetch_existing(spec, keys, fields):
+    """Ambil baris yang sudah ada berdasarkan kunci natural, relasi sebagai kode."""
+    import pandas as pd
+
+    model = spec['model']
+    key = spec['key']
+    lookups = {
+        field: f'{field}__code' if field in spec['relations'] else field
+        for field in fields
+    }
+    rows = []
+    for chunk in _chunks(keys):
+        rows.extend(
+            model.objects.filter(**{f'{key}__in': chunk}).values_list(key, *lookups.values())
+        )
+    existing = pd.DataFrame(rows, columns=[key, *fields], dtype=object)
+    for column in existing.columns:
+        existing[column] = _clean(existing[column])
+    return existing
+
+
+def _reject(reason, mask, message):
+    """Isi alasan penolakan untuk baris `mask` yang belum punya alasan."""
+    import pandas as pd
+
+    mask = mask & reason.isna()
+    if isinstance(message, pd.Series):
+        message = message[mask]
+    reason[mask] = message
+
+
+def _normalize(df, spec):
+    """
+    Kolom kunci dan field yang ada di file dalam bentuk string ter-trim
+    (tanggal ISO, angka bulat, tempat lahir sebagai kode wilayah), beserta
+    alasan penolakan per baris untuk kolom wajib dan format yang salah.
+    """
+    import pandas as pd
+
+    key = spec['key']
+    fields = [field for field in spec['fields'] if field in df.columns]
+    frame = pd.DataFrame({column: _clean(df[column]) for column in [key, *fields]})
+    frame['_row'] = frame.index + 2
+
+    reason = pd.Series(None, index=frame.index, dtype=object)
+
+    for column in spec['required']:
+        if column in frame:
+            _reject(reason, frame[column].isna(), f"{column} kosong")
+
+    for column in spec['dates']:
+        if column in frame:
+            parsed = pd.to_datetime(frame[column], errors='coerce')
+            _reject(reason, frame[column].notna() & parsed.isna(), f"Format {column} tidak valid")
+            frame[column] = _clean(parsed.dt.strftime('%Y-%m-%d'))
+
+    for column in spec['integers']:
+        if column in frame:
+            parsed = pd.to_numeric(frame[column], errors='coerce')
+            _reject(reason, frame[column].notna() & parsed.isna(), f"{column} harus berupa angka")
+            frame[column] = _clean(parsed.astype('Int64'))
+
+    # Tempat lahir boleh berupa kode atau nama wilayah; nama dipetakan ke
+    # kode lewat indeks nama sebelum dicocokkan seperti relasi lainnya.
+    if 'tempat_lahir' in frame:
+        codes = resolve_tempat_lahir(frame['tempat_lahir'].dropna().unique(), field='code')
+        frame['tempat_lahir'] = frame['tempat_lahir'].map(lambda value: codes.get(value) or value)
+
+    return frame, fields, reason
+
+
+def preview_upload(df, spec, sample_size=SAMPLE_SIZE):
+    """
+    Bandingkan isi file dengan tabel tanpa menulis apa pun.
+
+    Baris yang sudah ada diambil sekali berdasarkan kunci natural, lalu
+    digabung dengan DataFrame file sehingga seluruh perbandingan berjalan
+    secara vektor, bukan per baris.
+    """
+    import pandas as pd
+
+    key = spec['key']
+    frame, fields, reason = _normalize(df, spec)
+
+    for column, model in spec['relations'].items():
+        if column in frame:
+            known = _existing_codes(model, frame[column].dropna().unique())
+            unknown = frame[column].notna() & ~frame[column].isin(known)
+            _reject(reason, unknown, f"{column} '" + frame[column].astype(str) + "' tidak ditemukan")
+
+    _reject(reason, frame[key].notna() & frame.duplicated(key, keep='last'), f"{key} duplikat di dalam file")
+
+    rejected = frame[reason.notna()]
+    valid = frame[reason.isna()]
+
+    existing = _fetch_existing(spec, valid[key].unique(), fields)
+    merged = valid.merge(existing, on=key, how='left', suffixes=('', '__db'), indicator=True)
+    inserts = merged[merged['_merge'] == 'left_only']
+    matched = merged[merged['_merge'] == 'both']
+
+    diff = pd.DataFrame(index=matched.index)
+    for field in fields:
+        new, old = matched[field], matched[f'{field}__db']
+        diff[field] = ~((new == old) | (new.isna() & old.isna()))
+    changed = diff.any(axis=1) if fields else pd.Series(False, index=matched.index)
+    updates = matched[changed]
+    unchanged = matched[~changed]
+
+    update_samples = []
+    for idx, row in updates.head(sample_size).iterrows():
+        update_samples.append({
+            'row': int(row['_row']),
+            key: row[key],
+            'changes': {
+                field: {'old': row[f'{field}__db'], 'new': row[field]}
+                for field in fields if diff.at[idx, field]
+            },
+        })
+
+    return {
+        'dry_run': True,
+        'counts': {
+            'total': len(frame),
+            'insert': len(inserts),
+            'update': len(updates),
+            'unchanged': len(unchanged),
+            'reject': len(rejected),
+        },
+        'inserts': [
+            {'row': int(row['_row']), **{column: row[column] for column in [key, *fields]}}
+            for _, row in inserts.head(sample_size).iterrows()
+        ],
+        'updates': update_samples,
+        'unchanged': list(unchanged[key].head(sample_size)),
+        'rejects': [
+            {'row': int(frame.at[idx, '_row']), key: frame.at[idx, key], 'error': reason[idx]}
+            for idx in rejected.index[:sample_size]
+        ],
+    }
+
+
+def is_fast_import(request):
+    return request.query_params.get('mode', '').lower() == 'fast'
+
+
+def is_full_snapshot(request):
+    return request.query_params.get('snapshot', '').lower() == 'full'
+
+
+def upload_digest(file):
+    """SHA-256 isi file upload; posisi baca dikembalikan ke awal."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.read(1 << 20), b''):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def _kind(spec):
+    return spec['model']._meta.model_name
+
+
+def previous_import(spec, digest, snapshot=False, using=DEFAULT_DB_ALIAS):
+    """
+    Hasil kosong bila file identik dengan impor terakhir yang berhasil
+    (snapshot penuh hanya dilewati bila impor terakhir juga snapshot penuh),
+    selain itu None. Digest dihapus oleh signal begitu ada baris yang diubah
+    di luar impor.
+    """
+    known = ImportFile.objects.using(using).filter(kind=_kind(spec), digest=digest).first()
+    if known is None or (snapshot and not known.snapshot):
+        return None
+    return {
+        'skipped': True,
+        'counts': {'total': 0, 'insert': 0, 'update': 0, 'unchanged': 0, 'delete': 0, 'reject': 0},
+        'rejects': [],
+    }
+
+
+def import_summary(result):
+    """Bentuk respons endpoint upload untuk hasil fast_import/previous_import."""
+    counts = result['counts']
+    return {
+        "message": "File sama dengan impor terakhir, tidak ada perubahan" if result.get('skipped') else "Upload berhasil",
+        "created": counts['insert'],
+        "updated": counts['update'],
+        "unchanged": counts['unchanged'],
+        "deleted": counts['delete'],
+        "rejected": counts['reject'],
+        "errors": [f"Baris {reject['row']}: {reject['error']}" for reject in result['rejects']],
+    }
+
+
+def _row_hashes(frame, columns):
+    """SHA-1 per baris atas nilai ter-normalisasi; nama kolom ikut di-hash."""
+    header = '\x1e'.join(columns) + '\x1e'
+    return [
+        hashlib.sha1(
+            (header + '\x1f'.join('\x00' if value is None else str(value) for value in row)).encode()
+        ).hexdigest()
+        for row in frame[columns].itertuples(index=False, name=None)
+    ]
+
+
+class _Merge:
+    """Potongan SQL impor set-based untuk satu spec (staging `s`, baris lama `cur`)."""
+
+    def __init__(self, spec, fields, connection):
+        quote = self.quote = connection.ops.quote_name
+        self.spec = spec
+        self.model = model = spec['model']
+        self.fields = fields
+        self.distinct = 'IS DISTINCT FROM' if connection.vendor == 'postgresql' else 'IS NOT'
+        self.table = quote(model._meta.db_table)
+        self.staging = quote(STAGING_TABLE)
+        self.key_field = model._meta.get_field(spec['key'])
+        self.key = quote(self.key_field.column)
+        self.source_key = f"s.{quote(spec['key'])}"
+
+        self.joins = [f"LEFT JOIN {self.table} cur ON cur.{self.key} = {self.source_key}"]
+        self.values, self.value_params, self.missing = {}, [], []
+        for name in fields:
+            field = model._meta.get_field(name)
+            value = f's.{quote(name)}'
+            if name in spec['relations']:
+                alias = quote(f'rel_{name}')
+                self.joins.append(
+                    f"LEFT JOIN {quote(spec['relations'][name]._meta.db_table)} {alias} "
+                    f"ON {alias}.{quote('code')} = s.{quote(name)}"
+                )
+                value = f'{alias}.{quote(field.target_field.column)}'
+            if not field.null:
+                # Sel kosong pada kolom NOT NULL: pertahankan nilai lama, atau
+                # pakai default untuk baris baru (ditolak bila tidak ada default).
+                default = self._default(field)
+                if default is None:
+                    self.missing.append((name, f'{value} IS NULL'))
+                    value = f'COALESCE({value}, cur.{quote(field.column)})'
+                else:
+                    self.value_params.append(default)
+                    value = f'COALESCE({value}, cur.{quote(field.column)}, %s)'
+            self.values[field.column] = value
+
+        # Kolom NOT NULL yang tidak ada di file hanya diisi untuk baris baru.
+        self.insert_only, self.insert_params = {}, []
+        for field in model._meta.concrete_fields:
+            if field is self.key_field or field.primary_key or field.null or field.column in self.values:
+                continue
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                self.insert_only[field.column] = 'CURRENT_TIMESTAMP'
+            elif field.name == 'user' and spec.get('user'):
+                self.joins.append(
+                    f"LEFT JOIN {quote(User._meta.db_table)} usr ON usr.{quote('username')} = s.{quote(spec['user'])}"
+                )
+                self.insert_only[field.column] = f"COALESCE(cur.{quote(field.column)}, usr.{quote('id')})"
+            else:
+                default = self._default(field)
+                if default is None:
+                    # Baris baru ditolak; baris lama tetap butuh nilai di
+                    # INSERT karena NOT NULL diperiksa sebelum ON CONFLICT.
+                    self.missing.append((field.name, 'TRUE'))
+                    self.insert_only[field.column] = f'cur.{quote(field.column)}'
+                else:
+                    self.insert_params.append(default)
+                    self.insert_only[field.column] = '%s'
+
+    def _default(self, field):
+        if field.name in self.spec.get('defaults', {}):
+            return self.spec['defaults'][field.name]
+        if field.has_default():
+            return field.get_default()
+        if field.blank and field.get_internal_type() in ('CharField', 'TextField'):
+            return ''
+        return None
+
+    def from_clause(self):
+        return f"FROM {self.staging} s " + ' '.join(self.joins)
+
+    def rejections(self):
+        """Pasangan (kondisi, pesan) SQL untuk baris staging yang tidak boleh digabung."""
+        quote, checks = self.quote, []
+        for name in self.fields:
+            if name in self.spec['relations']:
+                alias = quote(f'rel_{name}')
+                target = quote(self.model._meta.get_field(name).target_field.column)
+                checks.append((
+                    f"s.{quote(name)} IS NOT NULL AND {alias}.{target} IS NULL",
+                    f"'{name} ''' || s.{quote(name)} || ''' tidak ditemukan'",
+                ))
+        for name, condition in self.missing:
+            checks.append((f"cur.{self.key} IS NULL AND {condition}", f"'{name} wajib diisi untuk data baru'"))
+        for name in self.spec.get('unique', []):
+            if name in self.fields:
+                column = quote(self.model._meta.get_field(name).column)
+                checks.append((
+                    f"EXISTS (SELECT 1 FROM {self.table} other WHERE other.{column} = s.{quote(name)} "
+                    f"AND other.{self.key} <> {self.source_key})",
+                    f"'{name} sudah dipakai data lain'",
+                ))
+        if self.spec.get('user'):
+            # Akun dengan username yang sama sudah terhubung ke baris lain.
+            owner = quote(self.model._meta.get_field('user').column)
+            checks.append((
+                f"cur.{self.key} IS NULL AND EXISTS (SELECT 1 FROM {self.table} other "
+                f"JOIN {quote(User._meta.db_table)} u ON u.{quote('id')} = other.{owner} "
+                f"WHERE u.{quote('username')} = s.{quote(self.spec['user'])})",
+                "'akun user sudah terhubung ke data lain'",
+            ))
+        return checks
+
+    def changed(self):
+        return ' OR '.join(
+            f"cur.{self.quote(column)} {self.distinct} {value}" for column, value in self.values.items()
+        ) or 'FALSE'
+
+    def upsert(self):
+        """INSERT ... ON CONFLICT beserta parameternya."""
+        quote = self.quote
+        columns = [self.key_field.column, *self.values, *self.insert_only]
+        select = [self.source_key, *self.values.values(), *self.insert_only.values()]
+        conflict = 'DO NOTHING'
+        if self.values:
+            updates = [f"{quote(column)} = EXCLUDED.{quote(column)}" for column in self.values]
+            updates += [
+                f"{quote(field.column)} = EXCLUDED.{quote(field.column)}"
+                for field in self.model._meta.concrete_fields if getattr(field, 'auto_now', False)
+            ]
+            changed = ' OR '.join(
+                f"tgt.{quote(column)} {self.distinct} EXCLUDED.{quote(column)}" for column in self.values
+            )
+            conflict = f"DO UPDATE SET {', '.join(updates)} WHERE {changed}"
+        sql = (
+            f"INSERT INTO {self.table} AS tgt ({', '.join(quote(column) for column in columns)}) "
+            f"SELECT {', '.join(select)} {self.from_clause()} WHERE TRUE "
+            f"ON CONFLICT ({self.key}) {conflict}"
+        )
+        return sql, self.value_params + self.insert_params
+
+
+def _create_users(cursor, merge):
+    """Buat akun user (password tidak bisa dipakai) untuk baris baru yang belum punya user."""
+    quote, spec = merge.quote, merge.spec
+    role = Role.objects.filter(name='Mahasiswa').values_list('pk', flat=True).first()
+    division = Division.objects.get_or_create(
+        name='Mahasiswa', defaults={'description': 'Division untuk semua mahasiswa'}
+    )[0].pk
+    users, username = quote(User._meta.db_table), f"s.{quote(spec['user'])}"
+    cursor.execute(
+        f"INSERT INTO {users} (password, is_superuser, username, first_name, last_name, email, "
+        f"is_staff, is_active, date_joined, role_id, division_id) "
+        f"SELECT %s, %s, {username}, '', '', '', %s, %s, CURRENT_TIMESTAMP, %s, %s "
+        f"FROM {merge.staging} s "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {merge.table} cur WHERE cur.{merge.key} = {merge.source_key}) "
+        f"AND NOT EXISTS (SELECT 1 FROM {users} u WHERE u.username = {username})",
+        [make_password(None), False, False, True, role, division],
+    )
+
+
+def _slices(cursor, merge):
+    """Potongan rekap (prodi, angkatan, jk) baris tujuan yang disentuh impor."""
+    quote = merge.quote
+    cursor.execute(
+        f"SELECT DISTINCT cur.{quote('prodi_id')}, cur.{quote('tahun_masuk')}, cur.{quote('jk')} "
+        f"FROM {merge.staging} s JOIN {merge.table} cur ON cur.{merge.key} = {merge.source_key}"
+    )
+    return {analytics.slice_key(*row) for row in cursor.fetchall()}
+
+
+def fast_import(df, spec, using=DEFAULT_DB_ALIAS, sample_size=SAMPLE_SIZE, digest=None, snapshot=False):
+    """
+    Impor set-based untuk file besar.
+
+    Baris ter-normalisasi dimuat ke tabel staging sementara (COPY di
+    PostgreSQL, INSERT per batch di backend lain), relasi diresolusi lewat
+    join kode di SQL, lalu digabung ke tabel tujuan dengan satu
+    INSERT ... ON CONFLICT DO UPDATE. Semuanya dalam satu transaksi.
+
+    Baris yang hash-nya sama dengan impor sebelumnya (dan masih ada di
+    tabel) dibuang dari staging sebelum dibandingkan. Dengan `snapshot`,
+    file dianggap berisi seluruh data: baris tabel yang kuncinya tidak ada
+    di file dihapus lewat ORM (cascade dan signal tetap berjalan). `digest`
+    file dicatat untuk previous_import() hanya bila tidak ada baris ditolak.
+    """
+    key = spec['key']
+    kind = _kind(spec)
+    frame, fields, reason = _normalize(df, spec)
+    if snapshot and frame[key].isna().all():
+        raise UploadError("Snapshot penuh tidak boleh kosong")
+    _reject(reason, frame[key].notna() & frame.duplicated(key, keep='last'), f"{key} duplikat di dalam file")
+    for name in spec.get('unique', []):
+        if name in frame:
+            _reject(reason, frame[name].notna() & frame.duplicated(name, keep='last'), f"{name} duplikat di dalam file")
+    rejects = [
+        {'row': int(frame.at[idx, '_row']), key: frame.at[idx, key], 'error': reason[idx]}
+        for idx in frame.index[reason.notna()]
+    ]
+    valid = frame[reason.isna()].assign(_hash=lambda rows: _row_hashes(rows, [key, *fields]))
+
+    connection = connections[using]
+    merge = _Merge(spec, fields, connection)
+    quote = merge.quote
+    types = {
+        name: 'date' if name in spec['dates'] else 'integer' if name in spec['integers'] else 'text'
+        for name in [key, *fields]
+    }
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {merge.staging}")
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {merge.staging} (_row integer, _hash text, "
+            + ', '.join(f"{quote(name)} {kind}" for name, kind in types.items()) + ")"
+        )
+        bulk.copy_into(
+            STAGING_TABLE, ['_row', '_hash', key, *fields],
+            valid[['_row', '_hash', key, *fields]].itertuples(index=False, name=None), using,
+        )
+
+        hashes = quote(ImportRowHash._meta.db_table)
+        cursor.execute(
+            f"DELETE FROM {merge.staging} WHERE EXISTS (SELECT 1 FROM {hashes} h "
+            f"JOIN {merge.table} cur ON cur.{merge.key} = h.{quote('key')} "
+            f"WHERE h.kind = %s AND h.{quote('key')} = {merge.staging}.{quote(key)} "
+            f"AND h.digest = {merge.staging}._hash)",
+            [kind],
+        )
+
+        missing = []
+        if snapshot:
+            cursor.execute(f"SELECT {merge.key} FROM {merge.table}")
+            listed = set(frame[key].dropna())
+            missing = [row[0] for row in cursor.fetchall() if row[0] not in listed]
+
+        checks = merge.rejections()
+        if checks:
+            cases = ' '.join(f"WHEN {condition} THEN {message}" for condition, message in checks)
+            cursor.execute(
+                f"SELECT s._row, {merge.source_key}, CASE {cases} END {merge.from_clause()} "
+                f"WHERE {' OR '.join(f'({condition})' for condition, _ in checks)}"
+            )
+            refused = cursor.fetchall()
+            for chunk in _chunks([row for row, _, _ in refused]):
+                cursor.execute(f"DELETE FROM {merge.staging} WHERE _row IN ({', '.join(['%s'] * len(chunk))})", chunk)
+            rejects += [{'row': row, key: value, 'error': error} for row, value, error in refused]
+
+        cursor.execute(f"SELECT COUNT(*) {merge.from_clause()} WHERE cur.{merge.key} IS NULL")
+        inserted = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT COUNT(*) {merge.from_clause()} WHERE cur.{merge.key} IS NOT NULL AND ({merge.changed()})",
+            merge.value_params,
+        )
+        updated = cursor.fetchone()[0]
+
+        # Penulisan set-based melewati signal: potongan rekap analitik ditandai di sini.
+        touched = set()
+        if spec.get('analytics') == analytics.STUDENTS:
+            touched = _slices(cursor, merge)
+        elif spec.get('analytics') == analytics.SUPERVISORS:
+            cursor.execute(f"SELECT {merge.source_key} {merge.from_clause()} WHERE cur.{merge.key} IS NULL")
+            touched = {row[0] for row in cursor.fetchall()}
+
+        if spec.get('user'):
+            _create_users(cursor, merge)
+        cursor.execute(*merge.upsert())
+        cursor.execute(
+            f"INSERT INTO {hashes} (kind, {quote('key')}, digest) SELECT %s, {merge.source_key}, s._hash "
+            f"FROM {merge.staging} s WHERE TRUE "
+            f"ON CONFLICT (kind, {quote('key')}) DO UPDATE SET digest = EXCLUDED.digest",
+            [kind],
+        )
+
+        if spec.get('analytics') == analytics.STUDENTS:
+            touched |= _slices(cursor, merge)
+        cursor.execute(f"DROP TABLE {merge.staging}")
+        if touched:
+            analytics.mark_dirty(spec['analytics'], touched)
+        if spec.get('generation') and (inserted or updated):
+            # Setelah commit: worker lain yang membaca generasi baru sebelum
+            # commit akan meng-cache data lama di bawah kunci generasi baru.
+            transaction.on_commit(lambda: bump_generation(spec['generation']), using=using)
+
+        for chunk in _chunks(missing):
+            spec['model'].objects.using(using).filter(**{f'{key}__in': chunk}).delete()
+        if digest and not rejects:
+            ImportFile.objects.using(using).update_or_create(
+                kind=kind, defaults={'digest': digest, 'snapshot': snapshot}
+            )
+        else:
+            # Baris yang ditolak harus diproses lagi saat file yang sama
+            # (atau file sebelumnya) diunggah ulang setelah diperbaiki.
+            ImportFile.objects.using(using).filter(kind=kind).delete()
+
+    return {
+        'counts': {
+            'total': len(frame),
+            'insert': inserted,
+            'update': updated,
+            'unchanged': len(frame) - len(rejects) - inserted - updated,
+            'delete': len(missing),
+            'reject': len(rejects),
+        },
+        'rejects': sorted(rejects, key=lambda reject: reject['row'])[:sample_size],
+    }
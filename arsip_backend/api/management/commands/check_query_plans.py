@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+
+from api import query_plans
+from api.models import User
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN every SELECT issued by the API list/detail endpoints and fail on Seq Scans or costly plans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username to call the endpoints as (default: first Super Admin)')
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help='Only check this path, e.g. "/api/mahasiswa/?prodi=1" (repeatable)',
+        )
+        parser.add_argument('--max-cost', type=float, default=query_plans.MAX_COST, help='Total cost budget per query')
+        parser.add_argument(
+            '--table', action='append', dest='tables',
+            help=f"Large table to guard against Seq Scans (default: {', '.join(query_plans.LARGE_TABLES)})",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('check_query_plans membutuhkan database PostgreSQL yang sudah di-seed.')
+
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            user = User.objects.filter(Q(is_superuser=True) | Q(role__name='Super Admin')).order_by('pk').first()
+        if user is None:
+            raise CommandError('User untuk memanggil endpoint tidak ditemukan.')
+
+        paths = options['paths']
+        if not paths:
+            _, skipped = query_plans.endpoints()
+            for route in skipped:
+                self.stdout.write(f"⏭️  Dilewati (butuh argumen URL): /{route}")
+
+        checked, findings = query_plans.check(
+            user, paths, large_tables=tuple(options['tables'] or query_plans.LARGE_TABLES),
+            max_cost=options['max_cost'],
+        )
+        if findings:
+            raise CommandError(query_plans.report(findings))
+        self.stdout.write(self.style.SUCCESS(f"✅ {checked} query diperiksa, semua rencana dalam batas"))
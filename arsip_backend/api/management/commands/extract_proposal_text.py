@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api import proposal_text
+
+
+class Command(BaseCommand):
+    help = 'Extract text from pending proposal files into the content search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help='Keep polling for new pending files')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --watch')
+        parser.add_argument('--batch-size', type=int, default=proposal_text.BATCH_SIZE)
+        parser.add_argument(
+            '--queue-missing', action='store_true',
+            help='First queue proposals with a file but no extracted text (e.g. bulk-loaded rows)',
+        )
+
+    def handle(self, *args, **options):
+        if options['queue_missing']:
+            queued = proposal_text.queue_missing()
+            self.stdout.write(f"📥 {queued} file proposal diantrikan")
+
+        started = time.perf_counter()
+        total = 0
+        while True:
+            processed = proposal_text.process_pending(options['batch_size'])
+            total += processed
+            if processed:
+                continue
+            if not options['watch']:
+                break
+            time.sleep(options['interval'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {total} file diekstrak dalam {elapsed:.1f} detik"
+            + (f" ({total / elapsed:.1f} file/detik)" if total and elapsed else '')
+        ))
@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 from django.core.management.base import BaseCommand
+from api import wilayah_tree
 from api.models import Wilayah
 
 WILAYAH_FILE = Path(__file__).parent.parent.parent/ "wilayah.json"
@@ -17,22 +18,25 @@ class Command(BaseCommand):
             data = json.load(f)
 
         created = 0
-        for item in data:
-            kode = item["kode"]
-            nama = item["nama"]
-            parts = kode.split(".")
-            level = len(parts)
-            parent_code = ".".join(parts[:-1]) if level > 1 else None
+        # Closure, generasi dan digest impor dirawat sekali di akhir, bukan per baris.
+        with wilayah_tree.bulk_load() as result:
+            for item in data:
+                kode = item["kode"]
+                nama = item["nama"]
+                parts = kode.split(".")
+                level = len(parts)
+                parent_code = ".".join(parts[:-1]) if level > 1 else None
 
-            obj, new = Wilayah.objects.get_or_create(
-                code=kode,
-                defaults={
-                    "name": nama,
-                    "parent_code": parent_code,
-                    "level": level
-                }
-            )
-            if new:
-                created += 1
+                obj, new = Wilayah.objects.get_or_create(
+                    code=kode,
+                    defaults={
+                        "name": nama,
+                        "parent_code": parent_code,
+                        "level": level
+                    }
+                )
+                if new:
+                    created += 1
 
-        self.stdout.write(self.style.SUCCESS(f" {created} data wilayah berhasil dimuat!"))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(f" {created} data wilayah berhasil dimuat!"))
+        self.stdout.write(self.style.SUCCESS(f" {result['links']} relasi hierarki wilayah diperbarui!"))
@@ -0,0 +1,351 @@
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+
+from api import analytics, bulk
+from api.generations import bump_generation
+from api.models import Bimbingan, Division, Dosen, KonsentrasiUtama, Mahasiswa, Prodi, Proposal, Role, User, Wilayah
+
+# Penanda data sintetis: kode prodi/konsentrasi/dosen dan NIM diawali PREFIX,
+# email user berakhiran EMAIL_DOMAIN. Dipakai --clear untuk menghapusnya lagi.
+PREFIX = 'LG'
+EMAIL_DOMAIN = 'loadgen.invalid'
+FILE_DIR = 'proposals/loadgen'
+
+FIRST_NAMES = [
+    'Adi', 'Agus', 'Ahmad', 'Andi', 'Anisa', 'Ayu', 'Bagus', 'Bayu', 'Budi', 'Citra', 'Dewi', 'Dian',
+    'Dimas', 'Eka', 'Fajar', 'Fitri', 'Gilang', 'Hana', 'Hendra', 'Indah', 'Intan', 'Joko', 'Kartika',
+    'Lestari', 'Lukman', 'Maya', 'Muhammad', 'Nanda', 'Nur', 'Putri', 'Rahmat', 'Rina', 'Rizki', 'Sari',
+    'Siti', 'Surya', 'Teguh', 'Tri', 'Wahyu', 'Wulan', 'Yoga', 'Yusuf',
+]
+LAST_NAMES = [
+    'Pratama', 'Saputra', 'Wijaya', 'Santoso', 'Hidayat', 'Nugroho', 'Kurniawan', 'Setiawan', 'Lestari',
+    'Purnomo', 'Rahayu', 'Susanto', 'Hakim', 'Siregar', 'Nasution', 'Harahap', 'Simanjuntak', 'Gunawan',
+    'Permana', 'Ramadhan', 'Utami', 'Wibowo', 'Yulianti', 'Firmansyah', 'Maulana', 'Sihombing', 'Syahputra',
+]
+STREETS = ['Merdeka', 'Sudirman', 'Diponegoro', 'Gajah Mada', 'Ahmad Yani', 'Pahlawan', 'Kenanga', 'Melati', 'Cendana']
+PRODI_NAMES = [
+    'Teknik Informatika', 'Sistem Informasi', 'Teknik Elektro', 'Teknik Sipil', 'Teknik Mesin', 'Arsitektur',
+    'Manajemen', 'Akuntansi', 'Ekonomi Pembangunan', 'Ilmu Hukum', 'Ilmu Komunikasi', 'Administrasi Publik',
+    'Psikologi', 'Pendidikan Matematika', 'Pendidikan Bahasa Inggris', 'Pendidikan Guru Sekolah Dasar',
+    'Agroteknologi', 'Agribisnis', 'Kehutanan', 'Biologi', 'Kimia', 'Fisika', 'Matematika', 'Statistika',
+    'Farmasi', 'Keperawatan', 'Kesehatan Masyarakat', 'Gizi', 'Sastra Indonesia', 'Hubungan Internasional',
+]
+JENJANG = ['S1', 'D3', 'S2']
+FOCUS = ['Terapan', 'Komputasi', 'Manajemen', 'Kebijakan', 'Analitik', 'Rekayasa', 'Pendidikan', 'Kewirausahaan']
+JUDUL_METODE = [
+    'Analisis', 'Perancangan', 'Implementasi', 'Evaluasi', 'Pengembangan', 'Optimasi', 'Pemodelan', 'Studi Kasus',
+]
+JUDUL_TOPIK = [
+    'sistem informasi akademik', 'kinerja keuangan', 'kualitas layanan', 'pembelajaran daring', 'rantai pasok',
+    'ketahanan pangan', 'perilaku konsumen', 'jaringan sensor nirkabel', 'klasifikasi citra', 'manajemen risiko',
+    'kebijakan publik', 'literasi digital', 'struktur beton bertulang', 'efisiensi energi', 'kesehatan ibu dan anak',
+]
+JUDUL_OBJEK = [
+    'UMKM', 'pemerintah daerah', 'rumah sakit umum daerah', 'sekolah menengah', 'perguruan tinggi', 'koperasi',
+    'perusahaan manufaktur', 'desa wisata', 'bank syariah', 'puskesmas',
+]
+CATATAN_TOLAK = ['Judul terlalu luas', 'Metode belum sesuai', 'Topik sudah banyak diteliti', 'Lengkapi latar belakang']
+JABATAN = ['Asisten Ahli', 'Lektor', 'Lektor Kepala', 'Guru Besar']
+GELAR_BELAKANG = ['S.Kom., M.Kom.', 'S.T., M.T.', 'S.E., M.M.', 'S.H., M.H.', 'M.Si.', 'M.Pd.', 'Ph.D.']
+
+DUMMY_PDF = (
+    b'%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n'
+    b'2 0 obj<</Type/Pages/Kids[]/Count 0>>endobj\ntrailer<</Root 1 0 R>>\n%%EOF\n'
+)
+
+USER_COLUMNS = [
+    'id', 'password', 'last_login', 'is_superuser', 'username', 'first_name', 'last_name', 'email',
+    'is_staff', 'is_active', 'date_joined', 'role', 'division',
+]
+MAHASISWA_COLUMNS = [
+    'id', 'nim', 'nama_mahasiswa', 'tempat_lahir', 'alamat', 'tgl_lahir', 'tahun_masuk', 'jk',
+    'prodi', 'konsentrasi', 'judul_skripsi', 'user',
+]
+PROPOSAL_COLUMNS = [
+    'id', 'mahasiswa', 'judul', 'catatan', 'file', 'status', 'dosen_pembimbing', 'created_at', 'updated_at',
+]
+BIMBINGAN_COLUMNS = ['id', 'dosen', 'mahasiswa', 'proposal', 'created_at']
+
+
+def _moment(rng, year, month_from=1, month_to=12):
+    return datetime(year, rng.randint(month_from, month_to), rng.randint(1, 28),
+                    rng.randint(7, 20), rng.randint(0, 59), tzinfo=timezone.utc)
+
+
+class Generator:
+    """Membangkitkan baris yang konsisten secara referensial dari satu seed."""
+
+    def __init__(self, options):
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        self.first_year = options['first_year']
+        self.last_year = options['last_year']
+        self.wilayah = list(
+            Wilayah.objects.filter(level=2).order_by('pk').values_list('pk', flat=True)
+        ) or list(Wilayah.objects.order_by('pk').values_list('pk', flat=True))
+        self.password = make_password(options['password'])
+        self.role_id = Role.objects.filter(name='Mahasiswa').values_list('pk', flat=True).first()
+        self.division_id = Division.objects.get_or_create(
+            name='Mahasiswa', defaults={'description': 'Division untuk semua mahasiswa'}
+        )[0].pk
+        self.files = [f'{FILE_DIR}/proposal_{index:04d}.pdf' for index in range(options['file_pool'])]
+
+    def name(self):
+        rng = self.rng
+        parts = [rng.choice(FIRST_NAMES)]
+        if rng.random() < 0.5:
+            parts.append(rng.choice(FIRST_NAMES))
+        parts.append(rng.choice(LAST_NAMES))
+        return ' '.join(parts)
+
+    def birthplace(self):
+        return self.rng.choice(self.wilayah) if self.wilayah else None
+
+    def judul(self):
+        rng = self.rng
+        return f"{rng.choice(JUDUL_METODE)} {rng.choice(JUDUL_TOPIK)} pada {rng.choice(JUDUL_OBJEK)} " \
+               f"{rng.choice(LAST_NAMES)}"
+
+    def prodi(self, count):
+        rng, pk = self.rng, bulk.next_pk(Prodi)
+        names = [f'{jenjang} {name}' for jenjang in JENJANG for name in PRODI_NAMES]
+        rows = []
+        for index in range(count):
+            name = names[index % len(names)]
+            if index >= len(names):
+                name = f'{name} {index // len(names) + 1}'
+            rows.append((pk + index, f'{PREFIX}{index + 1:03d}', name))
+        # Bobot ukuran prodi: sebagian prodi jauh lebih besar dari yang lain.
+        self.prodi_ids = [row[0] for row in rows]
+        self.prodi_weights = [rng.choice([1, 1, 2, 3, 5, 8]) for _ in rows]
+        return rows
+
+    def konsentrasi(self, prodi_rows):
+        rng, pk = self.rng, bulk.next_pk(KonsentrasiUtama)
+        rows, self.konsentrasi_by_prodi = [], {}
+        for prodi_id, code, name in prodi_rows:
+            base = name.split(' ', 1)[1]
+            for focus in rng.sample(FOCUS, rng.randint(2, 5)):
+                rows.append((pk + len(rows), f'{code}-{len(self.konsentrasi_by_prodi.get(prodi_id, [])) + 1:02d}',
+                             f'{base} {focus}', prodi_id))
+                self.konsentrasi_by_prodi.setdefault(prodi_id, []).append(rows[-1][0])
+        return rows
+
+    def dosen(self, count):
+        rng, rows, nips = self.rng, [], {}
+        self.dosen_by_prodi = {}
+        prodi = rng.choices(self.prodi_ids, weights=self.prodi_weights, k=count)
+        for index, prodi_id in enumerate(prodi):
+            jk = rng.choice('LP')
+            born = date(rng.randint(1960, 1990), rng.randint(1, 12), rng.randint(1, 28))
+            # NIP: tgl lahir (8) + TMT (6) + jenis kelamin (1) + urut (3).
+            head = f"{born:%Y%m%d}{born.year + rng.randint(25, 32)}{rng.randint(1, 12):02d}{'1' if jk == 'L' else '2'}"
+            nips[head] = nips.get(head, 0) + 1
+            nidn = f'9{index + 1:09d}'
+            joined = _moment(rng, rng.randint(self.first_year - 10, self.first_year))
+            rows.append((
+                nidn, f'{PREFIX}{index + 1:06d}', self.name(), rng.choice(self.konsentrasi_by_prodi[prodi_id]),
+                f'{head}{nips[head]:03d}', 'Dr.' if rng.random() < 0.3 else None, rng.choice(GELAR_BELAKANG), jk,
+                self.birthplace(), born, prodi_id, 'Aktif' if rng.random() < 0.9 else 'Tugas Belajar',
+                rng.choice(JABATAN), joined, joined,
+            ))
+            self.dosen_by_prodi.setdefault(prodi_id, []).append(nidn)
+        return rows
+
+    def students(self, count, batch_size):
+        """Baris user, mahasiswa, proposal dan bimbingan per batch `batch_size` mahasiswa."""
+        rng = self.rng
+        user_pk, mahasiswa_pk = bulk.next_pk(User), bulk.next_pk(Mahasiswa)
+        proposal_pk, bimbingan_pk = bulk.next_pk(Proposal), bulk.next_pk(Bimbingan)
+        prodi_index = {prodi_id: index + 1 for index, prodi_id in enumerate(self.prodi_ids)}
+        sequence = {}
+
+        for start in range(0, count, batch_size):
+            users, students, proposals, bimbingan = [], [], [], []
+            size = min(batch_size, count - start)
+            for prodi_id in rng.choices(self.prodi_ids, weights=self.prodi_weights, k=size):
+                tahun = rng.randint(self.first_year, self.last_year)
+                sequence[tahun, prodi_id] = sequence.get((tahun, prodi_id), 0) + 1
+                nim = f'{PREFIX}{tahun}{prodi_index[prodi_id]:03d}{sequence[tahun, prodi_id]:06d}'
+                nama, jk = self.name(), rng.choice('LP')
+                first, _, last = nama.partition(' ')
+                konsentrasi = rng.choice(self.konsentrasi_by_prodi[prodi_id]) if rng.random() < 0.8 else None
+
+                users.append((
+                    user_pk, self.password, None, False, nim, first, last, f'{nim.lower()}@{EMAIL_DOMAIN}',
+                    False, True, _moment(rng, tahun, 7, 9), self.role_id, self.division_id,
+                ))
+
+                # Makin lama angkatannya, makin besar peluang sudah mengajukan proposal.
+                judul_skripsi = ''
+                seniority = self.last_year - tahun
+                if rng.random() < min(0.95, seniority * 0.25):
+                    submitted = _moment(rng, min(tahun + 3, self.last_year))
+                    total = rng.choice([1, 1, 1, 2, 2, 3])
+                    for attempt in range(total):
+                        if attempt < total - 1:
+                            status = 'rejected'
+                        else:
+                            status = rng.choices(['approved', 'pending', 'rejected'], weights=[6, 2.5, 1.5])[0]
+                        judul = self.judul()
+                        dosen = rng.choice(self.dosen_by_prodi.get(prodi_id) or [None])
+                        proposals.append((
+                            proposal_pk, mahasiswa_pk, judul,
+                            rng.choice(CATATAN_TOLAK) if status == 'rejected' else '',
+                            rng.choice(self.files) if self.files and rng.random() < 0.7 else None,
+                            status, None if status == 'pending' else dosen,
+                            submitted, submitted + timedelta(days=rng.randint(1, 30)),
+                        ))
+                        if status == 'approved':
+                            judul_skripsi = judul
+                            if dosen:
+                                bimbingan.append((bimbingan_pk, dosen, mahasiswa_pk, proposal_pk, proposals[-1][-1]))
+                                bimbingan_pk += 1
+                        proposal_pk += 1
+                        submitted += timedelta(days=rng.randint(30, 120))
+
+                students.append((
+                    mahasiswa_pk, nim, nama, self.birthplace(),
+                    f'Jl. {rng.choice(STREETS)} No. {rng.randint(1, 200)}',
+                    date(tahun - rng.randint(17, 20), rng.randint(1, 12), rng.randint(1, 28)),
+                    tahun, jk, prodi_id, konsentrasi, judul_skripsi, user_pk,
+                ))
+                user_pk += 1
+                mahasiswa_pk += 1
+            yield users, students, proposals, bimbingan
+
+
+class Command(BaseCommand):
+    help = 'Generate deterministic synthetic load data (prodi, konsentrasi, dosen, mahasiswa+user, proposal, bimbingan)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=10000, help='Number of mahasiswa (and users) to create')
+        parser.add_argument('--prodi', type=int, default=40, help='Number of program studi')
+        parser.add_argument('--students-per-dosen', type=int, default=25)
+        parser.add_argument('--first-year', type=int, default=2015, help='Earliest tahun_masuk')
+        parser.add_argument('--last-year', type=int, default=2024, help='Latest tahun_masuk')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=bulk.BATCH_SIZE)
+        parser.add_argument('--file-pool', type=int, default=50, help='Distinct dummy proposal files to share')
+        parser.add_argument('--password', default='loadtest123', help='Password for every generated user')
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated data first')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['clear']:
+            with transaction.atomic():
+                self.clear()
+                self.finish()
+            self.stdout.write(self.style.SUCCESS("🗑️  Data sintetis sebelumnya dihapus"))
+            if options['students'] <= 0:
+                return
+        if Prodi.objects.filter(code__startswith=PREFIX).exists():
+            raise CommandError("Data sintetis sudah ada; jalankan dengan --clear untuk membuat ulang.")
+        if options['first_year'] > options['last_year']:
+            raise CommandError("--first-year tidak boleh lebih besar dari --last-year")
+
+        generator = Generator(options)
+        if not generator.wilayah:
+            self.stdout.write(self.style.WARNING("⚠️  Tabel Wilayah kosong; tempat_lahir dibiarkan kosong (jalankan fetch_wilayah)"))
+        self.write_files(generator.files)
+
+        with transaction.atomic():
+            prodi = generator.prodi(options['prodi'])
+            self.load(Prodi, ['id', 'code', 'name'], prodi)
+            self.load(KonsentrasiUtama, ['id', 'code', 'name', 'prodi'], generator.konsentrasi(prodi))
+            self.load(Dosen, [
+                'nidn', 'kode_dosen', 'nama_dosen', 'konsentrasi', 'nip', 'gelar_depan', 'gelar_belakang', 'jk',
+                'tempat_lahir', 'tgl_lahir', 'prodi', 'status_aktif', 'jabatan_fungsional', 'created_at', 'updated_at',
+            ], generator.dosen(max(options['prodi'] * 3, options['students'] // options['students_per_dosen'])))
+
+            totals = dict.fromkeys(['user', 'mahasiswa', 'proposal', 'bimbingan'], 0)
+            for users, students, proposals, bimbingan in generator.students(options['students'], options['batch_size']):
+                totals['user'] += bulk.copy_rows(User, USER_COLUMNS, users)
+                totals['mahasiswa'] += bulk.copy_rows(Mahasiswa, MAHASISWA_COLUMNS, students)
+                totals['proposal'] += bulk.copy_rows(Proposal, PROPOSAL_COLUMNS, proposals)
+                totals['bimbingan'] += bulk.copy_rows(Bimbingan, BIMBINGAN_COLUMNS, bimbingan)
+                self.stdout.write(
+                    f"   {totals['mahasiswa']:,} mahasiswa ({time.perf_counter() - started:.1f} detik)", ending='\r'
+                )
+            self.stdout.write('')
+            bulk.reset_sequences(Prodi, KonsentrasiUtama, User, Mahasiswa, Proposal, Bimbingan)
+            self.finish()
+
+        for name, total in totals.items():
+            self.stdout.write(f"   {name}: {total:,}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Data sintetis dibuat (seed {options['seed']}, {time.perf_counter() - started:.1f} detik)"
+        ))
+
+    def load(self, model, columns, rows):
+        total = bulk.copy_rows(model, columns, rows)
+        self.stdout.write(f"   {model._meta.model_name}: {total:,}")
+
+    def write_files(self, names):
+        for name in names:
+            if not default_storage.exists(name):
+                default_storage.save(name, ContentFile(DUMMY_PDF))
+
+    def finish(self):
+        # Pemuatan melewati signal: rekap, cache turunan dan statistik planner
+        # diperbarui sekali di akhir.
+        bulk.analyze(Prodi, KonsentrasiUtama, Dosen, User, Mahasiswa, Proposal, Bimbingan)
+        analytics.refresh_all()
+        bump_generation('prodi')
+        bump_generation('konsentrasi')
+        bump_generation(analytics.STUDENTS)
+        bump_generation(analytics.SUPERVISORS)
+        bump_generation(Proposal._meta.model_name)
+        bump_generation(Bimbingan._meta.model_name)
+
+    def clear(self):
+        quote = connection.ops.quote_name
+        table = {model: quote(model._meta.db_table) for model in (User, Mahasiswa, Dosen, Proposal, Bimbingan)}
+        students = f"SELECT id FROM {table[Mahasiswa]} WHERE nim LIKE %s"
+        dosen = f"SELECT nidn FROM {table[Dosen]} WHERE kode_dosen LIKE %s"
+        users = f"SELECT id FROM {table[User]} WHERE email LIKE %s"
+        prefix, domain = f'{PREFIX}%', f'%@{EMAIL_DOMAIN}'
+
+        with connection.cursor() as cursor:
+            # Dua DELETE terpisah: IN (subquery) menjadi semi-join, sedangkan
+            # gabungan OR membuat subquery dievaluasi per baris.
+            cursor.execute(f"DELETE FROM {table[Bimbingan]} WHERE mahasiswa_id IN ({students})", [prefix])
+            cursor.execute(f"DELETE FROM {table[Bimbingan]} WHERE dosen_id IN ({dosen})", [prefix])
+            # Relasi ke proposal (teks hasil ekstraksi, bimbingan) mengikuti
+            # on_delete-nya; kaskade ORM tidak berlaku untuk DELETE mentah.
+            proposals = f"SELECT id FROM {table[Proposal]} WHERE mahasiswa_id IN ({students})"
+            for relation in Proposal._meta.related_objects:
+                related_table = quote(relation.related_model._meta.db_table)
+                column = quote(relation.field.column)
+                if relation.on_delete is models.SET_NULL:
+                    statement = f"UPDATE {related_table} SET {column} = NULL WHERE {column} IN ({proposals})"
+                else:
+                    statement = f"DELETE FROM {related_table} WHERE {column} IN ({proposals})"
+                cursor.execute(statement, [prefix])
+            cursor.execute(f"DELETE FROM {table[Proposal]} WHERE mahasiswa_id IN ({students})", [prefix])
+            cursor.execute(
+                f"UPDATE {table[Proposal]} SET dosen_pembimbing_id = NULL WHERE dosen_pembimbing_id IN ({dosen})",
+                [prefix],
+            )
+            cursor.execute(f"DELETE FROM {table[Mahasiswa]} WHERE nim LIKE %s", [prefix])
+            # Relasi lain ke user (token, log admin, grup, izin) ikut dihapus.
+            related = [
+                (relation.related_model._meta.db_table, relation.field.column)
+                for relation in User._meta.related_objects if relation.related_model is not Mahasiswa
+            ] + [
+                (field.remote_field.through._meta.db_table, field.m2m_column_name())
+                for field in User._meta.many_to_many
+            ]
+            for related_table, column in related:
+                cursor.execute(f"DELETE FROM {quote(related_table)} WHERE {quote(column)} IN ({users})", [domain])
+            cursor.execute(f"DELETE FROM {table[User]} WHERE email LIKE %s", [domain])
+            cursor.execute(f"DELETE FROM {table[Dosen]} WHERE kode_dosen LIKE %s", [prefix])
+        KonsentrasiUtama.objects.filter(code__startswith=PREFIX).delete()
+        Prodi.objects.filter(code__startswith=PREFIX).delete()
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.imports import UPLOAD_SPECS, UploadError, fast_import, previous_import, read_upload, upload_digest
+
+
+class Command(BaseCommand):
+    help = 'Import a large master .csv/.xlsx file through the staging-table merge path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(UPLOAD_SPECS))
+        parser.add_argument('file', help='Path to the .csv or .xlsx file')
+        parser.add_argument('--database', default='default', help='Database alias to import into')
+        parser.add_argument(
+            '--snapshot', action='store_true',
+            help='The file is a full snapshot: delete rows whose key is not in the file',
+        )
+
+    def handle(self, *args, **options):
+        spec = UPLOAD_SPECS[options['kind']]
+        started = time.monotonic()
+        try:
+            with open(options['file'], 'rb') as file:
+                digest = upload_digest(file)
+                if previous_import(spec, digest, options['snapshot'], using=options['database']):
+                    self.stdout.write(self.style.SUCCESS("✅ File sama dengan impor terakhir, tidak ada perubahan"))
+                    return
+                df = read_upload(file, dtype=str)
+        except (OSError, UploadError) as e:
+            raise CommandError(str(e))
+
+        missing = set(spec['required']) - set(df.columns)
+        if missing:
+            raise CommandError(f"Kolom wajib tidak ditemukan: {missing}. Kolom file: {list(df.columns)}")
+
+        try:
+            result = fast_import(df, spec, using=options['database'], digest=digest, snapshot=options['snapshot'])
+        except UploadError as e:
+            raise CommandError(str(e))
+        counts = result['counts']
+        for reject in result['rejects']:
+            self.stdout.write(self.style.WARNING(f"⚠️  Baris {reject['row']}: {reject['error']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {counts['total']} baris dalam {time.monotonic() - started:.1f} detik: "
+            f"{counts['insert']} baru, {counts['update']} diperbarui, "
+            f"{counts['unchanged']} tetap, {counts['delete']} dihapus, {counts['reject']} ditolak"
+        ))
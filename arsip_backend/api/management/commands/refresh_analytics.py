@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api import analytics
+
+
+class Command(BaseCommand):
+    help = 'Refresh the analytics rollup tables (dirty slices only, or everything with --full)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every rollup from scratch')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['full']:
+            analytics.refresh_all()
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Rekap analitik dibangun ulang ({time.perf_counter() - started:.2f} detik)"
+            ))
+            return
+
+        refreshed = analytics.refresh_dirty()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {refreshed} potongan rekap diperbarui ({time.perf_counter() - started:.2f} detik)"
+        ))
@@ -0,0 +1,55 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand
+
+from api.wilayah_resolver import MIN_CONFIDENCE, WilayahResolver
+
+
+class Command(BaseCommand):
+    help = 'Resolve free-text place names (e.g. tempat_lahir) to Wilayah codes in one batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Place names to resolve')
+        parser.add_argument('--file', type=str, help='CSV file containing the names to resolve')
+        parser.add_argument('--column', type=str, default='tempat_lahir', help='Column in --file holding the names')
+        parser.add_argument('--output', type=str, help='Write the results to this CSV file instead of stdout')
+        parser.add_argument('--max-level', type=int, default=2, help='Deepest Wilayah level to index (1-4)')
+        parser.add_argument('--min-confidence', type=float, default=MIN_CONFIDENCE)
+
+    def handle(self, *args, **options):
+        names = list(options['names'])
+        if options['file']:
+            with open(options['file'], encoding='utf-8-sig', newline='') as f:
+                reader = csv.DictReader(f)
+                if options['column'] not in (reader.fieldnames or []):
+                    self.stdout.write(self.style.ERROR(f"Kolom '{options['column']}' tidak ditemukan"))
+                    return
+                names.extend(row[options['column']] for row in reader)
+
+        if not names:
+            self.stdout.write(self.style.WARNING("Tidak ada nama untuk diresolusi"))
+            return
+
+        resolver = WilayahResolver.build(max_level=options['max_level'])
+        self.stdout.write(f"🔍 Indeks berisi {len(resolver.entries)} wilayah")
+        results = resolver.resolve_many(names)
+
+        out = open(options['output'], 'w', encoding='utf-8', newline='') if options['output'] else sys.stdout
+        try:
+            writer = csv.writer(out)
+            writer.writerow(['raw', 'code', 'name', 'level', 'confidence', 'method'])
+            for raw, match in results.items():
+                if match and match.confidence >= options['min_confidence']:
+                    writer.writerow([raw, match.code, match.name, match.level, match.confidence, match.method])
+                else:
+                    writer.writerow([raw, '', '', '', match.confidence if match else 0, 'unresolved'])
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        resolved = sum(
+            1 for match in results.values()
+            if match and match.confidence >= options['min_confidence']
+        )
+        self.stderr.write(self.style.SUCCESS(f"✅ {resolved}/{len(results)} nama berhasil diresolusi"))
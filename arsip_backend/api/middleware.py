@@ -0,0 +1,240 @@
+import hashlib
+import secrets
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependensi opsional
+    brotli = None
+
+from .db_router import replica_aliases, reset_replicas, use_replicas
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Endpoint POST yang hanya membaca (sub-request batch selalu GET).
+READ_ONLY_PATHS = ('/api/batch/',)
+PIN_COOKIE = 'db_pin'
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml')
+# Level yang dipakai django.utils.text.compress_string.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Mitigasi BREACH seperti GZipMiddleware: panjang keluaran kompresi diacak
+# dengan 0..MAX_RANDOM_BYTES-1 byte yang tidak ikut dikompresi, sehingga
+# panjang respons tidak lagi membocorkan tebakan penyerang atas rahasia
+# (token, CSRF) di body yang sebagian isinya ia kendalikan.
+MAX_RANDOM_BYTES = 100
+# Di jalur async, body sebesar ini dikompresi di thread pool agar event
+# loop tidak tertahan.
+OFFLOAD_SIZE = 64 * 1024
+
+
+def client_key(request):
+    """Identitas klien untuk pinning: token, session, atau alamat IP."""
+    identity = (
+        request.META.get('HTTP_AUTHORIZATION')
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or request.META.get('REMOTE_ADDR', '')
+    )
+    return _pin_key(identity)
+
+
+def _pin_key(identity):
+    return 'db-pin:' + hashlib.sha1(identity.encode()).hexdigest()
+
+
+def pin_keys(request, response):
+    """
+    Kunci yang di-pin setelah request tulis: identitas saat ini, ditambah
+    header Token yang akan dipakai klien bila respons menerbitkan token
+    (login/registrasi).
+    """
+    keys = [client_key(request)]
+    data = getattr(response, 'data', None)
+    if isinstance(data, dict) and isinstance(data.get('token'), str):
+        keys.append(_pin_key(f"Token {data['token']}"))
+    return keys
+
+
+def pin_seconds():
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+
+def set_pin_cookie(response):
+    response.set_cookie(
+        PIN_COOKIE, '1', max_age=pin_seconds(),
+        secure=settings.SESSION_COOKIE_SECURE, httponly=True, samesite='Lax',
+    )
+
+
+class ReplicaPinningMiddleware:
+    """
+    Request baca (GET/HEAD/OPTIONS) boleh dilayani replica, kecuali klien
+    baru saja menulis: setelah request tulis, klien di-pin ke primary
+    selama REPLICA_PIN_SECONDS agar selalu membaca tulisannya sendiri.
+
+    Pin berupa cookie pada respons request tulis, sehingga tetap berlaku
+    walau identitas klien berubah karena request itu sendiri (login atau
+    registrasi lalu request berikutnya memakai header Token). Untuk klien
+    yang tidak menyimpan cookie, penanda juga disimpan di cache (lintas
+    worker) per identitas lama dan per token yang baru diterbitkan.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+
+        key = client_key(request)
+        safe = request.method in SAFE_METHODS or request.path_info in READ_ONLY_PATHS
+        token = use_replicas(safe and not (request.COOKIES.get(PIN_COOKIE) or cache.get(key)))
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_replicas(token)
+
+        if not safe:
+            cache.set_many(dict.fromkeys(pin_keys(request, response), 1), timeout=pin_seconds())
+            set_pin_cookie(response)
+        return response
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+
+        key = client_key(request)
+        safe = request.method in SAFE_METHODS or request.path_info in READ_ONLY_PATHS
+        token = use_replicas(safe and not (request.COOKIES.get(PIN_COOKIE) or await cache.aget(key)))
+        try:
+            response = await self.get_response(request)
+        finally:
+            reset_replicas(token)
+
+        if not safe:
+            await cache.aset_many(dict.fromkeys(pin_keys(request, response), 1), timeout=pin_seconds())
+            set_pin_cookie(response)
+        return response
+
+
+def accepted_encodings(header):
+    """Bobot q per encoding dari header Accept-Encoding, mis. {'br': 1.0, 'gzip': 0.8}."""
+    weights = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    return weights
+
+
+def choose_encoding(header):
+    """Pilih brotli atau gzip sesuai preferensi klien; None bila tidak ada yang cocok."""
+    weights = accepted_encodings(header)
+    available = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _brotli_padding(size):
+    """
+    Meta-block metadata brotli berisi `size` byte (1..256) yang diabaikan
+    decoder: ISLAST=0, MNIBBLES=0, bit cadangan, MSKIPBYTES=1, MSKIPLEN-1,
+    lalu isinya; dimulai dan diakhiri pada batas byte.
+    """
+    bits = (3 << 1) | (1 << 4) | ((size - 1) << 6)
+    return bits.to_bytes(2, 'little') + b'a' * size
+
+
+def compress(content, encoding, max_random_bytes=MAX_RANDOM_BYTES):
+    if encoding != 'br':
+        return compress_string(content, max_random_bytes=max_random_bytes)
+    padding = secrets.randbelow(max_random_bytes) if max_random_bytes else 0
+    if not padding:
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    # flush() menutup header stream pada batas byte, sehingga meta-block
+    # padding bisa disisipkan sebelum data.
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    header = compressor.process(b'') + compressor.flush()
+    return header + _brotli_padding(padding) + compressor.process(content) + compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Kompresi body respons sesuai Accept-Encoding (brotli diutamakan bila
+    tersedia, lalu gzip), dengan padding acak terhadap BREACH. Respons di
+    bawah COMPRESSION_MIN_SIZE byte, respons streaming, dan tipe konten yang
+    sudah terkompresi dilewati.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if not response.streaming and len(response.content) >= OFFLOAD_SIZE:
+            return await sync_to_async(self.process_response, thread_sensitive=False)(request, response)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        # Vary dipasang walau tidak dikompresi agar cache perantara tidak
+        # menyajikan versi yang salah ke klien lain.
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < getattr(settings, 'COMPRESSION_MIN_SIZE', 1024):
+            return response
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # Body berubah, jadi ETag kuat diturunkan menjadi ETag lemah (RFC 9110).
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
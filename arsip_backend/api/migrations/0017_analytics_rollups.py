@@ -0,0 +1,51 @@
+# Generated by Django 4.2.24 on 2026-10-19 09:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_konsentrasiutama_prodi'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SupervisorLoad',
+            fields=[
+                ('dosen', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='api.dosen')),
+                ('bimbingan', models.PositiveIntegerField(default=0)),
+                ('proposal_pending', models.PositiveIntegerField(default=0)),
+                ('proposal_approved', models.PositiveIntegerField(default=0)),
+                ('proposal_rejected', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AnalyticsDirty',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('key', models.CharField(max_length=100)),
+            ],
+            options={
+                'unique_together': {('kind', 'key')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tahun_masuk', models.IntegerField()),
+                ('jk', models.CharField(max_length=1)),
+                ('proposal_status', models.CharField(max_length=20)),
+                ('mahasiswa', models.PositiveIntegerField(default=0)),
+                ('proposal', models.PositiveIntegerField(default=0)),
+                ('prodi', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='api.prodi')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['prodi', 'tahun_masuk', 'jk'], name='api_student_prodi_i_977841_idx')],
+            },
+        ),
+    ]
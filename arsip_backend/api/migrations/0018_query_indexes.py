@@ -0,0 +1,95 @@
+# Generated by Django 4.2.24 on 2026-10-19 09:51
+
+from django.db import DatabaseError, migrations, models, transaction
+
+# Pencarian `icontains` (search Mahasiswa/Dosen/Bimbingan) menjadi
+# UPPER(kolom) LIKE UPPER('%...%') di PostgreSQL; hanya indeks GIN trigram
+# atas ekspresi yang sama yang bisa dipakai. Khusus PostgreSQL, sehingga
+# tidak dicatat di Meta.indexes, dan dilewati bila ekstensi pg_trgm tidak
+# tersedia atau tidak boleh dibuat oleh user database.
+TRIGRAM_INDEXES = [
+    ('mahasiswa_nama_trgm', 'api_mahasiswa', 'nama_mahasiswa'),
+    ('mahasiswa_nim_trgm', 'api_mahasiswa', 'nim'),
+    ('dosen_nama_trgm', 'api_dosen', 'nama_dosen'),
+    ('dosen_nidn_trgm', 'api_dosen', 'nidn'),
+]
+
+
+def check_single_pending(apps, schema_editor):
+    Proposal = apps.get_model('api', 'Proposal')
+    duplicates = list(
+        Proposal.objects.using(schema_editor.connection.alias)
+        .filter(status='pending')
+        .values_list('mahasiswa__nim')
+        .annotate(total=models.Count('pk'))
+        .filter(total__gt=1)
+        .order_by('mahasiswa__nim')[:20]
+    )
+    if duplicates:
+        nims = ', '.join(nim for nim, _ in duplicates)
+        raise RuntimeError(
+            f"Ada mahasiswa dengan lebih dari satu proposal pending ({nims}); "
+            "selesaikan dulu sebelum menerapkan constraint proposal_satu_pending_per_mahasiswa."
+        )
+
+
+def create_trigram_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except DatabaseError:
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mahasiswa',
+            index=models.Index(fields=['prodi', 'tahun_masuk', 'jk'], name='mahasiswa_prodi_angkatan_jk'),
+        ),
+        migrations.AddIndex(
+            model_name='mahasiswa',
+            index=models.Index(fields=['tahun_masuk', 'jk'], name='mahasiswa_angkatan_jk'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['mahasiswa', 'status'], name='proposal_mahasiswa_status'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['mahasiswa', '-created_at'], name='proposal_mahasiswa_terbaru'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['status', '-created_at'], name='proposal_status_terbaru'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['dosen_pembimbing', 'status'], name='proposal_pembimbing_status'),
+        ),
+        migrations.RunPython(check_single_pending, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='proposal',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('mahasiswa',), name='proposal_satu_pending_per_mahasiswa'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.24 on 2026-10-19 10:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_closure(apps, schema_editor):
+    """Isi closure untuk wilayah yang sudah ada (lihat api/wilayah_tree.py)."""
+    Wilayah = apps.get_model('api', 'Wilayah')
+    WilayahClosure = apps.get_model('api', 'WilayahClosure')
+    db = schema_editor.connection.alias
+    nodes = list(Wilayah.objects.using(db).values_list('id', 'code', 'parent_code'))
+    ids = {code: pk for pk, code, _ in nodes}
+    parents = {code: parent for _, code, parent in nodes}
+    links = []
+    for pk, code, _ in nodes:
+        current, depth = code, 0
+        while current in ids and depth <= 10:
+            links.append(WilayahClosure(ancestor_id=ids[current], descendant_id=pk, depth=depth))
+            current, depth = parents[current], depth + 1
+    WilayahClosure.objects.using(db).bulk_create(links, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_import_hashes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WilayahClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='api.wilayah')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='api.wilayah')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='api_wilayah_descend_485139_idx')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
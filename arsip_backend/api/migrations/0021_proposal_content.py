@@ -0,0 +1,49 @@
+# Generated by Django 4.2.24 on 2026-10-19 10:33
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Indeks GIN untuk pencarian ?content= (tsvector @@ tsquery). Khusus
+# PostgreSQL, sehingga tidak dicatat di Meta.indexes.
+VECTOR_INDEX = 'proposal_content_vector'
+
+
+def create_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {VECTOR_INDEX} ON api_proposalcontent USING gin (vector)'
+    )
+
+
+def drop_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {VECTOR_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_wilayah_closure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProposalContent',
+            fields=[
+                ('proposal', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='content', serialize=False, to='api.proposal')),
+                ('file_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Menunggu ekstraksi'), ('done', 'Selesai'), ('failed', 'Gagal')], default='pending', max_length=10)),
+                ('text', models.TextField(blank=True)),
+                ('vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['status'], name='proposal_content_pending')],
+            },
+        ),
+        migrations.RunPython(create_vector_index, drop_vector_index),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.24 on 2026-10-19 16:20
+
+from django.db import DatabaseError, migrations, transaction
+
+# Indeks GiST (bukan GIN seperti 0018) karena hanya GiST yang bisa
+# mengurutkan `kolom <-> 'judul'` (KNN) untuk top-k judul mirip. Khusus
+# PostgreSQL dan dilewati bila pg_trgm tidak tersedia; similar_titles lalu
+# memakai pencocokan di Python.
+TITLE_INDEXES = [
+    ('proposal_judul_trgm', 'api_proposal', 'judul'),
+    ('mahasiswa_judul_skripsi_trgm', 'api_mahasiswa', 'judul_skripsi'),
+]
+
+
+def create_title_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except DatabaseError:
+        return
+    for name, table, column in TITLE_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gist ({column} gist_trgm_ops(siglen=64))'
+        )
+
+
+def drop_title_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in TITLE_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_proposal_content'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_title_indexes, drop_title_indexes),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import Permission
+from django.contrib.postgres.search import SearchVectorField
 
 class Division(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -45,12 +46,30 @@ class Religion(models.Model):
         return self.name
 
 
+class WilayahQuerySet(models.QuerySet):
+    """Penelusuran hierarki lewat WilayahClosure; `wilayah` berupa kode atau instance."""
+
+    def _through(self, relation, wilayah, include_self):
+        lookup = {relation: wilayah} if isinstance(wilayah, models.Model) else {f'{relation}__code': wilayah}
+        if not include_self:
+            lookup[f"{relation.rsplit('__', 1)[0]}__depth__gt"] = 0
+        return self.filter(**lookup)
+
+    def descendants_of(self, wilayah, include_self=True):
+        return self._through('ancestor_links__ancestor', wilayah, include_self)
+
+    def ancestors_of(self, wilayah, include_self=True):
+        return self._through('descendant_links__descendant', wilayah, include_self).order_by('level')
+
+
 class Wilayah(models.Model):
     code = models.CharField(max_length=25, unique=True)  
     name = models.CharField(max_length=100)
     parent_code = models.CharField(max_length=20, null=True, blank=True)  
     level = models.PositiveSmallIntegerField() 
 
+    objects = WilayahQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} ({self.code})"
     
@@ -61,6 +80,20 @@ class Wilayah(models.Model):
             models.Index(fields=['code']),
         ]
 
+
+class WilayahClosure(models.Model):
+    """
+    Pasangan leluhur-keturunan Wilayah, termasuk wilayah itu sendiri
+    (depth 0). Diisi oleh api/wilayah_tree.py, jangan diubah manual.
+    """
+    ancestor = models.ForeignKey(Wilayah, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Wilayah, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ('ancestor', 'descendant')
+        indexes = [models.Index(fields=['descendant', 'depth'])]
+
 class EducationLevel(models.Model):
     CODE_CHOICES = [
         ('SD', 'Sekolah Dasar'),
@@ -144,6 +177,11 @@ class Mahasiswa(models.Model):
         verbose_name = "Mahasiswa"
         verbose_name_plural = "Data Mahasiswa"
         ordering = ['nim']
+        indexes = [
+            # filterset_fields prodi/tahun_masuk/jk dan potongan rekap analitik.
+            models.Index(fields=['prodi', 'tahun_masuk', 'jk'], name='mahasiswa_prodi_angkatan_jk'),
+            models.Index(fields=['tahun_masuk', 'jk'], name='mahasiswa_angkatan_jk'),
+        ]
 
     def __str__(self):
         return f"{self.nim} - {self.nama_mahasiswa}"
@@ -169,6 +207,24 @@ class Proposal(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # validate_mahasiswa dan judul proposal approved per mahasiswa.
+            models.Index(fields=['mahasiswa', 'status'], name='proposal_mahasiswa_status'),
+            # Proposal terakhir per mahasiswa (rekap analitik).
+            models.Index(fields=['mahasiswa', '-created_at'], name='proposal_mahasiswa_terbaru'),
+            # Daftar per status, terbaru dulu.
+            models.Index(fields=['status', '-created_at'], name='proposal_status_terbaru'),
+            # Beban bimbingan per dosen pembimbing dan status.
+            models.Index(fields=['dosen_pembimbing', 'status'], name='proposal_pembimbing_status'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['mahasiswa'], condition=models.Q(status='pending'),
+                name='proposal_satu_pending_per_mahasiswa',
+            ),
+        ]
+
     def __str__(self):
         return f"{self.judul} ({self.mahasiswa.nim})"
 
@@ -180,6 +236,33 @@ class Proposal(models.Model):
     def nama_mahasiswa(self):
         return self.mahasiswa.nama_mahasiswa
 
+
+class ProposalContent(models.Model):
+    """
+    Teks isi file proposal untuk pencarian `?content=`. Baris berstatus
+    pending dibuat oleh signal saat file berubah dan diproses oleh
+    `manage.py extract_proposal_text` (lihat api/proposal_text.py).
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Menunggu ekstraksi'),
+        ('done', 'Selesai'),
+        ('failed', 'Gagal'),
+    ]
+
+    proposal = models.OneToOneField(Proposal, on_delete=models.CASCADE, primary_key=True, related_name='content')
+    file_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    text = models.TextField(blank=True)
+    # tsvector (PostgreSQL), diindeks GIN oleh migrasi 0021.
+    vector = SearchVectorField(null=True)
+    error = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status'], condition=models.Q(status='pending'), name='proposal_content_pending'),
+        ]
+
 class Bimbingan(models.Model):
     dosen = models.ForeignKey(Dosen, on_delete=models.CASCADE)
     mahasiswa = models.ForeignKey(Mahasiswa, on_delete=models.CASCADE)
@@ -203,4 +286,57 @@ class Bimbingan(models.Model):
 
     @property
     def nama_mahasiswa(self):
-        return self.mahasiswa.nama_mahasiswa
\ No newline at end of file
+        return self.mahasiswa.nama_mahasiswa
+
+class StudentRollup(models.Model):
+    """
+    Rekap jumlah mahasiswa dan proposal per prodi x angkatan x jk x status
+    proposal terakhir ('none' bila belum mengajukan). Diisi oleh
+    api/analytics.py, jangan diubah manual.
+    """
+    prodi = models.ForeignKey(Prodi, on_delete=models.CASCADE, null=True, blank=True)
+    tahun_masuk = models.IntegerField()
+    jk = models.CharField(max_length=1)
+    proposal_status = models.CharField(max_length=20)
+    mahasiswa = models.PositiveIntegerField(default=0)
+    proposal = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=['prodi', 'tahun_masuk', 'jk'])]
+
+
+class SupervisorLoad(models.Model):
+    """Beban bimbingan per dosen, diisi oleh api/analytics.py."""
+    dosen = models.OneToOneField(Dosen, on_delete=models.CASCADE, primary_key=True)
+    bimbingan = models.PositiveIntegerField(default=0)
+    proposal_pending = models.PositiveIntegerField(default=0)
+    proposal_approved = models.PositiveIntegerField(default=0)
+    proposal_rejected = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class AnalyticsDirty(models.Model):
+    """Potongan rekap yang perlu dihitung ulang (ditandai oleh signal)."""
+    kind = models.CharField(max_length=20)
+    key = models.CharField(max_length=100)
+
+    class Meta:
+        unique_together = ('kind', 'key')
+
+
+class ImportFile(models.Model):
+    """Digest file master terakhir yang berhasil diimpor per jenis data."""
+    kind = models.CharField(max_length=30, unique=True)
+    digest = models.CharField(max_length=64)
+    snapshot = models.BooleanField(default=False)
+    imported_at = models.DateTimeField(auto_now=True)
+
+
+class ImportRowHash(models.Model):
+    """Hash isi baris file terakhir per kunci natural (code/nim/nidn)."""
+    kind = models.CharField(max_length=30)
+    key = models.CharField(max_length=100)
+    digest = models.CharField(max_length=40)
+
+    class Meta:
+        unique_together = ('kind', 'key')
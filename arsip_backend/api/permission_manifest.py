@@ -0,0 +1,53 @@
+import hashlib
+import json
+
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+
+from .generations import bump_generation, get_generation
+
+MANIFEST_VERSION = 1
+# Manifest menentukan izin, jadi tidak disimpan tanpa batas waktu: walau
+# generasi 'permissions' gagal dinaikkan, perubahan role berlaku paling
+# lambat setelah TTL ini.
+MANIFEST_TTL = 5 * 60
+
+
+def _build(codenames, all_permissions=False):
+    payload = {'version': MANIFEST_VERSION, 'all': all_permissions, 'permissions': sorted(codenames)}
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+    return {**payload, 'hash': digest}
+
+
+def _cached(key, compute):
+    key = f'permission-manifest:{get_generation("permissions")}:{key}'
+    manifest = cache.get(key)
+    if manifest is None:
+        manifest = compute()
+        cache.set(key, manifest, timeout=MANIFEST_TTL)
+    return manifest
+
+
+def role_manifest(role_id):
+    """Manifest codename permission efektif milik sebuah role."""
+    return _cached(
+        f'role:{role_id}',
+        lambda: _build(Permission.objects.filter(role__id=role_id).values_list('codename', flat=True)),
+    )
+
+
+def user_manifest(user):
+    """
+    Manifest permission untuk user: superuser mendapat semua permission,
+    user tanpa role mendapat manifest kosong.
+    """
+    if user.is_superuser:
+        return _cached('superuser', lambda: _build(Permission.objects.values_list('codename', flat=True), True))
+    if not getattr(user, 'role_id', None):
+        return _build([])
+    return role_manifest(user.role_id)
+
+
+def invalidate_manifests():
+    """Naikkan generasi sehingga semua manifest tersimpan otomatis usang."""
+    bump_generation('permissions')
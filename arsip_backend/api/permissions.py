@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from .permission_manifest import user_manifest
+
 class BasePermission(permissions.BasePermission):
     permission_codename = None
     
@@ -10,15 +12,13 @@ class BasePermission(permissions.BasePermission):
         if request.user.is_superuser:
             return True
                     
-        if not hasattr(request.user, 'role') or not request.user.role:
+        if not getattr(request.user, 'role_id', None):
             return False
                 
         if self.permission_codename is None:
             return False
             
-        return request.user.role.permissions.filter(
-            codename=self.permission_codename
-        ).exists()
+        return self.permission_codename in user_manifest(request.user)['permissions']
 
 class CanManageUsers(BasePermission):
     permission_codename = 'can_manage_users'
@@ -0,0 +1,149 @@
+"""
+Jalur baca cepat untuk endpoint list Mahasiswa/Dosen.
+
+Alih-alih membangun instance model lalu menelusuri `source=` bertitik per
+field, kolom yang dibutuhkan diproyeksikan langsung dengan values_list()
+(relasi ikut di-join di SQL) dan tiap baris dipetakan ke dict oleh daftar
+getter yang disusun sekali per subset field. Hasilnya harus identik dengan
+MahasiswaSerializer/DosenSerializer (lihat api/tests.py); jalur tulis tetap
+memakai serializer.
+"""
+from collections import namedtuple
+from functools import lru_cache
+from operator import itemgetter
+
+from django.db.models import OuterRef, Subquery
+from rest_framework.response import Response
+
+from .models import Proposal
+
+# `lookup` adalah kolom values_list (tuple bila `convert` butuh beberapa
+# kolom); `when` meniru SkipField DRF: key tidak dikeluarkan bila relasi
+# bernilai null (field `source='relasi.x'` tanpa allow_null); `convert`
+# menerima nilai kolom-kolom `lookup` dan mengembalikan nilai keluaran.
+Field = namedtuple('Field', ['key', 'lookup', 'when', 'convert'], defaults=(None, None))
+
+
+def _date(value):
+    # Padanan serializers.DateField.to_representation dengan format ISO 8601.
+    return value.isoformat() if value else None
+
+
+def _judul_skripsi(approved_judul, judul_skripsi):
+    # MahasiswaSerializer.get_judul_skripsi: judul proposal approved pertama
+    # (urut pk), atau judul_skripsi, atau "BELUM ADA".
+    if approved_judul is not None:
+        return approved_judul
+    return judul_skripsi or 'BELUM ADA'
+
+
+def _getter(field, index):
+    lookups = field.lookup if isinstance(field.lookup, tuple) else (field.lookup,)
+    positions = [index(lookup) for lookup in lookups]
+    if field.convert is None:
+        return itemgetter(positions[0])
+    convert = field.convert
+    if len(positions) == 1:
+        position = positions[0]
+        return lambda row: convert(row[position])
+    return lambda row: convert(*(row[position] for position in positions))
+
+
+class Projection:
+    def __init__(self, fields, annotations=None):
+        self.fields = fields
+        self.annotations = annotations or {}
+
+    @lru_cache(maxsize=32)
+    def compile(self, keys=None):
+        """Kolom yang perlu diambil dan fungsi pemetaan baris untuk subset `keys`."""
+        columns = {}
+
+        def index(lookup):
+            # Kolom values_list didaftarkan sesuai urutan pertama kali dipakai.
+            return columns.setdefault(lookup, len(columns))
+
+        plan = []
+        for field in self.fields:
+            if keys is not None and field.key not in keys:
+                continue
+            get = _getter(field, index)
+            plan.append((field.key, get, None if field.when is None else index(field.when)))
+
+        def map_row(row):
+            data = {}
+            for key, get, when in plan:
+                if when is None or row[when] is not None:
+                    data[key] = get(row)
+            return data
+
+        return list(columns), map_row
+
+    def values(self, queryset, keys=None):
+        """Queryset values_list terproyeksi beserta fungsi pemetaan barisnya."""
+        columns, map_row = self.compile(keys)
+        annotations = {name: self.annotations[name] for name in columns if name in self.annotations}
+        return queryset.annotate(**annotations).values_list(*columns), map_row
+
+    def rows(self, queryset, keys=None):
+        values, map_row = self.values(queryset, keys)
+        return [map_row(row) for row in values]
+
+    def list_response(self, view, queryset, keys=None):
+        """Padanan ListModelMixin.list() yang memakai proyeksi ini."""
+        values, map_row = self.values(queryset, keys)
+        page = view.paginate_queryset(values)
+        if page is not None:
+            return view.get_paginated_response([map_row(row) for row in page])
+        return Response([map_row(row) for row in values])
+
+
+MAHASISWA = Projection(
+    fields=[
+        Field('id', 'id'),
+        Field('nim', 'nim'),
+        Field('nama_mahasiswa', 'nama_mahasiswa'),
+        Field('alamat', 'alamat'),
+        Field('tempat_lahir', 'tempat_lahir'),
+        Field('tempat_lahir_id', 'tempat_lahir', when='tempat_lahir'),
+        Field('tempat_lahir_nama', 'tempat_lahir__name', when='tempat_lahir'),
+        Field('tgl_lahir', 'tgl_lahir', convert=_date),
+        Field('jk', 'jk'),
+        Field('tahun_masuk', 'tahun_masuk'),
+        Field('prodi', 'prodi'),
+        Field('prodi_id', 'prodi', when='prodi'),
+        Field('prodi_nama', 'prodi__name', when='prodi'),
+        Field('konsentrasi', 'konsentrasi'),
+        Field('konsentrasi_id', 'konsentrasi', when='konsentrasi'),
+        Field('konsentrasi_nama', 'konsentrasi__name', when='konsentrasi'),
+        Field('judul_skripsi', ('approved_judul', 'judul_skripsi'), convert=_judul_skripsi),
+    ],
+    annotations={
+        'approved_judul': Subquery(
+            Proposal.objects.filter(mahasiswa=OuterRef('pk'), status='approved').order_by('pk').values('judul')[:1]
+        ),
+    },
+)
+
+DOSEN = Projection(
+    fields=[
+        Field('nidn', 'nidn'),
+        Field('nip', 'nip'),
+        Field('nama_dosen', 'nama_dosen'),
+        Field('gelar_depan', 'gelar_depan'),
+        Field('gelar_belakang', 'gelar_belakang'),
+        Field('jk', 'jk'),
+        Field('tempat_lahir', 'tempat_lahir'),
+        Field('tempat_lahir_id', 'tempat_lahir', when='tempat_lahir'),
+        Field('tempat_lahir_nama', 'tempat_lahir__name'),
+        Field('tgl_lahir', 'tgl_lahir', convert=_date),
+        Field('prodi', 'prodi'),
+        Field('prodi_id', 'prodi', when='prodi'),
+        Field('prodi_nama', 'prodi__name'),
+        Field('konsentrasi', 'konsentrasi'),
+        Field('konsentrasi_id', 'konsentrasi', when='konsentrasi'),
+        Field('konsentrasi_nama', 'konsentrasi__name'),
+        Field('status_aktif', 'status_aktif'),
+        Field('jabatan_fungsional', 'jabatan_fungsional'),
+    ],
+)
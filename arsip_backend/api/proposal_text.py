@@ -0,0 +1,153 @@
+"""
+Ekstraksi teks file proposal untuk pencarian isi dokumen.
+
+Signal menandai proposal yang file-nya berubah sebagai pending di
+ProposalContent; `manage.py extract_proposal_text` (worker lokal)
+mengklaim baris pending dengan SELECT ... FOR UPDATE SKIP LOCKED,
+mengekstrak teksnya, lalu menyimpan teks dan tsvector-nya. Upload
+proposal tidak pernah menunggu ekstraksi.
+
+PDF dibaca dengan pypdf (dependensi opsional; tanpa pypdf baris PDF
+ditandai gagal), DOCX langsung dari XML di dalam arsipnya.
+"""
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import F, Value
+
+from .models import Proposal, ProposalContent
+
+SEARCH_CONFIG = 'indonesian'
+BATCH_SIZE = 20
+# tsvector dibatasi 1 MB; teks sepanjang ini sudah lebih dari cukup untuk
+# mencari isi proposal.
+MAX_CHARS = 200_000
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_WHITESPACE = re.compile(r'\s+')
+
+
+class ExtractionError(ValueError):
+    pass
+
+
+def _pdf_text(file):
+    # Diimpor saat dipakai (oleh worker ekstraksi), bukan saat modul dimuat
+    # lewat api.signals di setiap worker web.
+    try:
+        import pypdf
+    except ImportError:  # pragma: no cover - dependensi opsional
+        raise ExtractionError("pypdf belum terpasang; teks PDF tidak bisa diekstrak")
+    try:
+        reader = pypdf.PdfReader(file)
+        return '\n'.join(page.extract_text() or '' for page in reader.pages)
+    except pypdf.errors.PyPdfError as e:
+        raise ExtractionError(f"PDF tidak bisa dibaca: {e}")
+
+
+def _docx_text(file):
+    try:
+        with zipfile.ZipFile(file) as archive:
+            root = ElementTree.fromstring(archive.read('word/document.xml'))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ExtractionError(f"DOCX tidak bisa dibaca: {e}")
+    return '\n'.join(
+        ''.join(node.text or '' for node in paragraph.iter(f'{_WORD_NS}t'))
+        for paragraph in root.iter(f'{_WORD_NS}p')
+    )
+
+
+def _plain_text(file):
+    return file.read().decode('utf-8', errors='replace')
+
+
+EXTRACTORS = {'.pdf': _pdf_text, '.docx': _docx_text, '.txt': _plain_text}
+
+
+def extract_text(name, storage=default_storage):
+    """Teks ter-normalisasi (spasi dirapatkan, dipotong MAX_CHARS) dari file `name` di storage."""
+    extension = os.path.splitext(name)[1].lower()
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        raise ExtractionError(f"Format {extension or 'tanpa ekstensi'} tidak didukung")
+    try:
+        with storage.open(name, 'rb') as file:
+            text = extractor(file)
+    except OSError as e:
+        raise ExtractionError(f"File tidak bisa dibuka: {e}")
+    # PostgreSQL menolak karakter NUL di kolom teks.
+    return _WHITESPACE.sub(' ', text.replace('\x00', '')).strip()[:MAX_CHARS]
+
+
+def queue(proposal):
+    """Tandai file proposal untuk diekstrak ulang (atau hapus teksnya bila file dikosongkan)."""
+    if not proposal.file:
+        ProposalContent.objects.filter(proposal=proposal).delete()
+        return
+    ProposalContent.objects.update_or_create(
+        proposal=proposal,
+        defaults={'file_name': proposal.file.name, 'status': 'pending', 'text': '', 'vector': None, 'error': ''},
+    )
+
+
+def queue_missing(batch_size=1000):
+    """Tandai proposal ber-file yang belum punya baris ProposalContent (mis. hasil generate_load_data)."""
+    missing = (
+        Proposal.objects.exclude(file='').exclude(file__isnull=True)
+        .filter(content__isnull=True).values_list('pk', 'file')
+    )
+    rows = [ProposalContent(proposal_id=pk, file_name=name) for pk, name in missing.iterator(chunk_size=batch_size)]
+    ProposalContent.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+    return len(rows)
+
+
+def process_pending(limit=BATCH_SIZE):
+    """
+    Ekstrak paling banyak `limit` baris pending. Worker lain yang berjalan
+    bersamaan melewati baris yang sedang diklaim. Mengembalikan jumlah baris
+    yang diproses.
+    """
+    using = ProposalContent.objects.db
+    postgres = connections[using].vendor == 'postgresql'
+    with transaction.atomic(using=using):
+        pending = ProposalContent.objects.filter(status='pending').order_by('updated_at')
+        if connections[using].features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+        claimed = list(pending.values_list('pk', 'file_name')[:limit])
+        for pk, name in claimed:
+            # Apa pun yang gagal pada satu file (parser pustaka, query
+            # penyimpanan dalam savepoint-nya sendiri) hanya menandai baris
+            # itu gagal; batch tetap tersimpan dan --watch tidak mengulang
+            # file yang sama terus-menerus.
+            try:
+                text = extract_text(name)
+                with transaction.atomic(using=using):
+                    ProposalContent.objects.filter(pk=pk).update(
+                        status='done', text=text, error='',
+                        vector=SearchVector(Value(text), config=SEARCH_CONFIG) if postgres else None,
+                    )
+            except Exception as e:
+                error = str(e) if isinstance(e, ExtractionError) else f"{type(e).__name__}: {e}"
+                ProposalContent.objects.filter(pk=pk).update(status='failed', error=error[:255])
+    return len(claimed)
+
+
+def search(queryset, terms):
+    """
+    Saring proposal yang isi file-nya cocok dengan `terms` (sintaks web:
+    "frasa", OR, -kata). Di PostgreSQL lewat indeks GIN tsvector dan diurutkan
+    menurut relevansi; di backend lain lewat icontains pada teks.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.filter(content__text__icontains=terms)
+    query = SearchQuery(terms, config=SEARCH_CONFIG, search_type='websearch')
+    return (
+        queryset.filter(content__vector=query)
+        .annotate(content_rank=SearchRank(F('content__vector'), query))
+        .order_by('-content_rank', '-pk')
+    )
@@ -0,0 +1,188 @@
+"""
+Regresi rencana query endpoint API.
+
+Setiap endpoint GET list/detail dipanggil lewat test client, semua SELECT
+yang dijalankannya ditangkap, lalu di-EXPLAIN (FORMAT JSON). Rencana
+dianggap bermasalah bila memuat Seq Scan ber-filter pada tabel besar
+(baris dibaca lalu dibuang: indeks yang cocok tidak ada atau tidak
+dipakai) atau total biayanya melewati anggaran. Scan penuh tanpa filter,
+mis. COUNT(*) untuk pagination, hanya dibatasi oleh anggaran biaya. Hanya bermakna di PostgreSQL dengan data yang
+sudah di-seed, karena planner memilih rencana dari statistik isi tabel.
+
+Dipakai oleh `manage.py check_query_plans`; dari test, panggil
+`assert_query_plans()`.
+"""
+import json
+from collections import namedtuple
+from contextlib import ExitStack
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, URLPattern, URLResolver, get_resolver, resolve
+
+LARGE_TABLES = ('api_mahasiswa', 'api_dosen', 'api_proposal', 'api_bimbingan')
+MAX_COST = 2000.0
+
+Statement = namedtuple('Statement', ['alias', 'sql', 'params'])
+Finding = namedtuple('Finding', ['view', 'path', 'sql', 'problems'])
+
+
+class QueryPlanError(AssertionError):
+    def __init__(self, findings):
+        self.findings = findings
+        super().__init__(report(findings))
+
+
+class _Recorder:
+    def __init__(self, alias):
+        self.alias = alias
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip()[:6].upper() in ('SELECT', 'WITH ('):
+            self.statements.append(Statement(self.alias, sql, params))
+        return execute(sql, params, many, context)
+
+
+def capture(func, *args, **kwargs):
+    """Jalankan `func` dan kembalikan (hasil, daftar SELECT yang dieksekusi)."""
+    recorders = [_Recorder(connection.alias) for connection in connections.all()]
+    with ExitStack() as stack:
+        for recorder in recorders:
+            stack.enter_context(connections[recorder.alias].execute_wrapper(recorder))
+        result = func(*args, **kwargs)
+    return result, [statement for recorder in recorders for statement in recorder.statements]
+
+
+def explain(statement):
+    """Node akar rencana `EXPLAIN (FORMAT JSON)` untuk satu statement."""
+    with connections[statement.alias].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {statement.sql}', statement.params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, (str, bytes)):
+        plan = json.loads(plan)
+    return plan[0]['Plan']
+
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from _nodes(child)
+
+
+def plan_problems(plan, large_tables=LARGE_TABLES, max_cost=MAX_COST):
+    problems = []
+    for node in _nodes(plan):
+        if node['Node Type'] == 'Seq Scan' and node.get('Filter') and node.get('Relation Name') in large_tables:
+            problems.append(f"Seq Scan pada {node['Relation Name']} (filter: {node['Filter']})")
+    if max_cost is not None and plan['Total Cost'] > max_cost:
+        problems.append(f"biaya {plan['Total Cost']:.0f} melebihi anggaran {max_cost:.0f}")
+    return problems
+
+
+def _patterns(resolver=None, prefix=''):
+    for pattern in (resolver or get_resolver()).url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from _patterns(pattern, route)
+        elif isinstance(pattern, URLPattern) and pattern.callback.__module__.startswith('api.'):
+            yield route, pattern
+
+
+def _view_name(callback):
+    cls = getattr(callback, 'cls', None)
+    if cls is None or cls.__name__ == 'WrappedAPIView':
+        return callback.__name__
+    return cls.__name__
+
+
+def _view_model(cls):
+    queryset = getattr(cls, 'queryset', None)
+    if queryset is not None:
+        return queryset.model
+    meta = getattr(getattr(cls, 'serializer_class', None), 'Meta', None)
+    return getattr(meta, 'model', None)
+
+
+def endpoints():
+    """
+    Path setiap route API yang bisa dipanggil tanpa argumen, atau hanya `pk` yang diisi dengan objek pertama dari
+    queryset view. Route lain dikembalikan di daftar kedua (dilewati).
+    """
+    found, skipped, seen = [], [], set()
+    for route, pattern in _patterns():
+        if route in seen:
+            # ASYNC_READ_VIEWS: pola yang didaftarkan lebih dulu yang dipakai.
+            continue
+        seen.add(route)
+        converters = getattr(pattern.pattern, 'converters', {})
+        kwargs = {}
+        if 'pk' in converters:
+            model = _view_model(getattr(pattern.callback, 'cls', None))
+            pk = model._default_manager.order_by('pk').values_list('pk', flat=True).first() if model else None
+            if pk is None:
+                skipped.append(route)
+                continue
+            kwargs['pk'] = pk
+        if set(converters) - set(kwargs):
+            skipped.append(route)
+            continue
+        path = '/' + route
+        for name, value in kwargs.items():
+            path = path.replace(f'<int:{name}>', str(value)).replace(f'<{name}>', str(value))
+        found.append(path)
+    return found, skipped
+
+
+def check(user, paths=None, large_tables=LARGE_TABLES, max_cost=MAX_COST):
+    """
+    Panggil endpoint sebagai `user` dan periksa rencana setiap SELECT-nya.
+    `paths` bawaannya semua `endpoints()`.
+    Mengembalikan (jumlah statement yang diperiksa, daftar Finding).
+    """
+    from rest_framework.test import APIClient
+
+    # Endpoint yang error tetap diperiksa: query sebelum error ikut tertangkap.
+    client = APIClient(raise_request_exception=False, SERVER_NAME=next(
+        (host for host in settings.ALLOWED_HOSTS if host not in ('*', '') and not host.startswith('.')),
+        'localhost',
+    ))
+    client.force_authenticate(user)
+    checked, findings = 0, []
+    for path in (endpoints()[0] if paths is None else paths):
+        try:
+            view = _view_name(resolve(urlsplit(path).path).func)
+        except Resolver404:
+            view = '?'
+        response, statements = capture(client.get, path)
+        if response.status_code == 405:
+            continue
+        seen = set()
+        for statement in statements:
+            key = (statement.alias, statement.sql, repr(statement.params))
+            if key in seen:
+                continue
+            seen.add(key)
+            problems = plan_problems(explain(statement), large_tables, max_cost)
+            checked += 1
+            if problems:
+                findings.append(Finding(view, path, statement.sql, problems))
+    return checked, findings
+
+
+def report(findings):
+    lines = [f"{len(findings)} query dengan rencana bermasalah:"]
+    for finding in findings:
+        lines.append(f"\n{finding.view}  GET {finding.path}")
+        lines.extend(f"  - {problem}" for problem in finding.problems)
+        lines.append(f"  {finding.sql}")
+    return '\n'.join(lines)
+
+
+def assert_query_plans(user, paths=None, large_tables=LARGE_TABLES, max_cost=MAX_COST):
+    """Seperti check(), tetapi melempar QueryPlanError berisi laporan bila ada temuan."""
+    checked, findings = check(user, paths, large_tables, max_cost)
+    if findings:
+        raise QueryPlanError(findings)
+    return checked
@@ -0,0 +1,64 @@
+"""
+Renderer/parser JSON berbasis orjson dengan fallback ke implementasi DRF.
+
+orjson bersifat opsional: bila tidak terpasang, kedua kelas berperilaku
+persis seperti JSONRenderer/JSONParser bawaan DRF.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependensi opsional
+    orjson = None
+
+# Tipe yang tidak dikenal orjson (Decimal, lazy string terjemahan, QuerySet,
+# generator, dst.) diserahkan ke encoder DRF agar hasilnya sama.
+_default = JSONEncoder().default
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data):
+    """Serialisasi ringkas (compact, UTF-8) seperti JSONRenderer DRF, hasil bytes."""
+    if orjson is not None:
+        try:
+            content = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Mis. integer di luar 64 bit: biarkan encoder standar yang menangani.
+            return JSONRenderer().render(data)
+        # Sama dengan DRF: U+2028/U+2029 selalu di-escape.
+        if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+            content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return content
+    return JSONRenderer().render(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            content = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,115 @@
+"""
+Cache respons GET (list/retrieve) untuk viewset yang datanya sama bagi
+banyak user.
+
+Kunci cache terdiri dari nama view dan aksi, kwargs URL, query param yang
+dinormalkan (urut, tanpa nilai kosong), cakupan izin user (role), serta
+generasi setiap model yang dibaca view (`cache_tags`). Signal di
+api/signals.py dan jalur impor massal menaikkan generasi tersebut, sehingga
+entri lama otomatis tidak terpakai lagi tanpa perlu dihapus satu per satu.
+Izin tetap diperiksa pada setiap request sebelum cache dibaca.
+
+Respons untuk cache miss dihitung di primary (lihat db_router.primary_reads).
+Jumlah hit/miss dicatat per view lewat counter atomik api.throttling dan
+ditampilkan di /api/metrics/.
+"""
+import hashlib
+
+from django.core.cache import cache, caches
+from rest_framework import status
+from rest_framework.response import Response
+
+from .db_router import primary_reads
+from .generations import get_generation
+from .throttling import THROTTLE_CACHE, increment
+
+RESPONSE_CACHE_TTL = 60 * 60
+
+
+def _counter_key(view_name, outcome):
+    return f'response-cache:{view_name}:{outcome}'
+
+
+def _count(view_name, outcome):
+    increment(_counter_key(view_name, outcome), timeout=None)
+
+
+def stats():
+    """Hit/miss per view yang memakai CachedResponseMixin, dijumlah dari semua worker."""
+    names = sorted(view.__name__ for view in _cached_views())
+    counts = caches[THROTTLE_CACHE].get_many(
+        [_counter_key(name, outcome) for name in names for outcome in ('hit', 'miss')]
+    )
+    report = {}
+    for name in names:
+        hits, misses = counts.get(_counter_key(name, 'hit'), 0), counts.get(_counter_key(name, 'miss'), 0)
+        report[name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 3) if hits + misses else None,
+        }
+    return report
+
+
+def _cached_views(cls=None):
+    for subclass in (cls or CachedResponseMixin).__subclasses__():
+        if subclass.cache_tags:
+            yield subclass
+        yield from _cached_views(subclass)
+
+
+def normalized_params(params):
+    return sorted(
+        (name, sorted(value for value in params.getlist(name) if value))
+        for name in params
+        if any(params.getlist(name))
+    )
+
+
+class CachedResponseMixin:
+    """
+    Cache respons aksi `cache_actions` dengan kunci bertag `cache_tags`
+    (nama generasi model yang dibaca serializer/queryset view).
+    """
+
+    cache_tags = ()
+    cache_actions = ('list', 'retrieve')
+
+    def get_cache_scope(self, request):
+        """Bagian kunci yang membedakan visibilitas data antar user."""
+        user = request.user
+        if not (user and user.is_authenticated):
+            return 'anon'
+        return f"role-{user.role_id or 0}{'-su' if user.is_superuser else ''}"
+
+    def get_cache_key(self, request, *args, **kwargs):
+        generations = ':'.join(str(get_generation(tag)) for tag in self.cache_tags)
+        digest = hashlib.sha1(repr((
+            request.get_host(), sorted(kwargs.items()), normalized_params(request.query_params),
+        )).encode()).hexdigest()
+        return f'response:{type(self).__name__}:{self.action}:{self.get_cache_scope(request)}:{generations}:{digest}'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # dispatch() mengambil handler (self.get -> list/retrieve) setelah
+        # initial(), yaitu setelah autentikasi, izin dan throttle diperiksa.
+        if request.method == 'GET' and self.action in self.cache_actions:
+            self.get = self._cached(self.get)
+
+    def _cached(self, handler):
+        view_name = type(self).__name__
+
+        def cached_handler(request, *args, **kwargs):
+            key = self.get_cache_key(request, *args, **kwargs)
+            data = cache.get(key)
+            if data is not None:
+                _count(view_name, 'hit')
+                return Response(data)
+            _count(view_name, 'miss')
+            with primary_reads():
+                response = handler(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout=RESPONSE_CACHE_TTL)
+            return response
+
+        return cached_handler
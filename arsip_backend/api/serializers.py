@@ -4,6 +4,8 @@ from .models import User, Division, Role, Wilayah, Religion, EducationLevel, Kon
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import Permission 
+from .permission_manifest import user_manifest
+from .sparse_fields import SparseFieldsSerializerMixin
 
 class DivisionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -137,6 +139,23 @@ class UserSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
+class RoleSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Role
+        fields = ['id', 'name', 'description', 'created_at']
+
+class MeSerializer(UserSerializer):
+    """User aktif tanpa daftar permission bersarang; permission diambil dari manifest."""
+    role = RoleSummarySerializer(read_only=True)
+    permissions_hash = serializers.SerializerMethodField()
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ['permissions_hash']
+
+    def get_permissions_hash(self, obj):
+        manifest = self.context.get('manifest') or user_manifest(obj)
+        return manifest['hash']
+
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField(required=True)
     password = serializers.CharField(required=True, write_only=True)
@@ -203,7 +222,7 @@ class ProdiSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Kode program studi sudah ada.")
         return value
 
-class MahasiswaSerializer(serializers.ModelSerializer):
+class MahasiswaSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     tempat_lahir_id = serializers.IntegerField(source='tempat_lahir.id', read_only=True)
     tempat_lahir_nama = serializers.CharField(source='tempat_lahir.name', read_only=True)
     prodi_id = serializers.IntegerField(source='prodi.id', read_only=True)
@@ -305,7 +324,7 @@ class RegisterMahasiswaSerializer(serializers.ModelSerializer):
         )
         return mahasiswa
 
-class DosenSerializer(serializers.ModelSerializer):    
+class DosenSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):    
     tempat_lahir_id = serializers.IntegerField(source='tempat_lahir.id', read_only=True)
     tempat_lahir_nama = serializers.CharField(source='tempat_lahir.name', read_only=True, allow_null=True)    
     prodi_id = serializers.IntegerField(source='prodi.id', read_only=True)
@@ -372,7 +391,7 @@ class DosenSerializer(serializers.ModelSerializer):
             validated_data['kode_dosen'] = validated_data.get('nidn')
         return super().create(validated_data)
 
-class ProposalSerializer(serializers.ModelSerializer):
+class ProposalSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     mahasiswa_nim = serializers.CharField(source='mahasiswa.nim', read_only=True)
     mahasiswa_nama = serializers.CharField(source='mahasiswa.nama_mahasiswa', read_only=True)
     dosen_pembimbing = serializers.PrimaryKeyRelatedField(queryset=Dosen.objects.all(), allow_null=True, required=False)
@@ -410,7 +429,7 @@ class ProposalSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Format file harus PDF, DOC, atau DOCX.")
         return value
 
-class BimbinganSerializer(serializers.ModelSerializer):
+class BimbinganSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     kode_dosen = serializers.CharField(source='dosen.kode_dosen', read_only=True)
     nama_dosen = serializers.CharField(source='dosen.nama_dosen', read_only=True)
     nim = serializers.CharField(source='mahasiswa.nim', read_only=True)
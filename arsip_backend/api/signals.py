@@ -0,0 +1,221 @@
+from django.contrib.auth.models import Permission
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import analytics, proposal_text, wilayah_tree
+from .generations import bump_generation
+from .models import (
+    Bimbingan, Dosen, ImportFile, ImportRowHash, KonsentrasiUtama, Mahasiswa, Prodi, Proposal, Role, Wilayah,
+)
+from .permission_manifest import invalidate_manifests
+
+
+@receiver(m2m_changed, sender=Role.permissions.through)
+def role_permissions_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_manifests()
+
+
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def permission_definitions_changed(sender, **kwargs):
+    invalidate_manifests()
+
+
+@receiver(post_save, sender=Prodi)
+@receiver(post_delete, sender=Prodi)
+def prodi_changed(sender, **kwargs):
+    bump_generation('prodi')
+
+
+@receiver(post_save, sender=KonsentrasiUtama)
+@receiver(post_delete, sender=KonsentrasiUtama)
+def konsentrasi_changed(sender, **kwargs):
+    bump_generation('konsentrasi')
+
+
+# Hash impor hanya berlaku selama baris belum diubah di luar impor: baris
+# yang disimpan/dihapus lewat ORM dilupakan, begitu juga digest file
+# terakhir jenisnya.
+IMPORT_KEYS = {Prodi: 'code', KonsentrasiUtama: 'code', Mahasiswa: 'nim', Dosen: 'nidn'}
+
+
+@receiver(post_save, sender=Prodi)
+@receiver(post_delete, sender=Prodi)
+@receiver(post_save, sender=KonsentrasiUtama)
+@receiver(post_delete, sender=KonsentrasiUtama)
+@receiver(post_save, sender=Mahasiswa)
+@receiver(post_delete, sender=Mahasiswa)
+@receiver(post_save, sender=Dosen)
+@receiver(post_delete, sender=Dosen)
+def imported_row_changed(sender, instance, **kwargs):
+    kind = sender._meta.model_name
+    ImportRowHash.objects.filter(kind=kind, key=getattr(instance, IMPORT_KEYS[sender])).delete()
+    ImportFile.objects.filter(kind=kind).delete()
+
+
+# Relasi mahasiswa/dosen (prodi, konsentrasi, tempat lahir) dicocokkan lewat
+# kode saat impor. Relasi baru bisa membuat baris file yang tadinya ditolak
+# menjadi valid, jadi digest file dilupakan. Hash baris hanya dibatalkan
+# untuk baris yang merujuk relasi yang kodenya berganti atau yang dihapus;
+# mengganti nama prodi/konsentrasi tidak mengubah hasil impor. Nama wilayah
+# ikut dipakai memetakan tempat lahir, jadi perubahannya melupakan digest
+# file (hash baris memuat kode hasil pemetaan, sehingga berubah sendiri).
+def _import_kinds():
+    return [Mahasiswa._meta.model_name, Dosen._meta.model_name]
+
+
+def _forget_referencing_rows(relation, pk):
+    for model in (Mahasiswa, Dosen):
+        condition = Q()
+        for field in model._meta.concrete_fields:
+            if field.is_relation and field.related_model is relation:
+                condition |= Q(**{field.name: pk})
+        if not condition:
+            continue
+        referencing = model.objects.filter(condition)
+        ImportRowHash.objects.filter(
+            kind=model._meta.model_name, key__in=referencing.values(IMPORT_KEYS[model]),
+        ).delete()
+
+
+@receiver(post_init, sender=Prodi)
+@receiver(post_init, sender=KonsentrasiUtama)
+@receiver(post_init, sender=Wilayah)
+def import_relation_loaded(sender, instance, **kwargs):
+    values = vars(instance)
+    instance._import_code, instance._import_name = values.get('code'), values.get('name')
+
+
+@receiver(post_save, sender=Prodi)
+@receiver(post_save, sender=KonsentrasiUtama)
+@receiver(post_save, sender=Wilayah)
+def import_relation_changed(sender, instance, created, **kwargs):
+    if sender is Wilayah and wilayah_tree.bulk_loading():
+        return
+    code_changed = not created and instance.code != instance._import_code
+    if code_changed:
+        _forget_referencing_rows(sender, instance.pk)
+    if created or code_changed or (sender is Wilayah and instance.name != instance._import_name):
+        ImportFile.objects.filter(kind__in=_import_kinds()).delete()
+    instance._import_code, instance._import_name = instance.code, instance.name
+
+
+# pre_delete: setelah dihapus, rujukan SET_NULL sudah dikosongkan tanpa signal.
+@receiver(pre_delete, sender=Prodi)
+@receiver(pre_delete, sender=KonsentrasiUtama)
+@receiver(pre_delete, sender=Wilayah)
+def import_relation_deleted(sender, instance, **kwargs):
+    if sender is Wilayah and wilayah_tree.bulk_loading():
+        return
+    _forget_referencing_rows(sender, instance.pk)
+    ImportFile.objects.filter(kind__in=_import_kinds()).delete()
+
+
+def _slice_of(values):
+    if None in (values.get('tahun_masuk'), values.get('jk')) or 'prodi_id' not in values:
+        return None
+    return analytics.slice_key(values['prodi_id'], values['tahun_masuk'], values['jk'])
+
+
+# Nilai awal kolom kunci rekap disimpan saat instance dibuat agar potongan
+# lama ikut ditandai bila prodi/angkatan/jk/pembimbing berubah. Dibaca dari
+# __dict__ supaya field yang di-defer tidak memicu query.
+@receiver(post_init, sender=Mahasiswa)
+def mahasiswa_loaded(sender, instance, **kwargs):
+    instance._analytics_slice = _slice_of(vars(instance))
+
+
+@receiver(post_init, sender=Proposal)
+@receiver(post_init, sender=Bimbingan)
+def supervision_loaded(sender, instance, **kwargs):
+    fields = vars(instance)
+    instance._analytics_dosen = fields.get('dosen_pembimbing_id', fields.get('dosen_id'))
+
+
+@receiver(post_save, sender=Mahasiswa)
+@receiver(post_delete, sender=Mahasiswa)
+@receiver(post_save, sender=Dosen)
+@receiver(post_delete, sender=Dosen)
+def people_changed(sender, **kwargs):
+    # Sebaran wilayah (analytics.wilayah_distribution) dan respons list yang
+    # di-cache (api/response_cache.py) memakai generasi ini.
+    bump_generation(sender._meta.model_name)
+
+
+# Respons Bimbingan yang di-cache (api/response_cache.py) juga bertag
+# proposal dan bimbingan; mahasiswa/dosen sudah dinaikkan people_changed.
+@receiver(post_save, sender=Proposal)
+@receiver(post_delete, sender=Proposal)
+@receiver(post_save, sender=Bimbingan)
+@receiver(post_delete, sender=Bimbingan)
+def supervision_rows_changed(sender, **kwargs):
+    bump_generation(sender._meta.model_name)
+
+
+@receiver(post_save, sender=Mahasiswa)
+@receiver(post_delete, sender=Mahasiswa)
+def mahasiswa_changed(sender, instance, **kwargs):
+    analytics.mark_dirty(analytics.STUDENTS, [instance._analytics_slice, _slice_of(vars(instance))])
+    instance._analytics_slice = _slice_of(vars(instance))
+
+
+@receiver(post_save, sender=Proposal)
+@receiver(post_delete, sender=Proposal)
+def proposal_changed(sender, instance, **kwargs):
+    fields = vars(instance)
+    student = Mahasiswa.objects.filter(pk=fields.get('mahasiswa_id')).values('prodi_id', 'tahun_masuk', 'jk').first()
+    if student:
+        analytics.mark_dirty(analytics.STUDENTS, [_slice_of(student)])
+    analytics.mark_dirty(analytics.SUPERVISORS, [instance._analytics_dosen, fields.get('dosen_pembimbing_id')])
+    instance._analytics_dosen = fields.get('dosen_pembimbing_id')
+
+
+# File proposal yang baru/berganti diantrikan untuk ekstraksi teks; worker
+# extract_proposal_text yang memprosesnya, bukan request upload.
+@receiver(post_init, sender=Proposal)
+def proposal_file_loaded(sender, instance, **kwargs):
+    instance._file_name = str(vars(instance).get('file') or '')
+
+
+@receiver(post_save, sender=Proposal)
+def proposal_file_saved(sender, instance, created, **kwargs):
+    name = instance.file.name or ''
+    if name != instance._file_name or (created and name):
+        proposal_text.queue(instance)
+    instance._file_name = name
+
+
+@receiver(post_save, sender=Bimbingan)
+@receiver(post_delete, sender=Bimbingan)
+def bimbingan_changed(sender, instance, **kwargs):
+    analytics.mark_dirty(analytics.SUPERVISORS, [instance._analytics_dosen, instance.dosen_id])
+    instance._analytics_dosen = instance.dosen_id
+
+
+# Closure hierarki wilayah: wilayah baru cukup ditautkan ke leluhur
+# induknya; pindah induk (jarang) membangun ulang seluruh tabel.
+@receiver(post_init, sender=Wilayah)
+def wilayah_loaded(sender, instance, **kwargs):
+    instance._parent_code = vars(instance).get('parent_code')
+
+
+@receiver(post_save, sender=Wilayah)
+def wilayah_saved(sender, instance, created, **kwargs):
+    if wilayah_tree.bulk_loading():
+        instance._parent_code = instance.parent_code
+        return
+    if created:
+        wilayah_tree.attach(instance)
+    elif instance.parent_code != instance._parent_code:
+        wilayah_tree.rebuild(instance._state.db)
+    instance._parent_code = instance.parent_code
+    bump_generation('wilayah')
+
+
+@receiver(post_delete, sender=Wilayah)
+def wilayah_deleted(sender, **kwargs):
+    if not wilayah_tree.bulk_loading():
+        bump_generation('wilayah')
@@ -0,0 +1,154 @@
+"""
+Pencarian judul proposal/skripsi yang mirip.
+
+Di PostgreSQL memakai indeks GiST pg_trgm (migrasi 0022) atas
+Proposal.judul dan Mahasiswa.judul_skripsi: `judul <-> %s` diurutkan
+langsung dari indeks (KNN), sehingga top-k tidak membandingkan setiap judul
+lama. Indeks dirawat PostgreSQL sendiri pada setiap INSERT/UPDATE. Bila
+pg_trgm tidak tersedia (atau backend lain), kemiripan trigram yang sama
+dihitung di Python atas seluruh judul; jalur lambat itu hanya untuk
+endpoint admin, tidak untuk respons pengajuan (`indexed_only`).
+"""
+import heapq
+import re
+
+from django.contrib.postgres.search import TrigramDistance
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .models import Mahasiswa, Proposal
+from .wilayah_resolver import trigrams
+
+DEFAULT_LIMIT = 5
+MAX_LIMIT = 50
+# Sama dengan pg_trgm.similarity_threshold bawaan.
+MIN_SIMILARITY = 0.3
+
+PROPOSAL = 'proposal'
+SKRIPSI = 'skripsi'
+# Yang boleh dilihat mahasiswa pengaju: tanpa identitas dan status milik
+# mahasiswa lain. Rincian lengkap lewat endpoint admin proposals/similar/.
+PUBLIC_FIELDS = ('judul', 'similarity')
+
+_WORD = re.compile(r'[^\W_]+')
+_trgm_available = {}
+
+
+class SimilarTitleError(ValueError):
+    pass
+
+
+def title_trigrams(text):
+    """Trigram per kata seperti pg_trgm: huruf kecil, hanya alfanumerik, tiap kata diberi padding."""
+    grams = set()
+    for word in _WORD.findall(str(text or '').lower()):
+        grams |= trigrams(word)
+    return grams
+
+
+def similarity(a, b):
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def _has_trgm(using):
+    if using not in _trgm_available:
+        connection = connections[using]
+        if connection.vendor != 'postgresql':
+            _trgm_available[using] = False
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                _trgm_available[using] = cursor.fetchone() is not None
+    return _trgm_available[using]
+
+
+def _sources(exclude_proposal):
+    proposals = Proposal.objects.all()
+    if exclude_proposal is not None:
+        proposals = proposals.exclude(pk=exclude_proposal)
+    return [
+        (PROPOSAL, 'judul', proposals, ['pk', 'judul', 'mahasiswa_id', 'mahasiswa__nim',
+                                        'mahasiswa__nama_mahasiswa', 'status']),
+        (SKRIPSI, 'judul_skripsi', Mahasiswa.objects.exclude(judul_skripsi=''),
+         ['pk', 'judul_skripsi', 'id', 'nim', 'nama_mahasiswa']),
+    ]
+
+
+def _indexed(queryset, field, title, limit, fields):
+    rows = (
+        queryset.annotate(distance=TrigramDistance(field, title))
+        .order_by('distance')
+        .values_list('distance', *fields)[:limit]
+    )
+    return [(1 - distance, row) for distance, *row in rows]
+
+
+def _scanned(queryset, field, title, limit, fields):
+    wanted = title_trigrams(title)
+    scored = (
+        (similarity(wanted, title_trigrams(row[1])), row)
+        for row in queryset.values_list(*fields).iterator(chunk_size=5000)
+    )
+    return heapq.nlargest(limit, scored, key=lambda item: item[0])
+
+
+def find_similar(title, limit=DEFAULT_LIMIT, exclude_proposal=None, using=DEFAULT_DB_ALIAS, indexed_only=False):
+    """
+    Paling banyak `limit` judul proposal/skripsi dengan kemiripan trigram
+    >= MIN_SIMILARITY terhadap `title`, terurut dari yang paling mirip.
+    Judul skripsi yang sama persis dengan proposal milik mahasiswa yang sama
+    tidak dilaporkan dua kali; proposal berulang dari satu mahasiswa tetap
+    dilaporkan semuanya. Dengan `indexed_only`, None bila indeks pg_trgm
+    tidak tersedia (tanpa memindai seluruh judul).
+    """
+    title = str(title or '').strip()
+    if not title:
+        raise SimilarTitleError("judul wajib diisi")
+    if indexed_only and not _has_trgm(using):
+        return None
+    lookup = _indexed if _has_trgm(using) else _scanned
+
+    candidates = []
+    for source, field, queryset, fields in _sources(exclude_proposal):
+        for score, row in lookup(queryset.using(using), field, title, limit, fields):
+            if score >= MIN_SIMILARITY:
+                candidates.append((score, source, row))
+    candidates.sort(key=lambda item: (-item[0], item[1] != PROPOSAL))
+
+    results, proposed = [], set()
+    for score, source, (pk, judul, mahasiswa_id, nim, nama, *status) in candidates:
+        key = (mahasiswa_id, judul.strip().casefold())
+        if source == PROPOSAL:
+            proposed.add(key)
+        elif key in proposed:
+            continue
+        results.append({
+            'source': source,
+            'id': pk,
+            'judul': judul,
+            'nim': nim,
+            'nama_mahasiswa': nama,
+            'status': status[0] if status else None,
+            'similarity': round(score, 3),
+        })
+        if len(results) == limit:
+            break
+    return results
+
+
+def public(results):
+    """Hasil find_similar yang hanya memuat PUBLIC_FIELDS."""
+    return [{name: result[name] for name in PUBLIC_FIELDS} for result in results]
+
+
+def limit_param(params):
+    value = params.get('limit')
+    if value in (None, ''):
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise SimilarTitleError("limit harus berupa angka")
+    return max(1, min(limit, MAX_LIMIT))
@@ -0,0 +1,107 @@
+"""
+Sparse fieldset: `?fields=a,b` atau `?exclude=c` pada request baca.
+
+Serializer hanya membangun field yang diminta, dan queryset dipangkas
+mengikuti `source` field tersebut: join select_related yang tidak dipakai
+dibuang dan kolom dibatasi dengan only().
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def _split(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def requested_fields(request):
+    """(fields, exclude) dari query param, atau None bila tidak dipakai."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = getattr(request, 'query_params', request.GET)
+    fields, exclude = params.get('fields'), params.get('exclude')
+    if not fields and not exclude:
+        return None
+    return (_split(fields) if fields else None), (_split(exclude) if exclude else set())
+
+
+class SparseFieldsSerializerMixin:
+    """Batasi field ModelSerializer sesuai `fields`/`exclude` pada request."""
+
+    def get_field_names(self, declared_fields, info):
+        names = super().get_field_names(declared_fields, info)
+        root = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+        selection = requested_fields(self.context.get('request')) if root is None else None
+        if selection is None:
+            return names
+        fields, exclude = selection
+        return [name for name in names if (fields is None or name in fields) and name not in exclude]
+
+
+def _resolve(model, parts):
+    """Path ORM kolom konkret untuk `source_attrs`, beserta relasi yang dilalui."""
+    for index, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if index < len(parts) - 1:
+            if not (field.many_to_one or field.one_to_one):
+                return None
+            model = field.related_model
+            continue
+        if not field.concrete:
+            return None
+        return '__'.join(parts), '__'.join(parts[:-1]) or None
+    return None
+
+
+def prune_queryset(queryset, serializer, method_sources=None):
+    """
+    Pangkas queryset ke kolom dan join yang dipakai field serializer.
+
+    Field yang sumbernya tidak bisa dipetakan ke kolom (property, method
+    tanpa entri di `method_sources`) membuat queryset dikembalikan utuh.
+    """
+    method_sources = method_sources or {}
+    paths, related = set(), set()
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in method_sources:
+            sources = [source.split('__') for source in method_sources[name]]
+        elif field.source == '*':
+            return queryset
+        else:
+            sources = [field.source_attrs]
+        for parts in sources:
+            resolved = _resolve(queryset.model, parts)
+            if resolved is None:
+                return queryset
+            path, relation = resolved
+            paths.add(path)
+            if relation:
+                related.add(relation)
+    return queryset.select_related(None).select_related(*sorted(related)).only(*sorted(paths))
+
+
+class SparseFieldsViewMixin:
+    """
+    Terapkan sparse fieldset pada queryset ViewSet. Untuk SerializerMethodField,
+    kolom yang dibaca method didaftarkan di `sparse_method_sources`.
+    """
+
+    sparse_method_sources = {}
+
+    def sparse_field_names(self):
+        """Nama field keluaran setelah `fields`/`exclude`, atau None bila tidak dipakai."""
+        if requested_fields(self.request) is None:
+            return None
+        return frozenset(self.get_serializer().fields)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if requested_fields(self.request) is None:
+            return queryset
+        return prune_queryset(queryset, self.get_serializer(), self.sparse_method_sources)
@@ -1,3 +1,620 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import ResolverMatch
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from . import (
+    analytics, async_views, batch, catalog, db_router, imports, middleware, projections, query_plans, response_cache,
+    throttling, typeahead,
+)
+from .models import (
+    AnalyticsDirty, Dosen, ImportFile, ImportRowHash, KonsentrasiUtama, Mahasiswa, Prodi, Proposal, StudentRollup, User,
+    Wilayah,
+)
+from .serializers import DosenSerializer, MahasiswaSerializer
+from .views import ProdiViewSet
+
+# Dependensi berat yang hanya boleh dimuat saat dipakai (upload, ekstraksi teks).
+LAZY_MODULES = ('pandas', 'numpy', 'openpyxl', 'pypdf')
+IMPORT_BUDGET_MS = int(os.getenv('API_VIEWS_IMPORT_BUDGET_MS', '250'))
+LOCMEM_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'tests-{alias}'}
+    for alias in ('default', 'throttle')
+}
+
+
+def fake_replica():
+    """Alias replica fiktif (untuk router dan middleware): query yang sampai ke sana gagal."""
+    replicas = mock.Mock(return_value=['replica'])
+    return mock.patch.multiple(db_router, replica_aliases=replicas), mock.patch.multiple(
+        middleware, replica_aliases=replicas
+    )
+
+
+@contextmanager
+def fake_replica_reads():
+    """Baca diarahkan ke alias replica fiktif, seperti request GET yang tidak di-pin."""
+    router_patch, middleware_patch = fake_replica()
+    with router_patch, middleware_patch:
+        token = db_router.use_replicas(True)
+        try:
+            yield
+        finally:
+            db_router.reset_replicas(token)
+
+
+class ImportBudgetTests(SimpleTestCase):
+    """`import api.views` di proses baru: tanpa dependensi berat dan di bawah anggaran waktu."""
+
+    def run_import(self):
+        code = (
+            "import sys, django; django.setup(); import api.views; "
+            f"print(','.join(name for name in {LAZY_MODULES!r} if name in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=settings.BASE_DIR, env=os.environ.copy(), capture_output=True, text=True, timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        return result.stdout.strip(), result.stderr
+
+    def test_heavy_dependencies_are_lazy(self):
+        loaded, _ = self.run_import()
+        self.assertEqual(loaded, '', f"api.views memuat dependensi berat saat import: {loaded}")
+
+    def test_import_time_budget(self):
+        _, importtime = self.run_import()
+        match = re.search(r'^import time:\s+\d+ \|\s+(\d+) \|\s+api\.views$', importtime, re.MULTILINE)
+        self.assertIsNotNone(match, "api.views tidak ada di output -X importtime")
+        cumulative_ms = int(match.group(1)) / 1000
+        self.assertLessEqual(
+            cumulative_ms, IMPORT_BUDGET_MS,
+            f"import api.views {cumulative_ms:.0f} ms melebihi anggaran {IMPORT_BUDGET_MS} ms",
+        )
+
+
+def upload_frame(csv):
+    """DataFrame seperti yang dibaca endpoint upload mode=fast dari file CSV."""
+    return imports.read_upload(SimpleUploadedFile('data.csv', csv.encode()), dtype=str)
+
+
+MAHASISWA_CSV = (
+    "nim,nama_mahasiswa,prodi,jk,tahun_masuk,tgl_lahir\n"
+    "001,Lama Diubah,IF,L,2019,2001-02-03\n"
+    "002,Baru,IF,P,2021,2003-04-05\n"
+    "003,Prodi Salah,XX,L,2021,2003-01-01\n"
+    "004,,IF,L,2021,2003-01-01\n"
+)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FastImportTests(TestCase):
+    """Impor set-based lewat tabel staging (COPY di PostgreSQL, INSERT per batch di SQLite)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Prodi.objects.create(code='IF', name='Informatika')
+        Mahasiswa.objects.create(
+            nim='001', nama_mahasiswa='Lama', tgl_lahir=datetime.date(2001, 2, 3), jk='L', tahun_masuk=2019,
+            prodi=Prodi.objects.get(code='IF'), user=User.objects.create(username='001'),
+        )
+        Dosen.objects.create(nidn='0401', kode_dosen='D1', nama_dosen='Dosen Satu', prodi=Prodi.objects.get(code='IF'))
+
+    def test_counts_and_rejects(self):
+        result = imports.fast_import(upload_frame(MAHASISWA_CSV), imports.UPLOAD_SPECS['mahasiswa'])
+        self.assertEqual(
+            result['counts'], {'total': 4, 'insert': 1, 'update': 1, 'unchanged': 0, 'delete': 0, 'reject': 2}
+        )
+        self.assertEqual(
+            [(reject['row'], reject['nim'], reject['error']) for reject in result['rejects']],
+            [(4, '003', "prodi 'XX' tidak ditemukan"), (5, '004', 'nama_mahasiswa kosong')],
+        )
+        self.assertEqual(Mahasiswa.objects.get(nim='001').nama_mahasiswa, 'Lama Diubah')
+        self.assertFalse(Mahasiswa.objects.filter(nim__in=['003', '004']).exists())
+
+    def test_creates_users_for_new_mahasiswa(self):
+        existing_user = Mahasiswa.objects.get(nim='001').user_id
+        imports.fast_import(upload_frame(MAHASISWA_CSV), imports.UPLOAD_SPECS['mahasiswa'])
+        baru = Mahasiswa.objects.select_related('user').get(nim='002')
+        self.assertEqual(baru.user.username, '002')
+        self.assertFalse(baru.user.has_usable_password())
+        self.assertEqual(Mahasiswa.objects.get(nim='001').user_id, existing_user)
+        self.assertFalse(User.objects.filter(username__in=['003', '004']).exists())
+
+    def test_unchanged_rows_are_not_written(self):
+        spec = imports.UPLOAD_SPECS['dosen']
+        csv = "nidn,kode_dosen,nama_dosen,prodi\n0401,D1,Dosen Satu,IF\n"
+        before = Dosen.objects.get(nidn='0401').updated_at
+        # Tanpa hash baris (impor pertama), baris dibandingkan di SQL: ON CONFLICT ... WHERE berubah.
+        result = imports.fast_import(upload_frame(csv), spec)
+        self.assertEqual(result['counts']['unchanged'], 1)
+        self.assertEqual(Dosen.objects.get(nidn='0401').updated_at, before)
+
+        result = imports.fast_import(upload_frame(csv.replace('Dosen Satu', '"Dosen Satu, M.Kom"')), spec)
+        self.assertEqual(result['counts']['update'], 1)
+        # CURRENT_TIMESTAMP PostgreSQL adalah awal transaksi pembungkus tes, bisa lebih awal dari `before`.
+        self.assertNotEqual(Dosen.objects.get(nidn='0401').updated_at, before)
+
+    def test_file_without_required_column_updates_existing_rows(self):
+        # tgl_lahir NOT NULL tanpa default: baris baru ditolak, baris lama tetap diperbarui.
+        result = imports.fast_import(
+            upload_frame("nim,nama_mahasiswa,prodi\n001,Tanpa Tanggal,IF\n009,Baru,IF\n"),
+            imports.UPLOAD_SPECS['mahasiswa'],
+        )
+        self.assertEqual((result['counts']['update'], result['counts']['reject']), (1, 1))
+        self.assertEqual(result['rejects'][0]['error'], 'tgl_lahir wajib diisi untuk data baru')
+        self.assertEqual(Mahasiswa.objects.get(nim='001').tgl_lahir, datetime.date(2001, 2, 3))
+
+    def test_dosen_unique_kode_dosen(self):
+        csv = (
+            "nidn,kode_dosen,nama_dosen,prodi\n"
+            "0402,D1,Kode Terpakai,IF\n"
+            "0403,D3,Kode Ganda,IF\n"
+            "0404,D3,Kode Ganda Terakhir,IF\n"
+        )
+        result = imports.fast_import(upload_frame(csv), imports.UPLOAD_SPECS['dosen'])
+        self.assertEqual(result['counts']['insert'], 1)
+        self.assertEqual(
+            [(reject['nidn'], reject['error']) for reject in result['rejects']],
+            [('0402', 'kode_dosen sudah dipakai data lain'), ('0403', 'kode_dosen duplikat di dalam file')],
+        )
+        self.assertEqual(Dosen.objects.get(kode_dosen='D3').nidn, '0404')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class IncrementalImportTests(TestCase):
+    """Digest file dan hash baris: file/baris yang tidak berubah tidak diproses ulang."""
+
+    CSV = (
+        "nim,nama_mahasiswa,prodi,jk,tahun_masuk,tgl_lahir\n"
+        "001,Satu,IF,L,2019,2001-02-03\n"
+        "002,Dua,IF,P,2021,2003-04-05\n"
+    )
+    spec = imports.UPLOAD_SPECS['mahasiswa']
+
+    @classmethod
+    def setUpTestData(cls):
+        Prodi.objects.create(code='IF', name='Informatika')
+
+    def run_import(self, csv=None, **kwargs):
+        return imports.fast_import(upload_frame(csv or self.CSV), self.spec, **kwargs)
+
+    def hashed(self):
+        return set(ImportRowHash.objects.filter(kind='mahasiswa').values_list('key', flat=True))
+
+    def test_identical_file_is_skipped(self):
+        self.assertIsNone(imports.previous_import(self.spec, 'digest-1'))
+        self.run_import(digest='digest-1')
+        self.assertTrue(imports.previous_import(self.spec, 'digest-1')['skipped'])
+        self.assertIsNone(imports.previous_import(self.spec, 'digest-2'))
+        # Snapshot penuh hanya dilewati bila impor terakhir juga snapshot penuh.
+        self.assertIsNone(imports.previous_import(self.spec, 'digest-1', snapshot=True))
+
+    def test_digest_recorded_only_without_rejects(self):
+        self.run_import(MAHASISWA_CSV, digest='digest-1')
+        self.assertIsNone(imports.previous_import(self.spec, 'digest-1'))
+        self.run_import(digest='digest-2')
+        self.run_import(MAHASISWA_CSV, digest='digest-1')
+        self.assertFalse(ImportFile.objects.filter(kind='mahasiswa').exists())
+
+    def test_unchanged_rows_pruned_from_staging(self):
+        self.assertEqual(self.run_import()['counts']['insert'], 2)
+        # Perubahan tanpa ORM (tanpa signal) tidak membatalkan hash, jadi baris
+        # yang sama di file tidak dibandingkan lagi.
+        Mahasiswa.objects.filter(nim='001').update(nama_mahasiswa='Diubah di luar impor')
+        result = self.run_import()
+        self.assertEqual(result['counts'], {'total': 2, 'insert': 0, 'update': 0, 'unchanged': 2, 'delete': 0, 'reject': 0})
+        self.assertEqual(Mahasiswa.objects.get(nim='001').nama_mahasiswa, 'Diubah di luar impor')
+
+    def test_orm_edit_invalidates_hash(self):
+        self.run_import(digest='digest-1')
+        mahasiswa = Mahasiswa.objects.get(nim='001')
+        mahasiswa.nama_mahasiswa = 'Diubah admin'
+        mahasiswa.save()
+        self.assertEqual(self.hashed(), {'002'})
+        self.assertIsNone(imports.previous_import(self.spec, 'digest-1'))
+        self.assertEqual(self.run_import(digest='digest-1')['counts']['update'], 1)
+        self.assertEqual(Mahasiswa.objects.get(nim='001').nama_mahasiswa, 'Satu')
+
+    def test_relation_code_change_invalidates_referencing_rows(self):
+        self.run_import()
+        other = Prodi.objects.create(code='SI', name='Sistem Informasi')
+        Mahasiswa.objects.filter(nim='002').update(prodi=other)
+        ImportRowHash.objects.create(kind='mahasiswa', key='lain', digest='x')
+
+        prodi = Prodi.objects.get(code='IF')
+        prodi.name = 'Teknik Informatika'
+        prodi.save()
+        self.assertEqual(self.hashed(), {'001', '002', 'lain'})
+
+        prodi.code = 'TI'
+        prodi.save()
+        self.assertEqual(self.hashed(), {'002', 'lain'})
+        other.delete()
+        self.assertEqual(self.hashed(), {'lain'})
+
+    def test_snapshot_deletes_missing_rows(self):
+        self.run_import()
+        result = self.run_import("nim,nama_mahasiswa,prodi\n002,Dua,IF\n", snapshot=True)
+        self.assertEqual(result['counts']['delete'], 1)
+        self.assertEqual(list(Mahasiswa.objects.values_list('nim', flat=True)), ['002'])
+        with self.assertRaises(imports.UploadError):
+            self.run_import("nim,nama_mahasiswa,prodi\n", snapshot=True)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ThrottleTests(TestCase):
+    """Throttle login per username: 10/menit, 429 dengan Retry-After, penolakan tercatat di metrics."""
+
+    # Detik ke-15 dalam jendela satu menit.
+    NOW = 60 * 29_000_000 + 15
+
+    def setUp(self):
+        for alias in LOCMEM_CACHES:
+            caches[alias].clear()
+        self.client = APIClient()
+
+    def login(self, username):
+        return self.client.post('/api/auth/login/', {'username': username, 'password': 'salah'}, format='json')
+
+    def test_login_username_throttle(self):
+        limit, _ = throttling.parse_rate(settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']['login_username'])
+        with mock.patch.object(throttling.time, 'time', return_value=self.NOW):
+            for _ in range(limit):
+                self.assertEqual(self.login('korban').status_code, 400)
+            response = self.login('korban')
+            self.assertEqual(response.status_code, 429)
+            # Jendela ini sudah penuh: tunggu sisa jendela (45 detik).
+            self.assertEqual(response['Retry-After'], '45')
+            # Username lain dari IP yang sama belum mencapai batas IP.
+            self.assertEqual(self.login('lain').status_code, 400)
+
+        self.client.force_authenticate(User.objects.create_superuser('admin-metrics', 'a@example.com', 'x'))
+        rejections = self.client.get('/api/metrics/').data['throttle_rejections']
+        self.assertEqual(rejections['login_username'], 1)
+        self.assertEqual(rejections['login'], 0)
+
+    def test_previous_window_is_weighted(self):
+        limit, duration = 10, 60
+        throttle = throttling.LoginUsernameThrottle()
+        request = Request(
+            APIRequestFactory().post('/', {'username': 'korban'}, format='json'), parsers=[JSONParser()]
+        )
+        with mock.patch.object(throttling.time, 'time', return_value=self.NOW - duration):
+            for _ in range(limit):
+                self.assertTrue(throttle.allow_request(request, None))
+        # 15 detik ke jendela berikutnya, 3/4 jendela sebelumnya masih dihitung:
+        # tiga request lolos (7.5 + 2 < 10), yang keempat menunggu porsi itu
+        # menyusut di bawah 7 (lebih dari 3 detik lagi).
+        with mock.patch.object(throttling.time, 'time', return_value=self.NOW):
+            for _ in range(3):
+                self.assertTrue(throttle.allow_request(request, None))
+            self.assertFalse(throttle.allow_request(request, None))
+        self.assertEqual(throttle.wait(), 4)
+
+
+class CompressionTests(SimpleTestCase):
+    """Body terkompresi tetap utuh, dan panjangnya diacak (mitigasi BREACH)."""
+
+    BODY = json.dumps([{'token': 'rahasia', 'nama': f'Mahasiswa {i}'} for i in range(200)]).encode()
+
+    def compressed(self, encoding):
+        response = middleware.CompressionMiddleware(
+            lambda request: HttpResponse(self.BODY, content_type='application/json')
+        )(RequestFactory().get('/', HTTP_ACCEPT_ENCODING=encoding))
+        self.assertEqual(response['Content-Encoding'], encoding)
+        return response.content
+
+    def assertPaddedRoundTrip(self, encoding, decompress):
+        bodies = [self.compressed(encoding) for _ in range(20)]
+        for body in bodies:
+            self.assertEqual(decompress(body), self.BODY)
+        self.assertGreater(len({len(body) for body in bodies}), 1)
+
+    def test_gzip(self):
+        self.assertPaddedRoundTrip('gzip', gzip.decompress)
+
+    @skipUnless(middleware.brotli, "brotli tidak terpasang")
+    def test_brotli(self):
+        self.assertPaddedRoundTrip('br', middleware.brotli.decompress)
+
+
+class ProjectionTests(TestCase):
+    """Jalur baca api/projections.py harus identik dengan serializer-nya."""
+
+    QUERIES = ['', 'fields=nim,prodi_nama,judul_skripsi', 'fields=nidn,konsentrasi_nama,tgl_lahir', 'exclude=prodi_id']
+
+    @classmethod
+    def setUpTestData(cls):
+        prodi = Prodi.objects.create(code='IF', name='Informatika')
+        konsentrasi = KonsentrasiUtama.objects.create(code='IF-AI', name='Kecerdasan Buatan', prodi=prodi)
+        wilayah = Wilayah.objects.create(code='32', name='Jawa Barat', level=1)
+
+        lengkap = Mahasiswa.objects.create(
+            nim='001', nama_mahasiswa='Lengkap', alamat='Bandung', tempat_lahir=wilayah,
+            tgl_lahir=datetime.date(2001, 2, 3), jk='L', tahun_masuk=2019, prodi=prodi,
+            konsentrasi=konsentrasi, judul_skripsi='Judul awal', user=User.objects.create(username='m001'),
+        )
+        Proposal.objects.create(mahasiswa=lengkap, judul='Ditolak', status='rejected')
+        Proposal.objects.create(mahasiswa=lengkap, judul='Disetujui pertama', status='approved')
+        Proposal.objects.create(mahasiswa=lengkap, judul='Disetujui kedua', status='approved')
+        Mahasiswa.objects.create(
+            nim='002', nama_mahasiswa='Tanpa relasi', tgl_lahir=datetime.date(2000, 1, 1), jk='P',
+            tahun_masuk=2020, user=User.objects.create(username='m002'),
+        )
+        Mahasiswa.objects.create(
+            nim='003', nama_mahasiswa='Judul sendiri', tgl_lahir=datetime.date(2002, 5, 6), jk='L',
+            tahun_masuk=2021, prodi=prodi, judul_skripsi='Judul mandiri', user=User.objects.create(username='m003'),
+        )
+
+        Dosen.objects.create(
+            nidn='0401', nip='1980', kode_dosen='D1', nama_dosen='Dosen Lengkap', gelar_depan='Dr.',
+            gelar_belakang='M.Kom.', tempat_lahir=wilayah, tgl_lahir=datetime.date(1980, 4, 1),
+            prodi=prodi, konsentrasi=konsentrasi, jabatan_fungsional='Lektor',
+        )
+        Dosen.objects.create(nidn='0402', kode_dosen='D2', nama_dosen='Dosen Tanpa Relasi')
+
+    def assertMatchesSerializer(self, projection, serializer_class, queryset):
+        for query in self.QUERIES:
+            with self.subTest(model=queryset.model.__name__, query=query):
+                request = Request(APIRequestFactory().get(f'/?{query}'))
+                context = {'request': request}
+                keys = frozenset(serializer_class(context=context).fields) if query else None
+                expected = json.loads(json.dumps(serializer_class(queryset, many=True, context=context).data))
+                self.assertEqual(projection.rows(queryset, keys), expected)
+
+    def test_mahasiswa_matches_serializer(self):
+        self.assertMatchesSerializer(projections.MAHASISWA, MahasiswaSerializer, Mahasiswa.objects.order_by('pk'))
+
+    def test_dosen_matches_serializer(self):
+        self.assertMatchesSerializer(projections.DOSEN, DosenSerializer, Dosen.objects.order_by('pk'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES, REPLICA_PIN_SECONDS=5)
+class ReplicaPinningTests(SimpleTestCase):
+    """Keputusan routing ReplicaPinningMiddleware: replica untuk baca, primary untuk tulis dan klien yang di-pin."""
+
+    def setUp(self):
+        for alias in LOCMEM_CACHES:
+            caches[alias].clear()
+        for patcher in fake_replica():
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def routed(self, method, path='/api/prodis/', data=None, **extra):
+        """(alias baca selama request, respons) lewat middleware."""
+        seen = []
+
+        def view(request):
+            seen.append(db_router.PrimaryReplicaRouter().db_for_read(Prodi))
+            response = HttpResponse()
+            response.data = data
+            return response
+
+        request = getattr(RequestFactory(), method)(path, **extra)
+        response = middleware.ReplicaPinningMiddleware(view)(request)
+        return seen[0], response
+
+    def test_safe_methods_read_from_replica(self):
+        for method in ('get', 'head', 'options'):
+            with self.subTest(method=method):
+                alias, response = self.routed(method)
+                self.assertEqual(alias, 'replica')
+                self.assertNotIn(middleware.PIN_COOKIE, response.cookies)
+
+    def test_writes_use_primary_and_pin_client(self):
+        alias, response = self.routed('post', HTTP_AUTHORIZATION='Token lama')
+        self.assertEqual(alias, 'default')
+        self.assertEqual(response.cookies[middleware.PIN_COOKIE]['max-age'], 5)
+        self.assertTrue(response.cookies[middleware.PIN_COOKIE]['httponly'])
+        # Tanpa cookie: pin di cache per identitas klien.
+        self.assertEqual(self.routed('get', HTTP_AUTHORIZATION='Token lama')[0], 'default')
+        self.assertEqual(self.routed('get', HTTP_AUTHORIZATION='Token lain')[0], 'replica')
+
+    def test_pin_cookie_keeps_reads_on_primary(self):
+        self.assertEqual(self.routed('get', HTTP_COOKIE=f'{middleware.PIN_COOKIE}=1')[0], 'default')
+
+    def test_issued_token_is_pinned(self):
+        self.routed('post', path='/api/auth/login/', data={'token': 'baru'})
+        self.assertEqual(self.routed('get', HTTP_AUTHORIZATION='Token baru')[0], 'default')
+
+    def test_batch_is_read_only(self):
+        alias, response = self.routed('post', path='/api/batch/')
+        self.assertEqual(alias, 'replica')
+        self.assertNotIn(middleware.PIN_COOKIE, response.cookies)
+
+    def test_async_path(self):
+        seen = []
+
+        async def view(request):
+            seen.append(db_router.PrimaryReplicaRouter().db_for_read(Prodi))
+            return HttpResponse()
+
+        pinning = middleware.ReplicaPinningMiddleware(view)
+        asyncio.run(pinning(RequestFactory().get('/api/prodis/')))
+        response = asyncio.run(pinning(RequestFactory().post('/api/prodis/')))
+        self.assertEqual(seen, ['replica', 'default'])
+        self.assertIn(middleware.PIN_COOKIE, response.cookies)
+
+
+class AnalyticsRefreshTests(TestCase):
+    """refresh_dirty dari endpoint GET tetap berjalan di primary walau request boleh membaca replica."""
+
+    @classmethod
+    def setUpTestData(cls):
+        prodi = Prodi.objects.create(code='IF', name='Informatika')
+        Mahasiswa.objects.create(
+            nim='001', nama_mahasiswa='Satu', tgl_lahir=datetime.date(2001, 1, 1), jk='L',
+            tahun_masuk=2020, prodi=prodi, user=User.objects.create(username='m001'),
+        )
+        AnalyticsDirty.objects.create(kind=analytics.STUDENTS, key=analytics.slice_key(prodi.pk, 2020, 'L'))
+
+    def test_refresh_ignores_replicas(self):
+        with fake_replica_reads():
+            self.assertEqual(db_router.PrimaryReplicaRouter().db_for_read(Mahasiswa), 'replica')
+            self.assertEqual(analytics.refresh_dirty(), 1)
+        self.assertFalse(AnalyticsDirty.objects.exists())
+        self.assertEqual(
+            list(StudentRollup.objects.values_list('tahun_masuk', 'jk', 'proposal_status', 'mahasiswa')),
+            [(2020, 'L', analytics.NO_PROPOSAL, 1)],
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CacheFillTests(TestCase):
+    """Cache bertag generasi diisi dari primary; hit/miss respons dihitung di cache throttle."""
+
+    @classmethod
+    def setUpTestData(cls):
+        prodi = Prodi.objects.create(code='IF', name='Informatika')
+        KonsentrasiUtama.objects.create(code='IF-AI', name='Kecerdasan Buatan', prodi=prodi)
+
+    def setUp(self):
+        for alias in LOCMEM_CACHES:
+            caches[alias].clear()
+
+    def list_prodi(self):
+        return ProdiViewSet.as_view({'get': 'list'})(APIRequestFactory().get('/api/prodis/'))
+
+    def test_fills_read_primary(self):
+        with fake_replica_reads():
+            self.assertEqual(catalog.get_catalog()['catalog'][0]['konsentrasi'][0]['code'], 'IF-AI')
+            self.assertEqual(len(typeahead.search('prodi', 'inf')), 1)
+            self.assertEqual(analytics.wilayah_distribution({})['rows'], [])
+            self.assertEqual(self.list_prodi().status_code, 200)
+
+    def test_hit_miss_counters(self):
+        self.list_prodi()
+        self.list_prodi()
+        self.assertEqual(
+            response_cache.stats()['ProdiViewSet'], {'hits': 1, 'misses': 1, 'hit_ratio': 0.5}
+        )
+
+
+async def async_view(request):
+    return async_views.json_response({'async': True})
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class BatchTests(TestCase):
+    """/api/batch/: batas body, penolakan batch bersarang, status per sub-request dan autentikasi yang dipakai ulang."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('batch-user', 'batch@example.com', 'x')
+
+    def setUp(self):
+        for alias in LOCMEM_CACHES:
+            caches[alias].clear()
+        self.client = APIClient()
+
+    def run_batch(self, requests, **extra):
+        return self.client.post('/api/batch/', {'requests': requests, **extra}, format='json')
+
+    def test_rejects_invalid_body(self):
+        for requests in (
+            [],
+            ['users/me/'] * (batch.MAX_REQUESTS + 1),
+            [{'path': 'users/me/', 'method': 'POST'}],
+            ['https://example.com/api/users/me/'],
+            [None],
+        ):
+            with self.subTest(requests=requests):
+                self.assertEqual(self.run_batch(requests).status_code, 400)
+        self.assertEqual(self.run_batch(['dashboard-stats/'] * batch.MAX_REQUESTS).status_code, 200)
+
+    def test_per_item_status(self):
+        self.client.force_authenticate(self.user)
+        response = self.run_batch(['users/me/', 'metrics/', 'tidak-ada/', 'batch/', '/api/users/me/'])
+        self.assertEqual(response.status_code, 200)
+        items = response.data['responses']
+        self.assertEqual([item['status'] for item in items], [200, 403, 404, 400, 200])
+        self.assertEqual(items[0]['body']['username'], 'batch-user')
+        self.assertEqual(items[3]['body'], {'error': 'Batch tidak boleh bersarang.'})
+
+    def test_anonymous_subrequest(self):
+        item = self.run_batch(['users/me/']).data['responses'][0]
+        self.assertEqual(item['status'], 401)
+
+    def test_token_checked_once(self):
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        with mock.patch.object(
+            TokenAuthentication, 'authenticate_credentials', autospec=True,
+            side_effect=TokenAuthentication.authenticate_credentials,
+        ) as check:
+            items = self.run_batch(['users/me/', 'users/me/permissions/']).data['responses']
+        self.assertEqual([item['status'] for item in items], [200, 200])
+        self.assertEqual(check.call_count, 1)
+
+    def test_parallel_keeps_order_and_runs_async_views_in_caller(self):
+        resolve = batch.resolve
+
+        def resolve_with_async(path):
+            if path == '/api/async/':
+                return ResolverMatch(async_view, (), {}, url_name='async')
+            return resolve(path)
+
+        self.client.force_authenticate(self.user)
+        with mock.patch.object(batch, 'resolve', side_effect=resolve_with_async), mock.patch.object(
+            batch, '_execute_in_thread', side_effect=batch._execute_in_thread
+        ) as pooled:
+            items = self.run_batch(
+                ['async/', 'metrics/', 'tidak-ada/', 'batch/', 'async/'], parallel=True
+            ).data['responses']
+        self.assertEqual([item['status'] for item in items], [200, 403, 404, 400, 200])
+        self.assertEqual([item['path'] for item in items][:2], ['/api/async/', '/api/metrics/'])
+        self.assertEqual(items[4]['body'], {'async': True})
+        self.assertEqual(
+            sorted(call.args[2] for call in pooled.call_args_list),
+            ['/api/batch/', '/api/metrics/', '/api/tidak-ada/'],
+        )
+
+    def test_db_slots_per_event_loop(self):
+        async def slots():
+            return async_views.db_slots()
+
+        self.assertIsNot(asyncio.run(slots()), asyncio.run(slots()))
+
+
+@skipUnless(connection.vendor == 'postgresql', "rencana query hanya diperiksa di PostgreSQL")
+class QueryPlanTests(TestCase):
+    """Regresi indeks: EXPLAIN setiap SELECT endpoint API pada data sintetis (lihat api/query_plans.py)."""
+
+    STUDENTS = 10000
+
+    @classmethod
+    def setUpTestData(cls):
+        media = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media, ignore_errors=True)
+        with override_settings(MEDIA_ROOT=media):
+            # generate_load_data juga menjalankan ANALYZE agar planner memakai statistik isi tabel.
+            call_command('generate_load_data', students=cls.STUDENTS, file_pool=2, stdout=io.StringIO())
+        cls.user = User.objects.create_superuser('plan-check', 'plan-check@example.com', 'x')
+
+    def test_endpoint_query_plans(self):
+        checked = query_plans.assert_query_plans(self.user)
+        self.assertGreater(checked, 0)
@@ -0,0 +1,201 @@
+"""
+Throttle sliding-window untuk endpoint mahal (login, registrasi, upload).
+
+Setiap kunci (scope + IP/user/username) memakai dua counter per jendela
+waktu di CACHES['throttle'], sehingga batas berlaku bersama untuk semua
+worker gunicorn. Perkiraan jumlah request dalam jendela geser adalah
+`sebelumnya * sisa_porsi + sekarang`; cukup satu baca dan satu add/incr per
+request, tanpa menyimpan riwayat timestamp seperti SimpleRateThrottle.
+Counter dinaikkan lebih dulu dan keputusan diambil dari nilai yang
+dikembalikan incr, sehingga dua request bersamaan tidak sama-sama lolos
+pemeriksaan sebelum salah satunya tercatat. Penolakan dicatat per scope dan
+ditampilkan di /api/metrics/.
+
+Batas diatur lewat REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] (mis.
+'login': '30/min'); scope tanpa rate tidak dibatasi. IP klien di balik
+reverse proxy diatur lewat REST_FRAMEWORK['NUM_PROXIES'].
+"""
+import fcntl
+import hashlib
+import math
+import os
+import time
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+_DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+THROTTLE_CACHE = 'throttle'
+
+
+def parse_rate(rate):
+    """'30/min' -> (30, 60); None bila rate kosong."""
+    if not rate:
+        return None
+    num, period = rate.split('/')
+    return int(num), _DURATIONS[period[0]]
+
+
+def _rejected_key(scope):
+    return f'throttle:rejected:{scope}'
+
+
+@contextmanager
+def _counter_lock(cache):
+    """
+    add/incr FileBasedCache berupa baca lalu tulis file; tanpa kunci, worker
+    yang bersamaan saling menimpa kenaikan dan hampir semua request lolos.
+    Backend lain (memcached, redis) sudah atomik.
+    """
+    if not isinstance(cache, FileBasedCache):
+        yield
+        return
+    os.makedirs(cache._dir, exist_ok=True)
+    with open(os.path.join(cache._dir, 'counters.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def increment(key, timeout, delta=1):
+    """Tambah counter `key` (dibuat bila belum ada) sebesar `delta` dan kembalikan nilai barunya."""
+    cache = caches[THROTTLE_CACHE]
+    with _counter_lock(cache):
+        if cache.add(key, delta, timeout=timeout):
+            return delta
+        try:
+            return cache.incr(key, delta)
+        except ValueError:
+            # Kedaluwarsa di antara add dan incr.
+            cache.set(key, delta, timeout=timeout)
+            return delta
+
+
+def record_rejection(scope):
+    increment(_rejected_key(scope), timeout=None)
+
+
+def stats():
+    """Jumlah request yang ditolak per scope, dijumlah dari semua worker."""
+    scopes = sorted({throttle.scope for throttle in _all_throttles()})
+    counts = caches[THROTTLE_CACHE].get_many([_rejected_key(scope) for scope in scopes])
+    return {scope: counts.get(_rejected_key(scope), 0) for scope in scopes}
+
+
+def _all_throttles(cls=None):
+    for subclass in (cls or SlidingWindowThrottle).__subclasses__():
+        if subclass.scope:
+            yield subclass
+        yield from _all_throttles(subclass)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    scope = None
+
+    def __init__(self):
+        self.rate = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(self.scope))
+        self.retry_after = None
+
+    def get_ident_key(self, request, view):
+        """Identitas yang dibatasi, atau None untuk melewati throttle."""
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+
+        limit, duration = self.rate
+        now = time.time()
+        window, elapsed = divmod(now, duration)
+        key = f'throttle:{self.scope}:{ident}'
+        current_key, previous_key = f'{key}:{int(window)}', f'{key}:{int(window) - 1}'
+        cache = caches[THROTTLE_CACHE]
+        previous = cache.get(previous_key, 0)
+        # Jumlah sebelum request ini, dari nilai incr (bukan baca terpisah).
+        current = increment(current_key, timeout=2 * duration) - 1
+
+        if previous * (1 - elapsed / duration) + current >= limit:
+            # Request yang ditolak tidak memakan kuota jendela ini.
+            increment(current_key, timeout=2 * duration, delta=-1)
+            self.retry_after = self._retry_after(limit, duration, elapsed, current, previous)
+            record_rejection(self.scope)
+            return False
+        return True
+
+    @staticmethod
+    def _retry_after(limit, duration, elapsed, current, previous):
+        if current < limit:
+            # Masih di jendela ini: tunggu porsi jendela sebelumnya menyusut.
+            wait = duration * (1 - (limit - current) / previous) - elapsed
+        else:
+            # Tunggu jendela berikutnya, lalu porsi jendela ini menyusut.
+            wait = (duration - elapsed) + duration * (1 - limit / current)
+        return max(1, math.ceil(wait))
+
+    def wait(self):
+        return self.retry_after
+
+
+class IPThrottle(SlidingWindowThrottle):
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UserThrottle(SlidingWindowThrottle):
+    """Per user yang login; request anonim dibatasi per IP."""
+
+    def get_ident_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f'user-{request.user.pk}'
+        return self.get_ident(request)
+
+
+class LoginThrottle(IPThrottle):
+    scope = 'login'
+
+
+class LoginUsernameThrottle(SlidingWindowThrottle):
+    """Per username yang dicoba, agar satu akun tidak ditebak dari banyak IP."""
+
+    scope = 'login_username'
+
+    def get_ident_key(self, request, view):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not username:
+            return None
+        return hashlib.sha1(str(username).strip().lower().encode()).hexdigest()
+
+
+class RegisterThrottle(IPThrottle):
+    scope = 'register'
+
+
+class UploadThrottle(UserThrottle):
+    scope = 'upload'
+
+
+LOGIN = [LoginThrottle, LoginUsernameThrottle]
+REGISTER = [RegisterThrottle]
+UPLOAD = [UploadThrottle]
+
+
+class ActionThrottleMixin:
+    """
+    Terapkan `throttle_classes` dari @action(...) juga untuk route yang
+    dipetakan manual di urls.py (kwargs @action hanya dibaca oleh router).
+    """
+
+    def get_throttles(self):
+        handler = getattr(self, self.action, None) if getattr(self, 'action', None) else None
+        throttle_classes = getattr(handler, 'kwargs', {}).get('throttle_classes')
+        if throttle_classes is not None:
+            return [throttle() for throttle in throttle_classes]
+        return super().get_throttles()
@@ -0,0 +1,100 @@
+import unicodedata
+from bisect import bisect_left
+
+from .db_router import primary_reads
+from .generations import get_generation
+from .models import KonsentrasiUtama, Prodi
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Urutan peringkat hasil: makin kecil makin relevan.
+RANK_EXACT_CODE = 0
+RANK_CODE_PREFIX = 1
+RANK_NAME_PREFIX = 2
+RANK_WORD_PREFIX = 3
+RANK_CONTAINS = 4
+
+
+def fold(text):
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    return ' '.join(''.join(ch for ch in text if not unicodedata.combining(ch)).casefold().split())
+
+
+class TypeaheadIndex:
+    """
+    Indeks prefiks terurut di memori untuk dropdown kode/nama.
+
+    Kode, nama lengkap, dan tiap kata pada nama disimpan sebagai kunci dalam
+    satu daftar terurut sehingga pencarian prefiks cukup dengan bisect.
+    Pencocokan "mengandung" hanya dipakai bila hasil prefiks belum memenuhi
+    limit.
+    """
+
+    def __init__(self, rows):
+        self.entries = []
+        self.folded = []
+        keys = []
+        for index, (pk, code, name) in enumerate(rows):
+            self.entries.append({'id': pk, 'code': code, 'name': name})
+            folded_code, folded_name = fold(code), fold(name)
+            self.folded.append((folded_code, folded_name))
+            keys.append((folded_code, RANK_CODE_PREFIX, index))
+            keys.append((folded_name, RANK_NAME_PREFIX, index))
+            for word in folded_name.split()[1:]:
+                keys.append((word, RANK_WORD_PREFIX, index))
+        keys.sort()
+        self.keys = [key for key, _, _ in keys]
+        self.refs = [(rank, index) for _, rank, index in keys]
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        query = fold(query)
+        if not query:
+            return self.entries[:limit]
+
+        ranks = {}
+        position = bisect_left(self.keys, query)
+        while position < len(self.keys) and self.keys[position].startswith(query):
+            rank, index = self.refs[position]
+            if rank == RANK_CODE_PREFIX and self.keys[position] == query:
+                rank = RANK_EXACT_CODE
+            ranks[index] = min(rank, ranks.get(index, RANK_CONTAINS))
+            position += 1
+
+        if len(ranks) < limit:
+            for index, (folded_code, folded_name) in enumerate(self.folded):
+                if index not in ranks and (query in folded_code or query in folded_name):
+                    ranks[index] = RANK_CONTAINS
+
+        ordered = sorted(ranks, key=lambda index: (ranks[index], self.folded[index][1], index))
+        return [self.entries[index] for index in ordered[:limit]]
+
+
+SOURCES = {
+    'prodi': lambda: Prodi.objects.values_list('id', 'code', 'name'),
+    'konsentrasi': lambda: KonsentrasiUtama.objects.order_by('name').values_list('id', 'code', 'name'),
+}
+
+_indexes = {}
+
+
+def get_index(name):
+    """Indeks per proses, dibangun ulang (dari primary) bila generasi data `name` berubah."""
+    generation = get_generation(name)
+    cached = _indexes.get(name)
+    if cached is None or cached[0] != generation:
+        with primary_reads():
+            cached = (generation, TypeaheadIndex(SOURCES[name]()))
+        _indexes[name] = cached
+    return cached[1]
+
+
+def parse_limit(value):
+    try:
+        return max(1, min(int(value), MAX_LIMIT))
+    except (TypeError, ValueError):
+        return DEFAULT_LIMIT
+
+
+def search(name, query, limit=None):
+    return get_index(name).search(query, parse_limit(limit))
@@ -1,15 +1,16 @@
+from django.conf import settings
 from django.urls import path
-from rest_framework.authtoken import views as auth_views
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     
-    path('auth/login/', auth_views.obtain_auth_token, name='login'),
+    path('auth/login/', views.ObtainAuthTokenView.as_view(), name='login'),
     path('auth/register/', views.RegisterView.as_view(), name='register'),
     
     path('users/', views.UserListView.as_view(), name='user-list'),
     path('users/<int:pk>/', views.UserDetailView.as_view(), name='user-detail'),
     path('users/me/', views.me, name='user-me'),
+    path('users/me/permissions/', views.my_permissions, name='user-me-permissions'),
         
     path('divisions/', views.DivisionListView.as_view(), name='division-list'),
     path('divisions/<int:pk>/', views.DivisionDetailView.as_view(), name='division-detail'),    
@@ -50,6 +51,7 @@ urlpatterns = [
     path('proposals/<int:pk>/', views.ProposalViewSet.as_view({'get': 'retrieve', 'put': 'update', 'delete': 'destroy'}), name='proposal-detail'),
     path('proposals/<int:pk>/approve/', views.ProposalViewSet.as_view({'post': 'approve'}), name='proposal-approve'),
     path('proposals/<int:pk>/reject/', views.ProposalViewSet.as_view({'post': 'reject'}), name='proposal-reject'),
+    path('proposals/similar/', views.ProposalViewSet.as_view({'get': 'similar'}), name='proposal-similar'),
     
     path('bimbingan/', views.BimbinganViewSet.as_view({'get': 'list', 'post': 'create'}), name='bimbingan-list'),
     path('bimbingan/<int:pk>/', views.BimbinganViewSet.as_view({'get': 'retrieve', 'put': 'update', 'delete': 'destroy'}), name='bimbingan-detail'),
@@ -57,7 +59,24 @@ urlpatterns = [
     path('prodis/dropdown/', views.ProdiViewSet.as_view({'get': 'dropdown'}), name='prodi-dropdown'),
     path('konsentrasi-utama/dropdown/', views.KonsentrasiUtamaViewSet.as_view({'get': 'dropdown'}), name='konsentrasi-utama-dropdown'),        
     path('konsentrasi-utama/prodi/<int:prodi_id>/', views.konsentrasi_by_prodi, name='konsentrasi_by_prodi'),
+    path('catalog/', views.catalog, name='catalog'),
 
     path('register-mahasiswa/', views.RegisterMahasiswaView.as_view(), name='register-mahasiswa'),
     path('dashboard-stats/', views.dashboard_stats, name='dashboard_stats'),
-]
\ No newline at end of file
+    path('analytics/', views.analytics_summary, name='analytics-summary'),
+    path('analytics/supervisors/', views.analytics_supervisors, name='analytics-supervisors'),
+    path('stats/wilayah-distribution/', views.wilayah_distribution, name='wilayah-distribution'),
+    path('batch/', views.batch, name='batch'),
+    path('metrics/', views.metrics, name='metrics'),
+]
+
+if settings.ASYNC_READ_VIEWS:
+    # Didaftarkan lebih dulu agar menggantikan versi sync pada path yang sama.
+    urlpatterns = [
+        path('users/me/', async_views.me, name='user-me'),
+        path('wilayah/', async_views.wilayah_list, name='wilayah-list'),
+        path('wilayah/list/', async_views.wilayah_list, name='wilayah-list'),
+        path('prodis/dropdown/', async_views.prodi_dropdown, name='prodi-dropdown'),
+        path('konsentrasi-utama/dropdown/', async_views.konsentrasi_dropdown, name='konsentrasi-utama-dropdown'),
+        path('dashboard-stats/', async_views.dashboard_stats, name='dashboard_stats'),
+    ] + urlpatterns
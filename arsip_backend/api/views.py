@@ -1,21 +1,34 @@
-import pandas as pd
-from io import BytesIO
+import os
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from rest_framework import viewsets, generics, status, views, permissions, filters
+from rest_framework import viewsets, generics, serializers, status, views, permissions, filters
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.authtoken.models import Token
+from rest_framework.authtoken.views import ObtainAuthToken
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import Permission
 from .models import User, Division, Role, Wilayah, Religion, EducationLevel, KonsentrasiUtama, Prodi, Mahasiswa, Dosen, Proposal, Bimbingan
 from rest_framework import status
-from .serializers import (UserSerializer, DivisionSerializer, LoginSerializer, RegisterSerializer, RoleSerializer, PermissionSerializer,WilayahSerializer, EducationLevelSerializer, ReligionSerializer,KonsentrasiUtamaSerializer,ProdiSerializer, MahasiswaSerializer,DosenSerializer, ProposalSerializer, BimbinganSerializer, RegisterMahasiswaSerializer)
+from .serializers import (UserSerializer, MeSerializer, DivisionSerializer, LoginSerializer, RegisterSerializer, RoleSerializer, PermissionSerializer,WilayahSerializer, EducationLevelSerializer, ReligionSerializer,KonsentrasiUtamaSerializer,ProdiSerializer, MahasiswaSerializer,DosenSerializer, ProposalSerializer, BimbinganSerializer, RegisterMahasiswaSerializer)
 from .permissions import ( CanManageUsers, CanManageDivisions, CanViewAllArchives,CanEditOwnArchives, CanDeleteOwnArchives, CanUploadArchives,CanCrudEducations, CanCrudWilayah, CanCrudReligions, CanManageUsers, CanManageRoles, CanManageDivisions, CanUploadArchives, CanViewAllArchives,)
 from django.utils import timezone
 from .pagination import Pagination
-from django.db import IntegrityError
+from .imports import (
+    UPLOAD_SPECS, UploadError, check_dry_run, fast_import, import_summary, is_dry_run, is_fast_import,
+    is_full_snapshot, preview_upload, previous_import, read_upload, upload_digest,
+)
+from .wilayah_resolver import resolve_tempat_lahir
+from .db.pool import pool_stats
+from .permission_manifest import user_manifest
+from . import analytics, projections, proposal_text, similar_titles, throttling, typeahead
+from .response_cache import CachedResponseMixin, stats as response_cache_stats
+from .batch import BatchError, parse_paths, run_batch
+from .catalog import get_catalog
+from .renderers import FastJSONParser
+from .sparse_fields import SparseFieldsViewMixin
+from django.db import IntegrityError, transaction
 from rest_framework.pagination import PageNumberPagination
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
 from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
@@ -24,8 +37,12 @@ from django.contrib.auth import get_user_model
 from django_filters.rest_framework import DjangoFilterBackend
 
 User = get_user_model()
+class ObtainAuthTokenView(ObtainAuthToken):
+    throttle_classes = throttling.LOGIN
+
 class LoginView(views.APIView):    
     permission_classes = [permissions.AllowAny]
+    throttle_classes = throttling.LOGIN
     
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
@@ -74,6 +91,7 @@ class LoginView(views.APIView):
 
 class RegisterView(views.APIView):    
     permission_classes = [permissions.AllowAny]
+    throttle_classes = throttling.REGISTER
     
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
@@ -197,37 +215,40 @@ class EducationLevelDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = EducationLevelSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class ProdiViewSet(viewsets.ModelViewSet):
+class ProdiViewSet(CachedResponseMixin, throttling.ActionThrottleMixin, viewsets.ModelViewSet):
     queryset = Prodi.objects.all()
     serializer_class = ProdiSerializer
     permission_classes = [AllowAny]
     pagination_class = Pagination
+    cache_tags = ('prodi',)
 
     @action(detail=False, methods=['get'], url_path='dropdown')
     def dropdown(self, request):
-        print(" Dropdown called")
+        if 'q' in request.query_params or 'limit' in request.query_params:
+            return Response(typeahead.search('prodi', request.query_params.get('q'), request.query_params.get('limit')))
         prodis = Prodi.objects.all().values('id', 'name')
-        print(f"Found {len(prodis)} prodi")
         return Response(list(prodis))
 
-    @action(detail=False, methods=['post'], url_path='upload')
+    @action(detail=False, methods=['post'], url_path='upload', throttle_classes=throttling.UPLOAD)
     def upload(self, request):
         file = request.FILES.get('file')
         if not file:
             return Response({"error": "File wajib diunggah"}, status=status.HTTP_400_BAD_REQUEST)
 
+        dry_run = is_dry_run(request)
+        fast = is_fast_import(request)
+        snapshot = is_full_snapshot(request)
+        digest = upload_digest(file) if fast else None
+        if fast:
+            skipped = previous_import(UPLOAD_SPECS['prodi'], digest, snapshot)
+            if skipped:
+                return Response(import_summary(skipped))
+
         try:
-            ext = file.name.split('.')[-1].lower()
-            if ext == 'xlsx':
-                df = pd.read_excel(BytesIO(file.read()), engine='openpyxl')
-            elif ext == 'csv':
-                try:
-                    df = pd.read_csv(BytesIO(file.read()), encoding='utf-8-sig')
-                except UnicodeDecodeError:
-                    file.seek(0)
-                    df = pd.read_csv(BytesIO(file.read()), encoding='latin-1')
-            else:
-                return Response({"error": "Format file tidak didukung. Gunakan .xlsx atau .csv"}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                df = read_upload(file, dtype=str if dry_run or fast else None)
+            except UploadError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
             required_fields = {'code', 'name'}
             missing = required_fields - set(df.columns)
@@ -236,6 +257,14 @@ class ProdiViewSet(viewsets.ModelViewSet):
                     "error": f"Kolom wajib tidak ditemukan: {missing}. Kolom file: {list(df.columns)}"
                 }, status=status.HTTP_400_BAD_REQUEST)
 
+            if dry_run:
+                return Response(preview_upload(df, UPLOAD_SPECS['prodi']))
+
+            if fast:
+                return Response(import_summary(
+                    fast_import(df, UPLOAD_SPECS['prodi'], digest=digest, snapshot=snapshot)
+                ))
+
             created = updated = 0
             errors = []
 
@@ -268,11 +297,12 @@ class ProdiViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({"error": f"Error memproses file: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
 
-class KonsentrasiUtamaViewSet(viewsets.ModelViewSet):
+class KonsentrasiUtamaViewSet(CachedResponseMixin, throttling.ActionThrottleMixin, viewsets.ModelViewSet):
     queryset = KonsentrasiUtama.objects.select_related('prodi').all()
     serializer_class = KonsentrasiUtamaSerializer
     permission_classes = [AllowAny]
     pagination_class = Pagination
+    cache_tags = ('konsentrasi', 'prodi')
     
     def get_queryset(self):
         queryset = KonsentrasiUtama.objects.select_related('prodi').all()
@@ -284,31 +314,33 @@ class KonsentrasiUtamaViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='dropdown')
     def dropdown(self, request):
-        print("Dropdown called")
+        if 'q' in request.query_params or 'limit' in request.query_params:
+            return Response(typeahead.search('konsentrasi', request.query_params.get('q'), request.query_params.get('limit')))
         konsentrasis = KonsentrasiUtama.objects.all().values('id', 'name')
-        print(f"Found {len(konsentrasis)} konsentrasi")
         return Response([
             {'id': k['id'], 'name': k['name']} for k in konsentrasis
         ])            
     
-    @action(detail=False, methods=['post'], url_path='upload')
+    @action(detail=False, methods=['post'], url_path='upload', throttle_classes=throttling.UPLOAD)
     def upload(self, request):
         file = request.FILES.get('file')
         if not file:
             return Response({"error": "File wajib diunggah"}, status=status.HTTP_400_BAD_REQUEST)
 
+        dry_run = is_dry_run(request)
+        fast = is_fast_import(request)
+        snapshot = is_full_snapshot(request)
+        digest = upload_digest(file) if fast else None
+        if fast:
+            skipped = previous_import(UPLOAD_SPECS['konsentrasi'], digest, snapshot)
+            if skipped:
+                return Response(import_summary(skipped))
+
         try:
-            ext = file.name.split('.')[-1].lower()
-            if ext == 'xlsx':
-                df = pd.read_excel(BytesIO(file.read()), engine='openpyxl')
-            elif ext == 'csv':
-                try:
-                    df = pd.read_csv(BytesIO(file.read()), encoding='utf-8-sig')
-                except UnicodeDecodeError:
-                    file.seek(0)
-                    df = pd.read_csv(BytesIO(file.read()), encoding='latin-1')
-            else:
-                return Response({"error": "Format file tidak didukung. Gunakan .xlsx atau .csv"}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                df = read_upload(file, dtype=str if dry_run or fast else None)
+            except UploadError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
             required_fields = {'code', 'name'}
             missing = required_fields - set(df.columns)
@@ -317,6 +349,14 @@ class KonsentrasiUtamaViewSet(viewsets.ModelViewSet):
                     "error": f"Kolom wajib tidak ditemukan: {missing}. Kolom file: {list(df.columns)}"
                 }, status=status.HTTP_400_BAD_REQUEST)
 
+            if dry_run:
+                return Response(preview_upload(df, UPLOAD_SPECS['konsentrasi']))
+
+            if fast:
+                return Response(import_summary(
+                    fast_import(df, UPLOAD_SPECS['konsentrasi'], digest=digest, snapshot=snapshot)
+                ))
+
             created = updated = 0
             errors = []
 
@@ -354,7 +394,17 @@ def konsentrasi_by_prodi(request, prodi_id):
     konsentrasi_list = KonsentrasiUtama.objects.filter(prodi_id=prodi_id).values('id', 'name')
     return Response(list(konsentrasi_list))
 
-class MahasiswaViewSet(viewsets.ModelViewSet):
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def catalog(request):
+    """Seluruh pohon prodi -> konsentrasi dalam satu respons, dengan ETag."""
+    cached = get_catalog()
+    headers = {'ETag': cached['etag'], 'Cache-Control': 'public, no-cache'}
+    if cached['etag'] in request.headers.get('If-None-Match', ''):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(cached['catalog'], headers=headers)
+
+class MahasiswaViewSet(throttling.ActionThrottleMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Mahasiswa.objects.select_related('tempat_lahir', 'prodi').prefetch_related('konsentrasi')
     serializer_class = MahasiswaSerializer
     permission_classes = [permissions.IsAuthenticated]        
@@ -364,6 +414,8 @@ class MahasiswaViewSet(viewsets.ModelViewSet):
         'tempat_lahir__name', 'judul_skripsi'
     ]
     filterset_fields = ['prodi', 'tahun_masuk', 'jk']
+    # get_judul_skripsi membaca judul_skripsi (dan proposal approved lewat query terpisah).
+    sparse_method_sources = {'judul_skripsi': ['judul_skripsi']}
 
     def get_queryset(self):
         queryset = Mahasiswa.objects.select_related('prodi', 'konsentrasi', 'tempat_lahir')
@@ -372,26 +424,40 @@ class MahasiswaViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(
                 Q(nim__icontains=search) | Q(nama_mahasiswa__icontains=search)
             )
+        within = self.request.query_params.get('within')
+        if within:
+            # Tempat lahir di wilayah ini atau di bawahnya (kode provinsi/kabupaten/...).
+            queryset = queryset.filter(tempat_lahir__in=Wilayah.objects.descendants_of(within))
         return queryset
 
-    @action(detail=False, methods=['post'], url_path='upload')
+    def list(self, request, *args, **kwargs):
+        return projections.MAHASISWA.list_response(
+            self, self.filter_queryset(self.get_queryset()), keys=self.sparse_field_names()
+        )
+
+    @action(detail=False, methods=['post'], url_path='upload', throttle_classes=throttling.UPLOAD)
     def upload(self, request):
+        import pandas as pd  # hanya dipakai jalur upload; lihat api/imports.py
         file = request.FILES.get('file')
         if not file:
             return Response({"error": "File wajib diunggah"}, status=status.HTTP_400_BAD_REQUEST)
 
+        dry_run = is_dry_run(request)
+        fast = is_fast_import(request)
+        snapshot = is_full_snapshot(request)
+        digest = upload_digest(file) if fast else None
+        if fast:
+            skipped = previous_import(UPLOAD_SPECS['mahasiswa'], digest, snapshot)
+            if skipped:
+                return Response(import_summary(skipped))
+
         try:
-            ext = file.name.split('.')[-1].lower()
-            if ext == 'xlsx':
-                df = pd.read_excel(BytesIO(file.read()), engine='openpyxl')
-            elif ext == 'csv':
-                try:
-                    df = pd.read_csv(BytesIO(file.read()), encoding='utf-8-sig')
-                except UnicodeDecodeError:
-                    file.seek(0)
-                    df = pd.read_csv(BytesIO(file.read()), encoding='latin-1')
-            else:
-                return Response({"error": "Format file tidak didukung. Gunakan .xlsx atau .csv"}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                if dry_run:
+                    check_dry_run(UPLOAD_SPECS['mahasiswa'], fast)
+                df = read_upload(file, dtype=str if dry_run or fast else None)
+            except UploadError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
             allowed_fields = {
                 'nim', 'nama_mahasiswa','alamat', 'tempat_lahir', 'tgl_lahir',
@@ -408,8 +474,19 @@ class MahasiswaViewSet(viewsets.ModelViewSet):
             valid_columns = [col for col in df.columns if col in allowed_fields]
             df = df[valid_columns]
 
+            if dry_run:
+                return Response(preview_upload(df, UPLOAD_SPECS['mahasiswa']))
+
+            if fast:
+                return Response(import_summary(
+                    fast_import(df, UPLOAD_SPECS['mahasiswa'], digest=digest, snapshot=snapshot)
+                ))
+
             created = 0
             errors = []
+            tempat_lahir_ids = {}
+            if 'tempat_lahir' in df.columns:
+                tempat_lahir_ids = resolve_tempat_lahir(df['tempat_lahir'].dropna())
 
             for idx, row in df.iterrows():
                 try:                    
@@ -436,12 +513,11 @@ class MahasiswaViewSet(viewsets.ModelViewSet):
                             errors.append(f"Baris {idx+2}: Konsentrasi '{kons_code}' tidak ditemukan")
                             continue
 
-                    tempat_lahir = None
+                    tempat_lahir_id = None
                     if 'tempat_lahir' in row and pd.notna(row['tempat_lahir']):
                         wilayah_code = str(row['tempat_lahir']).strip()
-                        try:
-                            tempat_lahir = Wilayah.objects.get(code=wilayah_code)
-                        except Wilayah.DoesNotExist:
+                        tempat_lahir_id = tempat_lahir_ids.get(wilayah_code)
+                        if tempat_lahir_id is None:
                             errors.append(f"Baris {idx+2}: Wilayah '{wilayah_code}' tidak ditemukan")
                             continue
                     
@@ -456,7 +532,7 @@ class MahasiswaViewSet(viewsets.ModelViewSet):
                     Mahasiswa.objects.create(
                         nim=nim,
                         nama_mahasiswa=nama,
-                        tempat_lahir=tempat_lahir,
+                        tempat_lahir_id=tempat_lahir_id,
                         tgl_lahir=tgl_lahir,
                         jk=str(row.get('jk', 'L'))[:1].upper() or 'L',
                         tahun_masuk=int(row['tahun_masuk']) if pd.notna(row.get('tahun_masuk')) else 0,
@@ -481,6 +557,7 @@ class MahasiswaViewSet(viewsets.ModelViewSet):
 
 class RegisterMahasiswaView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = throttling.REGISTER
 
     def post(self, request):
         serializer = RegisterMahasiswaSerializer(data=request.data)
@@ -542,11 +619,12 @@ class RegisterMahasiswaView(APIView):
             "division": user.division.name
         }, status=status.HTTP_201_CREATED)
 
-class DosenViewSet(viewsets.ModelViewSet):
+class DosenViewSet(CachedResponseMixin, throttling.ActionThrottleMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Dosen.objects.select_related('tempat_lahir', 'prodi', 'konsentrasi')
     serializer_class = DosenSerializer    
     pagination_class = Pagination
     permission_classes = [permissions.IsAuthenticated]        
+    cache_tags = ('dosen', 'prodi', 'konsentrasi', 'wilayah')
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
     search_fields = [
         'nama_dosen', 'prodi__name', 'konsentrasi__name',
@@ -561,26 +639,40 @@ class DosenViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(
                 Q(nidn__icontains=search) | Q(nama_dosen__icontains=search)
             )
+        within = self.request.query_params.get('within')
+        if within:
+            # Tempat lahir di wilayah ini atau di bawahnya (kode provinsi/kabupaten/...).
+            queryset = queryset.filter(tempat_lahir__in=Wilayah.objects.descendants_of(within))
         return queryset
+
+    def list(self, request, *args, **kwargs):
+        return projections.DOSEN.list_response(
+            self, self.filter_queryset(self.get_queryset()), keys=self.sparse_field_names()
+        )
     
-    @action(detail=False, methods=['post'], url_path='upload')
+    @action(detail=False, methods=['post'], url_path='upload', throttle_classes=throttling.UPLOAD)
     def upload(self, request):
+        import pandas as pd  # hanya dipakai jalur upload; lihat api/imports.py
         file = request.FILES.get('file')
         if not file:
             return Response({"error": "File wajib diunggah"}, status=status.HTTP_400_BAD_REQUEST)
 
+        dry_run = is_dry_run(request)
+        fast = is_fast_import(request)
+        snapshot = is_full_snapshot(request)
+        digest = upload_digest(file) if fast else None
+        if fast:
+            skipped = previous_import(UPLOAD_SPECS['dosen'], digest, snapshot)
+            if skipped:
+                return Response(import_summary(skipped))
+
         try:
-            ext = file.name.split('.')[-1].lower()
-            if ext == 'xlsx':
-                df = pd.read_excel(BytesIO(file.read()), engine='openpyxl')
-            elif ext == 'csv':
-                try:
-                    df = pd.read_csv(BytesIO(file.read()), encoding='utf-8-sig')
-                except UnicodeDecodeError:
-                    file.seek(0)
-                    df = pd.read_csv(BytesIO(file.read()), encoding='latin-1')
-            else:
-                return Response({"error": "Format file tidak didukung. Gunakan .xlsx atau .csv"}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                if dry_run:
+                    check_dry_run(UPLOAD_SPECS['dosen'], fast)
+                df = read_upload(file, dtype=str if dry_run or fast else None)
+            except UploadError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
             allowed_fields = {
                 'nidn', 'kode_dosen', 'nama_dosen', 'konsentrasi',
@@ -598,6 +690,14 @@ class DosenViewSet(viewsets.ModelViewSet):
             valid_columns = [col for col in df.columns if col in allowed_fields]
             df = df[valid_columns]
 
+            if dry_run:
+                return Response(preview_upload(df, UPLOAD_SPECS['dosen']))
+
+            if fast:
+                return Response(import_summary(
+                    fast_import(df, UPLOAD_SPECS['dosen'], digest=digest, snapshot=snapshot)
+                ))
+
             created = updated = 0
             errors = []
 
@@ -666,9 +766,9 @@ class DosenViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({"error": f"Error memproses file: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
 
-class ProposalViewSet(viewsets.ModelViewSet):
+class ProposalViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = ProposalSerializer
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, FastJSONParser]
 
     def get_queryset(self):     
         user = self.request.user
@@ -684,6 +784,30 @@ class ProposalViewSet(viewsets.ModelViewSet):
         except Mahasiswa.DoesNotExist:
             return Proposal.objects.none()
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        content = self.request.query_params.get('content')
+        if content:
+            queryset = proposal_text.search(queryset, content)
+        return queryset
+
+    def create(self, request, *args, **kwargs):
+        """
+        Respons pengajuan menyertakan judul lama yang mirip sebagai peringatan
+        bagi pengaju: hanya judul dan skor kemiripannya, tanpa nim, nama atau
+        status milik mahasiswa lain (admin memakai proposals/similar/). Hanya
+        lewat indeks pg_trgm; tanpa indeks, similar_titles tidak disertakan.
+        """
+        response = super().create(request, *args, **kwargs)
+        results = similar_titles.find_similar(
+            response.data['judul'], exclude_proposal=response.data['id'], indexed_only=True
+        )
+        if results is not None:
+            user = request.user
+            is_admin = hasattr(user, 'role') and user.role and user.role.name == 'Super Admin'
+            response.data['similar_titles'] = results if is_admin else similar_titles.public(results)
+        return response
+
     def perform_create(self, serializer):
         """Hanya mahasiswa yang bisa mengajukan proposal"""
         user = self.request.user
@@ -691,10 +815,21 @@ class ProposalViewSet(viewsets.ModelViewSet):
         # Pastikan user adalah mahasiswa
         try:
             mahasiswa = Mahasiswa.objects.get(user=user)
-            serializer.save(mahasiswa=mahasiswa)
         except Mahasiswa.DoesNotExist:
             raise serializers.ValidationError("Hanya mahasiswa yang dapat mengajukan proposal.")
 
+        try:
+            with transaction.atomic():
+                serializer.save(mahasiswa=mahasiswa)
+        except IntegrityError:
+            # Dua pengajuan bersamaan sama-sama lolos validate_mahasiswa; yang
+            # kalah ditolak constraint proposal_satu_pending_per_mahasiswa.
+            if not Proposal.objects.filter(mahasiswa=mahasiswa, status='pending').exists():
+                raise
+            raise serializers.ValidationError(
+                {'mahasiswa': ["Mahasiswa sudah memiliki proposal yang menunggu persetujuan."]}
+            )
+
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
         """Hanya admin yang bisa menyetujui proposal"""
@@ -746,10 +881,32 @@ class ProposalViewSet(viewsets.ModelViewSet):
             "message": "Proposal berhasil ditolak"
         }, status=status.HTTP_200_OK)
 
-class BimbinganViewSet(viewsets.ReadOnlyModelViewSet):
+    @action(detail=False, methods=['get'])
+    def similar(self, request):
+        """Top-k judul proposal/skripsi mirip: ?judul=... atau ?proposal=<id>, opsional &limit=."""
+        user = request.user
+        if not (hasattr(user, 'role') and user.role and user.role.name == 'Super Admin'):
+            return Response(
+                {"error": "Hanya admin yang dapat memeriksa kemiripan judul"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        judul, exclude = request.query_params.get('judul'), None
+        try:
+            if request.query_params.get('proposal'):
+                proposal = get_object_or_404(Proposal, pk=request.query_params['proposal'])
+                judul, exclude = proposal.judul, proposal.pk
+            limit = similar_titles.limit_param(request.query_params)
+            results = similar_titles.find_similar(judul, limit=limit, exclude_proposal=exclude)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'judul': judul, 'results': results})
+
+class BimbinganViewSet(CachedResponseMixin, SparseFieldsViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Bimbingan.objects.select_related('dosen', 'mahasiswa', 'proposal')
     serializer_class = BimbinganSerializer
     permission_classes = [permissions.  IsAuthenticated]
+    cache_tags = ('bimbingan', 'dosen', 'mahasiswa', 'proposal')
 
     def get_queryset(self):
         queryset = Bimbingan.objects.select_related('dosen', 'mahasiswa', 'proposal')
@@ -765,9 +922,20 @@ class BimbinganViewSet(viewsets.ReadOnlyModelViewSet):
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def me(request):
-    serializer = UserSerializer(request.user, context={'request': request})
+    serializer = MeSerializer(request.user, context={'request': request})
     return Response(serializer.data)
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def my_permissions(request):
+    """Manifest permission efektif user aktif, dengan ETag dari hash manifest."""
+    manifest = user_manifest(request.user)
+    etag = f'"{manifest["hash"]}"'
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if etag in request.headers.get('If-None-Match', ''):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(manifest, headers=headers)
+
 @api_view(['GET'])
 def wilayah_list(request):
     parent_code = request.query_params.get('parent')
@@ -786,4 +954,56 @@ def dashboard_stats(request):
         'religions': Religion.objects.count(),
         'wilayah': Wilayah.objects.count(),
         'education_levels': EducationLevel.objects.count(),
-    })
\ No newline at end of file
+    })
+
+@api_view(['GET'])
+def analytics_summary(request):
+    """Rekap mahasiswa/proposal per prodi x angkatan x jk x status proposal."""
+    analytics.refresh_dirty()
+    try:
+        return Response(analytics.student_summary(request.query_params))
+    except analytics.AnalyticsError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+def analytics_supervisors(request):
+    """Beban bimbingan per dosen."""
+    analytics.refresh_dirty()
+    try:
+        return Response(analytics.supervisor_summary(request.query_params))
+    except analytics.AnalyticsError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+def wilayah_distribution(request):
+    """Sebaran tempat lahir mahasiswa dan dosen per provinsi/kabupaten."""
+    try:
+        return Response(analytics.wilayah_distribution(request.query_params))
+    except analytics.AnalyticsError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def batch(request):
+    """
+    Jalankan beberapa GET sekaligus: {"requests": ["users/me/", "prodis/dropdown/"], "parallel": false}.
+    Izin diperiksa per sub-request oleh view tujuannya masing-masing.
+    """
+    base = request.path_info.rsplit('batch/', 1)[0]
+    try:
+        paths = parse_paths(request.data, base)
+    except BatchError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    parallel = isinstance(request.data, dict) and bool(request.data.get('parallel'))
+    return Response({'responses': run_batch(request, paths, parallel=parallel)})
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def metrics(request):
+    """Statistik runtime: pool koneksi database worker ini, penolakan throttle dan hit/miss cache respons (semua worker)."""
+    return Response({
+        'pid': os.getpid(),
+        'db_pool': pool_stats(),
+        'throttle_rejections': throttling.stats(),
+        'response_cache': response_cache_stats(),
+    })
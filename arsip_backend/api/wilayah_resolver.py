@@ -0,0 +1,177 @@
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+
+from .models import Wilayah
+
+Match = namedtuple('Match', ['raw', 'id', 'code', 'name', 'level', 'confidence', 'method'])
+
+MIN_CONFIDENCE = 0.75
+TRIGRAM_THRESHOLD = 0.6
+
+# Singkatan yang sering muncul pada data tempat lahir, diekspansi sebelum
+# prefiks administratif dibuang.
+ABBREVIATIONS = {
+    'kab': 'kabupaten',
+    'kb': 'kabupaten',
+    'adm': 'administrasi',
+    'prov': 'provinsi',
+    'propinsi': 'provinsi',
+    'kec': 'kecamatan',
+    'kel': 'kelurahan',
+    'ds': 'desa',
+    'jkt': 'jakarta',
+    'sel': 'selatan',
+    'ut': 'utara',
+    'bar': 'barat',
+    'tim': 'timur',
+    'teng': 'tengah',
+    'kep': 'kepulauan',
+}
+
+# Prefiks administratif beserta jenis wilayah yang ditunjukkannya.
+PREFIXES = [
+    ('kota administrasi', 'kota'),
+    ('kabupaten administrasi', 'kabupaten'),
+    ('daerah istimewa', 'provinsi'),
+    ('provinsi', 'provinsi'),
+    ('kabupaten', 'kabupaten'),
+    ('kota', 'kota'),
+    ('kecamatan', 'kecamatan'),
+    ('kelurahan', 'desa'),
+    ('desa', 'desa'),
+]
+
+LEVEL_KINDS = {1: 'provinsi', 3: 'kecamatan', 4: 'desa'}
+
+
+def normalize(name):
+    """Casefold, buang aksen/tanda baca dan ekspansi singkatan."""
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    text = re.sub(r'[^0-9a-z]+', ' ', text)
+    return ' '.join(ABBREVIATIONS.get(token, token) for token in text.split())
+
+
+def split_prefix(normalized):
+    """Pisahkan prefiks administratif, mis. 'kabupaten bandung' -> ('kabupaten', 'bandung')."""
+    for prefix, kind in PREFIXES:
+        if normalized.startswith(prefix + ' '):
+            return kind, normalized[len(prefix) + 1:]
+    return None, normalized
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class WilayahResolver:
+    """
+    Indeks nama wilayah di memori untuk mencocokkan teks bebas (mis.
+    `tempat_lahir` hasil impor) ke baris `Wilayah`.
+
+    Pencocokan dilakukan bertahap: nama lengkap ternormalisasi, nama inti
+    tanpa prefiks administratif, lalu kemiripan trigram sebagai cadangan.
+    """
+
+    def __init__(self, rows):
+        self.entries = []
+        self.by_full = defaultdict(list)
+        self.by_core = defaultdict(list)
+        self.by_trigram = defaultdict(set)
+
+        for wilayah_id, code, name, level in rows:
+            normalized = normalize(name)
+            kind, core = split_prefix(normalized)
+            if kind is None:
+                kind = LEVEL_KINDS.get(level)
+            entry = (wilayah_id, code, name, level, kind)
+            index = len(self.entries)
+            self.entries.append(entry)
+            self.by_full[normalized].append(index)
+            self.by_core[core].append(index)
+
+        self.gram_counts = {}
+        for core in self.by_core:
+            grams = trigrams(core)
+            self.gram_counts[core] = len(grams)
+            for gram in grams:
+                self.by_trigram[gram].add(core)
+
+    @classmethod
+    def build(cls, max_level=2):
+        rows = Wilayah.objects.filter(level__lte=max_level).values_list('id', 'code', 'name', 'level')
+        return cls(rows)
+
+    def _pick(self, raw, indexes, kind, confidence, method):
+        candidates = [self.entries[i] for i in indexes]
+        if kind is not None:
+            typed = [entry for entry in candidates if entry[4] == kind]
+            if typed:
+                candidates = typed
+            else:
+                confidence -= 0.1
+        # Nama sama di beberapa level (mis. kabupaten dan kecamatan): utamakan
+        # level teratas, dan turunkan skor bila masih ambigu.
+        candidates.sort(key=lambda entry: (entry[3], entry[1]))
+        if len(candidates) > 1 and candidates[0][3] == candidates[1][3]:
+            confidence -= 0.15
+        wilayah_id, code, name, level, _ = candidates[0]
+        return Match(raw, wilayah_id, code, name, level, round(confidence, 3), method)
+
+    def _trigram_candidates(self, core):
+        grams = trigrams(core)
+        overlap = defaultdict(int)
+        for gram in grams:
+            for candidate in self.by_trigram.get(gram, ()):
+                overlap[candidate] += 1
+        best, best_score = None, 0.0
+        for candidate, shared in sorted(overlap.items()):
+            score = 2 * shared / (len(grams) + self.gram_counts[candidate])
+            if score > best_score:
+                best, best_score = candidate, score
+        return best, best_score
+
+    def resolve(self, raw):
+        if raw is None or not str(raw).strip():
+            return None
+        normalized = normalize(raw)
+        kind, core = split_prefix(normalized)
+
+        if normalized in self.by_full:
+            return self._pick(raw, self.by_full[normalized], kind, 1.0, 'exact')
+        if core in self.by_core:
+            return self._pick(raw, self.by_core[core], kind, 0.95, 'name')
+
+        candidate, score = self._trigram_candidates(core)
+        if candidate is None or score < TRIGRAM_THRESHOLD:
+            return None
+        return self._pick(raw, self.by_core[candidate], kind, 0.9 * score, 'trigram')
+
+    def resolve_many(self, raw_names):
+        """Resolusi banyak nama sekaligus; nama yang sama hanya dihitung sekali."""
+        results = {}
+        for raw in raw_names:
+            if raw not in results:
+                results[raw] = self.resolve(raw)
+        return results
+
+
+def resolve_tempat_lahir(values, field='id', min_confidence=MIN_CONFIDENCE, resolver=None):
+    """
+    Petakan nilai kolom `tempat_lahir` hasil impor ke `Wilayah` (`id` atau `code`).
+
+    Nilai yang berupa kode wilayah dicocokkan langsung dengan satu query,
+    sisanya diperlakukan sebagai nama dan diresolusi lewat indeks nama.
+    Nilai yang tidak dapat dipetakan bernilai None.
+    """
+    values = {str(value).strip() for value in values if value is not None and str(value).strip()}
+    mapping = dict(Wilayah.objects.filter(code__in=values).values_list('code', field))
+
+    names = values - mapping.keys()
+    if names:
+        resolver = resolver or WilayahResolver.build()
+        for raw, match in resolver.resolve_many(names).items():
+            mapping[raw] = getattr(match, field) if match and match.confidence >= min_confidence else None
+    return mapping
@@ -0,0 +1,92 @@
+"""
+Tabel closure hierarki Wilayah.
+
+Setiap wilayah punya satu baris per leluhurnya (termasuk dirinya sendiri
+dengan depth 0), sehingga "semua wilayah di bawah provinsi 32" menjadi
+satu lookup berindeks pada ancestor_id, tanpa rekursi dan tanpa
+mencocokkan prefix kode. Induk dicari lewat parent_code.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from . import bulk
+from .generations import bump_generation
+from .models import Dosen, ImportFile, Mahasiswa, Wilayah, WilayahClosure
+
+# Kode wilayah paling banyak empat tingkat; batas ini hanya menjaga dari
+# parent_code yang membentuk siklus.
+MAX_DEPTH = 10
+
+# Selama bulk_load() signal Wilayah tidak merawat closure, generasi dan
+# digest impor per baris; semuanya dikerjakan sekali di akhir.
+_bulk_loading = ContextVar('wilayah_bulk_loading', default=False)
+
+
+def bulk_loading():
+    return _bulk_loading.get()
+
+
+@contextmanager
+def bulk_load(using=DEFAULT_DB_ALIAS):
+    """
+    Muat banyak wilayah sekaligus. Closure dibangun ulang sekali saat
+    keluar (juga bila pemuatan gagal di tengah, agar tidak ada wilayah
+    tanpa baris closure) dan jumlah barisnya diisi ke result['links'].
+    """
+    result = {'links': 0}
+    token = _bulk_loading.set(True)
+    try:
+        yield result
+    finally:
+        _bulk_loading.reset(token)
+        # Wilayah baru bisa membuat baris file mahasiswa/dosen yang tadinya
+        # ditolak menjadi valid (lihat api/signals.py).
+        ImportFile.objects.using(using).filter(
+            kind__in=[Mahasiswa._meta.model_name, Dosen._meta.model_name],
+        ).delete()
+        result['links'] = rebuild(using)
+
+
+def _links(nodes):
+    """Baris (ancestor_id, descendant_id, depth) dari daftar (id, code, parent_code)."""
+    ids = {code: pk for pk, code, _ in nodes}
+    parents = {code: parent for _, code, parent in nodes}
+    for pk, code, _ in nodes:
+        current, depth = code, 0
+        while current in ids and depth <= MAX_DEPTH:
+            yield ids[current], pk, depth
+            current, depth = parents[current], depth + 1
+
+
+def rebuild(using=DEFAULT_DB_ALIAS):
+    """Bangun ulang seluruh tabel closure dari parent_code. Mengembalikan jumlah baris."""
+    nodes = list(Wilayah.objects.using(using).values_list('id', 'code', 'parent_code'))
+    with transaction.atomic(using=using):
+        WilayahClosure.objects.using(using).all().delete()
+        count = bulk.copy_rows(WilayahClosure, ['ancestor_id', 'descendant_id', 'depth'], _links(nodes), using)
+    bulk.analyze(WilayahClosure, using=using)
+    bump_generation('wilayah')
+    return count
+
+
+def attach(wilayah):
+    """
+    Tambahkan baris closure untuk wilayah yang baru dibuat. Bila wilayah
+    lain sudah menunjuknya sebagai induk (dimuat lebih dulu), seluruh
+    tabel dibangun ulang.
+    """
+    using = wilayah._state.db or DEFAULT_DB_ALIAS
+    if Wilayah.objects.using(using).filter(parent_code=wilayah.code).exists():
+        rebuild(using)
+        return
+    links = [WilayahClosure(ancestor=wilayah, descendant=wilayah, depth=0)]
+    if wilayah.parent_code:
+        links += [
+            WilayahClosure(ancestor_id=ancestor, descendant=wilayah, depth=depth + 1)
+            for ancestor, depth in WilayahClosure.objects.using(using)
+            .filter(descendant__code=wilayah.parent_code)
+            .values_list('ancestor_id', 'depth')
+        ]
+    WilayahClosure.objects.using(using).bulk_create(links, ignore_conflicts=True)
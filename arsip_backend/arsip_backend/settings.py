@@ -55,7 +55,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'api.middleware.ReplicaPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -84,19 +86,78 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'arsip_backend.wsgi.application'
 
+# Aktifkan saat dijalankan di server ASGI (mis. uvicorn arsip_backend.asgi):
+# endpoint baca ringan dilayani view async di api/async_views.py.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
+# Batas request async yang memakai koneksi DB bersamaan per worker; kosong
+# berarti POOL_OPTIONS['MAX_SIZE'].
+ASYNC_DB_CONCURRENCY = int(os.getenv('ASYNC_DB_CONCURRENCY', '0')) or None
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Koneksi dipinjam dari pool per proses (api.db.pooled_postgresql); dengan
+# CONN_MAX_AGE = 0 koneksi dikembalikan ke pool di akhir setiap request.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'api.db.pooled_postgresql',
         'NAME': 'rekapdata_db',
         'USER': 'rekap_user',
         'PASSWORD': 'rekapdata',
         'HOST': 'localhost',
         'PORT': '5432',
+        'CONN_MAX_AGE': 0,
+        'POOL_OPTIONS': {
+            'MAX_SIZE': int(os.getenv('DB_POOL_SIZE', '10')),
+            'MAX_OVERFLOW': int(os.getenv('DB_POOL_MAX_OVERFLOW', '10')),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            'RECYCLE': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+            'HEALTH_CHECK_INTERVAL': int(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', '30')),
+        },
+    }
+}
+
+# Read replica (opsional): DB_REPLICA_HOSTS berisi host replica dipisah koma.
+# Request baca diarahkan ke replica oleh api.db_router.PrimaryReplicaRouter;
+# klien yang baru menulis di-pin ke primary selama REPLICA_PIN_SECONDS.
+# Setiap replica memakai pengaturan `default` apa adanya; hanya HOST yang
+# diganti, jadi replica harus server PostgreSQL dengan nama DB dan user sama.
+for index, host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['api.db_router.PrimaryReplicaRouter']
+
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+
+# Cache bersama antar worker (dipakai antara lain untuk penanda pin replica).
+# MAX_ENTRIES dinaikkan dari bawaan 300: cull membuang entri acak, termasuk
+# kunci generasi (api/generations.py).
+#
+# Counter api.throttling punya cache sendiri agar tidak ikut ter-cull oleh
+# banyaknya respons yang di-cache. Dengan FileBasedCache kenaikannya dikunci
+# flock, jadi hanya berlaku bersama untuk worker di satu host; untuk
+# beberapa host arahkan THROTTLE_CACHE_BACKEND/LOCATION ke memcached atau
+# redis, yang incr-nya atomik.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_DIR', os.path.join(BASE_DIR, '.cache')),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '50000')),
+        },
+    },
+    'throttle': {
+        'BACKEND': os.getenv('THROTTLE_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('THROTTLE_CACHE_LOCATION', os.path.join(BASE_DIR, '.cache', 'throttle')),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('THROTTLE_CACHE_MAX_ENTRIES', '200000')),
+        },
+    },
 }
 
 
@@ -144,6 +205,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'api.batch.BatchAuthentication',
         'rest_framework.authentication.TokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
@@ -153,10 +215,33 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.FastJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
+    # Dipakai api.throttling (counter di CACHES['throttle'], dibagi antar worker).
+    # login/register per IP, login_username per akun yang dicoba, upload per user.
+    'DEFAULT_THROTTLE_RATES': {
+        'login': '30/min',
+        'login_username': '10/min',
+        'register': '20/min',
+        'upload': '10/min',
+    },
+    # Jumlah reverse proxy (nginx, load balancer) di depan aplikasi. Tanpa
+    # ini IP throttle diambil dari REMOTE_ADDR, yang di balik proxy adalah
+    # alamat proxy, sehingga semua klien berbagi satu batas. Bila diisi, IP
+    # klien dibaca dari X-Forwarded-For sebanyak itu dari kanan; jangan diisi
+    # bila aplikasi bisa diakses langsung, karena header itu bisa dipalsukan.
+    'NUM_PROXIES': int(os.environ['NUM_PROXIES']) if os.getenv('NUM_PROXIES') else None,
 }
 
+# Kompresi respons (gzip, atau brotli bila paket `brotli` terpasang) untuk
+# body minimal COMPRESSION_MIN_SIZE byte.
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+
 AUTH_USER_MODEL = 'api.User'
 
 MEDIA_URL ='/media/'
@@ -0,0 +1,106 @@
+"""
+Benchmark konkurensi endpoint baca: bandingkan deployment sync (WSGI) dan
+async (ASGI) dengan N klien bersamaan. Hanya memakai pustaka standar.
+
+Jalankan server pada dua konfigurasi, lalu arahkan skrip ini ke masing-masing:
+
+    # sync
+    gunicorn arsip_backend.wsgi -w 4 --threads 8 -b 127.0.0.1:8000
+    # async
+    ASYNC_READ_VIEWS=True uvicorn arsip_backend.asgi:application --workers 4 --port 8001
+
+    python scripts/bench_concurrency.py --base http://127.0.0.1:8000 --token <token>
+    python scripts/bench_concurrency.py --base http://127.0.0.1:8001 --token <token>
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = [
+    '/api/wilayah/?level=1',
+    '/api/wilayah/list/?level=2&parent_code=32',
+    '/api/prodis/dropdown/',
+    '/api/konsentrasi-utama/dropdown/',
+    '/api/dashboard-stats/',
+    '/api/users/me/',
+]
+
+
+async def fetch(host, port, path, token):
+    reader, writer = await asyncio.open_connection(host, port)
+    headers = [f'GET {path} HTTP/1.1', f'Host: {host}', 'Connection: close']
+    if token:
+        headers.append(f'Authorization: Token {token}')
+    writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode())
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    status_line = data.split(b'\r\n', 1)[0]
+    return int(status_line.split()[1]), len(data)
+
+
+async def client(host, port, paths, token, deadline, latencies, errors, offset):
+    i = offset
+    while time.monotonic() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.monotonic()
+        try:
+            status, _ = await fetch(host, port, path, token)
+        except (OSError, IndexError, ValueError):
+            errors['connection'] = errors.get('connection', 0) + 1
+            continue
+        if status >= 400:
+            errors[status] = errors.get(status, 0) + 1
+        latencies.append(time.monotonic() - started)
+
+
+async def run(base, paths, token, concurrency, duration):
+    url = urlsplit(base)
+    host, port = url.hostname, url.port or 80
+    latencies, errors = [], {}
+    deadline = time.monotonic() + duration
+    started = time.monotonic()
+    await asyncio.gather(*[
+        client(host, port, paths, token, deadline, latencies, errors, offset)
+        for offset in range(concurrency)
+    ])
+    elapsed = time.monotonic() - started
+    return latencies, errors, elapsed
+
+
+def percentile(values, pct):
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base', default='http://127.0.0.1:8000')
+    parser.add_argument('--token', help='Token untuk endpoint yang butuh login')
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--path', action='append', dest='paths', help='Path yang diuji (boleh berulang)')
+    args = parser.parse_args()
+
+    latencies, errors, elapsed = asyncio.run(
+        run(args.base, args.paths or DEFAULT_PATHS, args.token, args.concurrency, args.duration)
+    )
+    latencies.sort()
+    print(f"server      : {args.base}")
+    print(f"klien       : {args.concurrency} selama {elapsed:.1f} detik")
+    print(f"request OK  : {len(latencies)} ({len(latencies) / elapsed:.1f} req/s)")
+    print(f"error       : {errors or 0}")
+    if latencies:
+        print(
+            "latensi ms  : "
+            f"p50={percentile(latencies, 50) * 1000:.1f} "
+            f"p95={percentile(latencies, 95) * 1000:.1f} "
+            f"p99={percentile(latencies, 99) * 1000:.1f} "
+            f"mean={statistics.mean(latencies) * 1000:.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
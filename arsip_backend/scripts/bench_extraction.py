@@ -0,0 +1,178 @@
+"""
+Benchmark ekstraksi teks proposal dan ukuran indeks pencarian isi.
+
+Membuat korpus sintetis (campuran PDF satu-halaman-per-paragraf dan DOCX)
+di media/proposals/bench/, memasang file tersebut ke proposal yang sudah
+ada, menjalankan worker ekstraksi sampai antrean habis, lalu melaporkan
+throughput, ukuran tabel/indeks, dan waktu query `?content=`. Semua
+perubahan di-rollback dan file korpus dihapus di akhir, kecuali --keep.
+
+    python scripts/bench_extraction.py --documents 3000
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import time
+import zipfile
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'arsip_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+
+from api import proposal_text  # noqa: E402
+from api.models import Proposal, ProposalContent  # noqa: E402
+
+CORPUS_DIR = 'proposals/bench'
+WORDS = (
+    'analisis sistem informasi akademik kinerja keuangan kualitas layanan pembelajaran daring rantai pasok '
+    'ketahanan pangan perilaku konsumen jaringan sensor nirkabel klasifikasi citra manajemen risiko kebijakan '
+    'publik literasi digital struktur beton bertulang efisiensi energi kesehatan ibu anak metode penelitian '
+    'kuantitatif kualitatif wawancara kuesioner populasi sampel regresi validitas reliabilitas hipotesis'
+).split()
+
+
+def paragraphs(rng, count):
+    return [' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 90))).capitalize() + '.' for _ in range(count)]
+
+
+def pdf_bytes(pages):
+    """PDF minimal (Helvetica, satu paragraf per halaman) yang bisa dibaca pypdf."""
+    objects = ['<</Type/Catalog/Pages 2 0 R>>', None, '<</Type/Font/Subtype/Type1/BaseFont/Helvetica>>']
+    kids = []
+    for text in pages:
+        lines = [text[start:start + 90] for start in range(0, len(text), 90)]
+        stream = 'BT /F1 10 Tf 12 TL 40 800 Td ' + ' '.join(f'({line}) Tj T*' for line in lines) + ' ET'
+        objects.append(f'<</Length {len(stream)}>>stream\n{stream}\nendstream')
+        objects.append(f'<</Type/Page/Parent 2 0 R/MediaBox[0 0 595 842]/Resources<</Font<</F1 3 0 R>>>>'
+                       f'/Contents {len(objects)} 0 R>>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f"<</Type/Pages/Kids[{' '.join(kids)}]/Count {len(kids)}>>"
+
+    out, offsets = BytesIO(), []
+    out.write(b'%PDF-1.4\n')
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f'{number} 0 obj{body}endobj\n'.encode('latin-1'))
+    xref = out.tell()
+    out.write(f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode())
+    for offset in offsets:
+        out.write(f'{offset:010d} 00000 n \n'.encode())
+    out.write(f'trailer<</Size {len(objects) + 1}/Root 1 0 R>>\nstartxref\n{xref}\n%%EOF\n'.encode())
+    return out.getvalue()
+
+
+def docx_bytes(paragraphs):
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{body}</w:body></w:document>'
+    )
+    out = BytesIO()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', '<?xml version="1.0"?><Types/>')
+        archive.writestr('word/document.xml', document)
+    return out.getvalue()
+
+
+def build_corpus(count, seed):
+    rng = random.Random(seed)
+    directory = os.path.join(settings.MEDIA_ROOT, CORPUS_DIR)
+    os.makedirs(directory, exist_ok=True)
+    names, size = [], 0
+    for index in range(count):
+        parts = paragraphs(rng, rng.randint(8, 30))
+        if index % 2:
+            name, content = f'{CORPUS_DIR}/doc_{index}.docx', docx_bytes(parts)
+        else:
+            name, content = f'{CORPUS_DIR}/doc_{index}.pdf', pdf_bytes(parts)
+        with open(os.path.join(settings.MEDIA_ROOT, name), 'wb') as file:
+            file.write(content)
+        names.append(name)
+        size += len(content)
+    return names, size
+
+
+def relation_sizes():
+    if connection.vendor != 'postgresql':
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_total_relation_size('api_proposalcontent'), "
+            "pg_relation_size('proposal_content_vector')"
+        )
+        total, index = cursor.fetchone()
+    return {'tabel+indeks': total, 'indeks GIN': index}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--documents', type=int, default=3000)
+    parser.add_argument('--batch-size', type=int, default=proposal_text.BATCH_SIZE)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--keep', action='store_true', help='Commit the run and keep the corpus files')
+    args = parser.parse_args()
+
+    proposals = list(Proposal.objects.order_by('pk').values_list('pk', flat=True)[:args.documents])
+    if len(proposals) < args.documents:
+        sys.exit(f"Hanya ada {len(proposals)} proposal; kurangi --documents.")
+
+    started = time.perf_counter()
+    names, size = build_corpus(args.documents, args.seed)
+    print(f"Korpus: {len(names)} file, {size / 1e6:.1f} MB ({time.perf_counter() - started:.1f} detik)")
+
+    try:
+        with transaction.atomic():
+            for pk, name in zip(proposals, names):
+                proposal = Proposal.objects.get(pk=pk)
+                proposal.file.name = name
+                proposal.save(update_fields=['file'])
+
+            started = time.perf_counter()
+            processed = 0
+            while True:
+                batch = proposal_text.process_pending(args.batch_size)
+                if not batch:
+                    break
+                processed += batch
+            elapsed = time.perf_counter() - started
+            print(f"Ekstraksi: {processed} file dalam {elapsed:.1f} detik ({processed / elapsed:.1f} file/detik)")
+
+            done = ProposalContent.objects.filter(status='done').count()
+            failed = list(ProposalContent.objects.filter(status='failed').values_list('error', flat=True)[:3])
+            print(f"Status: {done} selesai, {len(failed) and ProposalContent.objects.filter(status='failed').count()} gagal"
+                  + (f" (mis. {failed[0]})" if failed else ''))
+
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE api_proposalcontent')
+            for label, value in relation_sizes().items():
+                print(f"Ukuran {label}: {value / 1e6:.1f} MB")
+
+            for terms in ('regresi kuesioner', '"sensor nirkabel"', 'beton -energi'):
+                timings = []
+                for _ in range(5):
+                    started = time.perf_counter()
+                    count = proposal_text.search(Proposal.objects.all(), terms).count()
+                    timings.append(time.perf_counter() - started)
+                print(f"?content={terms!r}: {count} proposal, median {statistics.median(timings) * 1000:.1f} ms")
+
+            if not args.keep:
+                transaction.set_rollback(True)
+    finally:
+        if not args.keep:
+            shutil.rmtree(os.path.join(settings.MEDIA_ROOT, CORPUS_DIR), ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
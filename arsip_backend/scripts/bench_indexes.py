@@ -0,0 +1,112 @@
+"""
+Benchmark bentuk query utama API terhadap indeks di migrasi 0018.
+
+Tiap query dijalankan beberapa kali (median), dan di PostgreSQL ditampilkan
+node scan dari EXPLAIN agar terlihat indeks mana yang dipakai. Jalankan
+sebelum dan sesudah migrasi untuk membandingkan:
+
+    python manage.py migrate api 0017 && python scripts/bench_indexes.py
+    python manage.py migrate api 0018 && python scripts/bench_indexes.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'arsip_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.models import Count, Q  # noqa: E402
+
+from api import analytics, projections  # noqa: E402
+from api.models import Bimbingan, Dosen, Mahasiswa, Proposal  # noqa: E402
+
+
+def sample():
+    """Nilai filter yang benar-benar ada di database aktif."""
+    student = Mahasiswa.objects.exclude(prodi=None).order_by('pk').values('pk', 'prodi_id', 'tahun_masuk', 'jk').first()
+    dosen = Dosen.objects.order_by('nidn').values_list('nidn', 'nama_dosen').first()
+    if student is None or dosen is None:
+        sys.exit('Database belum berisi Mahasiswa/Dosen.')
+    name = Mahasiswa.objects.filter(pk=student['pk']).values_list('nama_mahasiswa', flat=True).get()
+    student['term'] = name.split()[-1][1:5].lower() or name
+    student['dosen'], student['dosen_term'] = dosen[0], dosen[1].split()[-1][1:5].lower() or dosen[1]
+    return student
+
+
+def queries(s):
+    return {
+        # ProposalSerializer.validate_mahasiswa
+        'proposal pending per mahasiswa': Proposal.objects.filter(mahasiswa_id=s['pk'], status='pending'),
+        'proposal per status terbaru': Proposal.objects.filter(status='pending').order_by('-created_at')[:10],
+        'mahasiswa prodi+angkatan+jk': Mahasiswa.objects.filter(
+            prodi_id=s['prodi_id'], tahun_masuk=s['tahun_masuk'], jk=s['jk']
+        ).values_list('pk'),
+        'mahasiswa angkatan': Mahasiswa.objects.filter(tahun_masuk=s['tahun_masuk']).values_list('pk'),
+        'list mahasiswa (judul approved)': projections.MAHASISWA.values(
+            Mahasiswa.objects.order_by('nim')[:10]
+        )[0],
+        'status terakhir per mahasiswa': Mahasiswa.objects.filter(
+            prodi_id=s['prodi_id'], tahun_masuk=s['tahun_masuk'], jk=s['jk']
+        ).annotate(status=analytics.LATEST_STATUS).values_list('pk', 'status'),
+        'beban pembimbing': Proposal.objects.filter(dosen_pembimbing_id=s['dosen'])
+        .values_list('status').annotate(total=Count('pk')).order_by(),
+        'search mahasiswa': Mahasiswa.objects.filter(
+            Q(nim__icontains=s['term']) | Q(nama_mahasiswa__icontains=s['term'])
+        ).values_list('pk'),
+        'search dosen': Dosen.objects.filter(
+            Q(nidn__icontains=s['dosen_term']) | Q(nama_dosen__icontains=s['dosen_term'])
+        ).values_list('pk'),
+        'search bimbingan': Bimbingan.objects.filter(
+            Q(dosen__nama_dosen__icontains=s['term'])
+            | Q(mahasiswa__nama_mahasiswa__icontains=s['term'])
+            | Q(mahasiswa__nim__icontains=s['term'])
+        ).values_list('pk'),
+    }
+
+
+def scans(plan):
+    """Node scan pada plan EXPLAIN (FORMAT JSON), mis. 'Index Scan:proposal_mahasiswa_status'."""
+    found = []
+    if 'Scan' in plan['Node Type']:
+        found.append(f"{plan['Node Type']}:{plan.get('Index Name') or plan.get('Relation Name')}")
+    for child in plan.get('Plans', []):
+        found.extend(scans(child))
+    return found
+
+
+def explain(queryset):
+    if connection.vendor != 'postgresql':
+        return ''
+    import json
+    plan = json.loads(queryset.explain(format='json'))[0]['Plan']
+    return ', '.join(dict.fromkeys(scans(plan)))
+
+
+def timed(queryset, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        list(queryset.all())
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'query':<34}{'ms':>9}  plan")
+    for name, queryset in queries(sample()).items():
+        print(f"{name:<34}{timed(queryset, args.repeat) * 1000:>9.2f}  {explain(queryset)}")
+
+
+if __name__ == '__main__':
+    main()
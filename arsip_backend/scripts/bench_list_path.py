@@ -0,0 +1,72 @@
+"""
+Benchmark jalur baca list Mahasiswa/Dosen: ModelSerializer vs proyeksi
+values_list() + mapper baris (api/projections.py).
+
+Untuk tiap jumlah baris diukur waktu query + serialisasi dan render JSON,
+serta dipastikan kedua jalur menghasilkan byte JSON yang sama. Data diambil
+dari database aktif.
+
+    python scripts/bench_list_path.py --rows 1000 10000 --repeat 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'arsip_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from api import projections  # noqa: E402
+from api.models import Dosen, Mahasiswa  # noqa: E402
+from api.renderers import FastJSONRenderer  # noqa: E402
+from api.serializers import DosenSerializer, MahasiswaSerializer  # noqa: E402
+
+TARGETS = {
+    'mahasiswa': (
+        lambda: Mahasiswa.objects.select_related('prodi', 'konsentrasi', 'tempat_lahir'),
+        MahasiswaSerializer, projections.MAHASISWA,
+    ),
+    'dosen': (
+        lambda: Dosen.objects.select_related('prodi', 'konsentrasi', 'tempat_lahir').order_by('nidn'),
+        DosenSerializer, projections.DOSEN,
+    ),
+}
+
+
+def timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    renderer = FastJSONRenderer()
+    print(f"{'endpoint':<12}{'baris':>8}{'serializer ms':>16}{'proyeksi ms':>14}{'speedup':>10}  byte sama")
+    for name, (queryset, serializer_class, projection) in TARGETS.items():
+        for rows in args.rows:
+            slow, slow_time = timed(
+                lambda: renderer.render(serializer_class(queryset()[:rows], many=True).data), args.repeat
+            )
+            fast, fast_time = timed(lambda: renderer.render(projection.rows(queryset()[:rows])), args.repeat)
+            count = len(projection.rows(queryset()[:rows]))
+            print(
+                f"{name:<12}{count:>8}{slow_time * 1000:>16.1f}{fast_time * 1000:>14.1f}"
+                f"{slow_time / fast_time if fast_time else 0:>9.1f}x  {'ya' if slow == fast else 'TIDAK'}"
+            )
+
+
+if __name__ == '__main__':
+    main()
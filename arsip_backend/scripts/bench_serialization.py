@@ -0,0 +1,95 @@
+"""
+Benchmark serialisasi JSON dan ukuran respons untuk endpoint list terbesar.
+
+Untuk tiap payload dibandingkan waktu render JSONRenderer DRF dan
+FastJSONRenderer (orjson), serta ukuran body mentah, gzip, dan brotli
+(bila paket `brotli` terpasang). Data diambil dari database aktif.
+
+    python scripts/bench_serialization.py --limit 20000 --repeat 5
+"""
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'arsip_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api import middleware  # noqa: E402
+from api.models import Bimbingan, Dosen, Mahasiswa, Proposal, Wilayah  # noqa: E402
+from api.renderers import FastJSONRenderer, orjson  # noqa: E402
+from api.serializers import (  # noqa: E402
+    BimbinganSerializer, DosenSerializer, MahasiswaSerializer, ProposalSerializer, WilayahSerializer,
+)
+
+PAYLOADS = {
+    'wilayah (semua level)': lambda: (Wilayah.objects.order_by('code'), WilayahSerializer),
+    'mahasiswa': lambda: (
+        Mahasiswa.objects.select_related('tempat_lahir', 'prodi', 'konsentrasi').order_by('nim'),
+        MahasiswaSerializer,
+    ),
+    'dosen': lambda: (
+        Dosen.objects.select_related('tempat_lahir', 'prodi', 'konsentrasi').order_by('nidn'),
+        DosenSerializer,
+    ),
+    'proposal': lambda: (
+        Proposal.objects.select_related('mahasiswa', 'dosen_pembimbing').order_by('-created_at'),
+        ProposalSerializer,
+    ),
+    'bimbingan': lambda: (
+        Bimbingan.objects.select_related('dosen', 'mahasiswa', 'proposal').order_by('-created_at'),
+        BimbinganSerializer,
+    ),
+}
+
+
+def timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--limit', type=int, default=20000, help='Jumlah baris maksimum per payload')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    stock, fast = JSONRenderer(), FastJSONRenderer()
+    print(f"orjson: {'ya' if orjson else 'tidak'}, brotli: {'ya' if middleware.brotli else 'tidak'}")
+    print(f"{'payload':<24}{'baris':>8}{'drf ms':>10}{'fast ms':>10}{'raw KB':>10}{'gzip KB':>10}{'br KB':>10}  sama")
+
+    for name, build in PAYLOADS.items():
+        queryset, serializer_class = build()
+        try:
+            data = serializer_class(queryset[:args.limit], many=True).data
+        except Exception as e:
+            print(f"{name:<24} dilewati: {e}")
+            continue
+
+        stock_body, stock_time = timed(lambda: stock.render(data), args.repeat)
+        fast_body, fast_time = timed(lambda: fast.render(data), args.repeat)
+        gzip_size = len(gzip.compress(fast_body, compresslevel=middleware.GZIP_LEVEL))
+        br_size = (
+            f"{len(middleware.compress(fast_body, 'br')) / 1024:>10.1f}" if middleware.brotli else f"{'-':>10}"
+        )
+        print(
+            f"{name:<24}{len(data):>8}{stock_time * 1000:>10.1f}{fast_time * 1000:>10.1f}"
+            f"{len(fast_body) / 1024:>10.1f}{gzip_size / 1024:>10.1f}{br_size}  "
+            f"{'ya' if stock_body == fast_body else 'TIDAK'}"
+        )
+
+
+if __name__ == '__main__':
+    main()
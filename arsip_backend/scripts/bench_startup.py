@@ -0,0 +1,90 @@
+"""
+Benchmark start worker: waktu boot, RSS, dan rincian `python -X importtime`.
+
+Setiap putaran menjalankan proses Python baru yang melakukan apa yang
+dilakukan worker gunicorn sebelum melayani request pertama: memuat
+arsip_backend.wsgi lalu me-resolve URLconf (mengimpor api.views). Hanya
+memakai pustaka standar.
+
+    python scripts/bench_startup.py --runs 5
+    python scripts/bench_startup.py --preload pandas,pypdf   # bandingkan bila dimuat di awal
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ('pandas', 'numpy', 'openpyxl', 'pypdf')
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+BOOT = """
+import importlib, json, resource, sys, time
+started = time.perf_counter()
+for name in {preload!r}:
+    importlib.import_module(name)
+import arsip_backend.wsgi
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({{
+    'boot_ms': (time.perf_counter() - started) * 1000,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'lazy_loaded': [name for name in {lazy!r} if name in sys.modules],
+}}))
+"""
+
+
+def boot(preload):
+    env = {'DJANGO_SETTINGS_MODULE': 'arsip_backend.settings', **os.environ}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT.format(preload=preload, lazy=LAZY_MODULES)],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=False,
+    )
+    if result.returncode:
+        sys.exit(result.stderr[-3000:])
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    imports = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            imports[name] = (int(cumulative) / 1000, len(indent) // 2)
+    return stats, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='Top-level imports to list by cumulative time')
+    parser.add_argument('--preload', default='', help='Comma-separated modules to import before the app')
+    args = parser.parse_args()
+    preload = [name.strip() for name in args.preload.split(',') if name.strip()]
+
+    runs = [boot(preload) for _ in range(args.runs)]
+    boot_ms = [stats['boot_ms'] for stats, _ in runs]
+    rss_mb = [stats['rss_mb'] for stats, _ in runs]
+    views_ms = [imports['api.views'][0] for _, imports in runs if 'api.views' in imports]
+
+    print(f"Boot worker (wsgi + URLconf), {args.runs} putaran"
+          + (f", preload {', '.join(preload)}" if preload else ''))
+    print(f"   boot      median {statistics.median(boot_ms):7.1f} ms  (min {min(boot_ms):.1f})")
+    print(f"   RSS       median {statistics.median(rss_mb):7.1f} MB")
+    if views_ms:
+        print(f"   api.views median {statistics.median(views_ms):7.1f} ms  (kumulatif -X importtime)")
+    print(f"   dependensi berat termuat: {', '.join(runs[-1][0]['lazy_loaded']) or '-'}")
+
+    _, imports = runs[-1]
+    top = sorted(
+        ((cumulative, name) for name, (cumulative, depth) in imports.items() if depth == 0),
+        reverse=True,
+    )[:args.top]
+    print("Import level teratas (putaran terakhir):")
+    for cumulative, name in top:
+        print(f"   {cumulative:7.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+    main()
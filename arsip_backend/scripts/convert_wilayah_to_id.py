@@ -1,14 +1,22 @@
-from api.models import Mahasiswa, Wilayah
+from api.models import Mahasiswa
+from api.wilayah_resolver import MIN_CONFIDENCE, WilayahResolver
+
 
 def convert():
-    for m in Mahasiswa.objects.raw("SELECT * FROM api_mahasiswa WHERE tempat_lahir IS NOT NULL"):
-        if isinstance(m.tempat_lahir, str):
-            try:
-                wilayah = Wilayah.objects.get(name__iexact=m.tempat_lahir.strip())
-                Mahasiswa.objects.filter(id=m.id).update(tempat_lahir=wilayah.id)
-                print(f"✅ {m.nim} | {m.tempat_lahir} → {wilayah.id}")
-            except Wilayah.DoesNotExist:
-                print(f"❌ Tidak ditemukan: {m.tempat_lahir}")
+    legacy = [
+        m for m in Mahasiswa.objects.raw("SELECT * FROM api_mahasiswa WHERE tempat_lahir IS NOT NULL")
+        if isinstance(m.tempat_lahir, str)
+    ]
+    resolver = WilayahResolver.build()
+    matches = resolver.resolve_many(m.tempat_lahir.strip() for m in legacy)
+
+    for m in legacy:
+        match = matches[m.tempat_lahir.strip()]
+        if match and match.confidence >= MIN_CONFIDENCE:
+            Mahasiswa.objects.filter(id=m.id).update(tempat_lahir=match.id)
+            print(f"✅ {m.nim} | {m.tempat_lahir} → {match.id} ({match.name}, {match.confidence})")
+        else:
+            print(f"❌ Tidak ditemukan: {m.tempat_lahir}")
 
 if __name__ == "__main__":
-    convert()
\ No newline at end of file
+    convert()
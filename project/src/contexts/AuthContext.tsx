@@ -2,6 +2,7 @@
 import { createContext, useContext, useEffect, useState, ReactNode } from 'react';
 import { User } from '../types';
 import { apiRequest } from '../utils/api';
+import { manifestToPermissions } from '../utils/permissions';
 
 type AuthContextType = {
   user: User | null;
@@ -28,7 +29,10 @@ export const AuthProvider = ({ children }: { children: ReactNode }) => {
 
   const fetchUser = async () => {
     try {
-      const userData = await apiRequest('/users/me/');
+      const [userData, manifest] = await Promise.all([
+        apiRequest('/users/me/'),
+        apiRequest('/users/me/permissions/'),
+      ]);
       const mappedUser: User = {
         id: String(userData.id),
         email: userData.email,
@@ -37,7 +41,7 @@ export const AuthProvider = ({ children }: { children: ReactNode }) => {
           id: String(userData.role.id),
           name: userData.role.name,
           description: userData.role.description || '',
-          permissions: userData.role.permissions || []
+          permissions: manifestToPermissions(manifest)
         },
         divisionId: userData.division?.id ? String(userData.division.id) : '',
         divisionName: userData.division?.name || '',
@@ -64,8 +68,11 @@ export const AuthProvider = ({ children }: { children: ReactNode }) => {
       // Simpan token
       localStorage.setItem('authToken', response.token);
 
-      // Ambil data user
-      const userData = await apiRequest('/users/me/');
+      // Ambil data user dan manifest permission-nya
+      const [userData, manifest] = await Promise.all([
+        apiRequest('/users/me/'),
+        apiRequest('/users/me/permissions/'),
+      ]);
       const mappedUser: User = {
         id: String(userData.id),
         email: userData.email,
@@ -74,7 +81,7 @@ export const AuthProvider = ({ children }: { children: ReactNode }) => {
           id: String(userData.role.id),
           name: userData.role.name,
           description: userData.role.description || '',
-          permissions: userData.role.permissions || []
+          permissions: manifestToPermissions(manifest)
         },
         divisionId: userData.division?.id ? String(userData.division.id) : '',
         divisionName: userData.division?.name || '',
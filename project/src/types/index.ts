@@ -7,6 +7,13 @@ export interface Permission {
   codename: string;
 }
 
+export interface PermissionManifest {
+  version: number;
+  hash: string;
+  all: boolean;
+  permissions: string[];
+}
+
 export interface Role {
   id: string;
   name: string;
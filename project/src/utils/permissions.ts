@@ -1,4 +1,10 @@
-import { User } from '../types';
+import { Permission, PermissionManifest, User } from '../types';
+
+// Manifest dari /users/me/permissions/ hanya berisi codename; bentuknya
+// disesuaikan dengan Role.permissions yang dipakai halaman-halaman lain.
+// Browser merevalidasi manifest lewat ETag, jadi tidak perlu cache manual.
+export const manifestToPermissions = (manifest: PermissionManifest): Permission[] =>
+  manifest.permissions.map((codename) => ({ id: 0, name: codename, codename }));
 
 export const hasPermission = (user: User | null, permissionCodename: string): boolean => {
   if (!user) return false;